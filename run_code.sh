@@ -6,8 +6,21 @@ RUN_COUNT_DATA="data-sets/resorts_runs.csv"
 PRICE_DATA="data-sets/resorts_prices.csv"
 ELEVATION_DATA="data-sets/resorts_elevation.csv"
 OUTPUT_FILE="output/Ski_Resorts_Results.txt"
+BATCH_ARGS=()
 
-if [ "$#" -eq 3 ]; then
+if [ "$1" = "--batch" ]; then
+
+    if [ "$#" -lt 2 ] || [ "$#" -gt 3 ]; then
+
+        echo "Usage: $0 --batch profiles_file [batch_output_file]"
+        exit 1
+
+    fi
+
+    OUTPUT_FILE="${3:-output/Ski_Resorts_Batch_Results.jsonl}"
+    BATCH_ARGS=(--batch "$2" --batch_output "$OUTPUT_FILE")
+
+elif [ "$#" -eq 3 ]; then
 
     RUN_COUNT_DATA="$1"
     PRICE_DATA="$2"
@@ -22,6 +35,7 @@ if [ "$#" -eq 3 ]; then
 elif [ "$#" -ne 0 ]; then
 
     echo "Usage: $0 [run_count_data price_data elevation_data [output_file]]"
+    echo "       $0 --batch profiles_file [batch_output_file]"
     exit 1
 
 fi
@@ -30,7 +44,8 @@ fi
     --run_count_data "$RUN_COUNT_DATA" \
     --price_data "$PRICE_DATA" \
     --elevation_data "$ELEVATION_DATA" \
-    --output "$OUTPUT_FILE"
+    --output "$OUTPUT_FILE" \
+    "${BATCH_ARGS[@]}"
 
 if [ $? -eq 0 ]; then
 
@@ -0,0 +1,248 @@
+from synthetic_data import write_dataset
+from process_data import PreProcessing, PIPELINE_VERSION
+from ranking_data import RankingSkiResorts
+from weighted_sum import WeightedSumModel
+from main import SummitSelect_Main
+from verbosity import set_verbosity, LEVELS
+from features import FEATURES
+import pandas as pd
+import numpy as np
+import contextlib
+import argparse
+import platform
+import datetime
+import tempfile
+import shutil
+import json
+import time
+import sys
+import os
+
+"""
+Benchmark suite timing every stage of the application on synthetic resort data, from a hundred resorts up
+to ten million. Each stage is called the same way the application calls it, with its printed progress
+silenced, and the fastest time over the repeated runs is kept. Results are written as JSON, so runs on
+different versions of the application can be compared.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+
+# the number of resorts benchmarked when no sizes are given, pass 10000000 to go up to ten million
+DEFAULT_SIZES = [100, 1000, 10000, 100000, 1000000]
+
+# the number of preference profiles ranked, and the number of resorts returned per profile, by the batch stages
+BATCH_PROFILES = 100
+BATCH_N = 10
+
+
+"""
+Times a single stage, with everything it prints discarded
+@param seconds: dictionary receiving the time of the stage, the fastest time is kept over repeated runs
+@param stage: name of the stage
+@param function: the stage itself
+@return whatever the stage returns
+"""
+def timed(seconds: dict, stage: str, function, *args, **kwargs):
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+
+    seconds[stage] = min(seconds.get(stage, elapsed), elapsed)
+
+    return result
+
+
+"""
+Runs every stage once on a single dataset, in the order the application runs them
+@param paths: dictionary holding the path of each input file (runs, prices, elevation)
+@param seconds: dictionary receiving the time of each stage
+@return dictionary holding the number of rows entering and leaving pre-processing
+"""
+def run_stages(paths: dict, seconds: dict) -> dict:
+
+    preprocessor = PreProcessing(paths['runs'], paths['prices'], paths['elevation'])
+
+    timed(seconds, 'read_data', preprocessor.read_data)
+    rows_read = len(preprocessor.run_count_dataframe) + len(preprocessor.price_dataframe) + len(preprocessor.elevation_dataframe)
+
+    def organize_files():
+        preprocessor.run_count_dataframe = preprocessor.organize_data(preprocessor.run_count_dataframe, 'runs')
+        preprocessor.price_dataframe = preprocessor.organize_data(preprocessor.price_dataframe, 'prices')
+        preprocessor.elevation_dataframe = preprocessor.organize_data(preprocessor.elevation_dataframe, 'elevation')
+
+    timed(seconds, 'organize_data', organize_files)
+    rows_organized = len(preprocessor.run_count_dataframe) + len(preprocessor.price_dataframe) + len(preprocessor.elevation_dataframe)
+
+    merged_data = timed(seconds, 'merge_data', preprocessor.merge_data)
+    debugged_data = timed(seconds, 'debug_data', preprocessor.debug_data, merged_data)
+
+    def convert_types():
+        for feature in FEATURES:
+            debugged_data[feature.column] = debugged_data[feature.column].astype(feature.dtype)
+
+    timed(seconds, 'convert_types', convert_types)
+
+    processed_data = timed(seconds, 'normalize_data', preprocessor.normalize_data, debugged_data)
+    timed(seconds, 'validation', preprocessor.validation, processed_data)
+    timed(seconds, 'write_csv', preprocessor.write_csv, processed_data, None)
+
+    rank = timed(seconds, 'sort_index', RankingSkiResorts, processed_data)
+    rankings = {
+        'runs': timed(seconds, 'sorting_by_run_count', rank.sorting_by_run_count),
+        'price': timed(seconds, 'sorting_by_price', rank.sorting_by_price),
+        'elevation': timed(seconds, 'sorting_by_elevation', rank.sorting_by_elevation)
+    }
+
+    weighted_model = WeightedSumModel(processed_data)
+
+    def weighted_sum():
+        weighted_model.set_preferences(True, True, True)
+        weighted_model.normalize_data()
+        weighted_model.weighted_sum_model()
+        return weighted_model.ranking()
+
+    final_ranking = timed(seconds, 'weighted_sum_model', weighted_sum)
+
+    # the same positive weights are ranked by scoring every resort, and from the Pareto layers of the resorts
+    profiles = np.random.default_rng(0).random((BATCH_PROFILES, len(weighted_model.store.features)))
+    timed(seconds, 'batch_ranking', weighted_model.batch_ranking, profiles, None, BATCH_N)
+
+    skyline_model = WeightedSumModel(processed_data, skyline=True)
+    timed(seconds, 'skyline_batch_ranking', skyline_model.batch_ranking, profiles, None, BATCH_N)
+
+    app = SummitSelect_Main(paths['runs'], paths['prices'], paths['elevation'])
+    timed(seconds, 'dump_output', app.dump_output, rankings, final_ranking, 'Ski_Resort_Results.txt')
+
+    return {'rows_read': rows_read, 'rows_organized': rows_organized, 'rows_processed': len(processed_data),
+            'skyline_pruning_rate': skyline_model.index.pruning_rate()}
+
+
+"""
+Benchmarks the application on a single number of resorts
+@param resorts: how many resorts to generate
+@param data_dir: the directory holding the synthetic datasets, a dataset already written there is reused
+@param repeat: how many times every stage is run, the fastest time is kept
+@param seed: seed of the synthetic data
+@return dictionary holding the results for this number of resorts
+"""
+def benchmark_size(resorts: int, data_dir: str, repeat: int, seed: int) -> dict:
+
+    directory = os.path.abspath(os.path.join(data_dir, f'resorts_{resorts}_seed_{seed}'))
+    paths = {name: os.path.join(directory, f'resorts_{name}.csv') for name in ['runs', 'prices', 'elevation']}
+
+    if not all(os.path.exists(path) for path in paths.values()):
+        start = time.perf_counter()
+        write_dataset(directory, resorts, seed)
+        print(f"Generated in {time.perf_counter() - start:.2f} Seconds")
+
+    seconds = {}
+    working_dir = os.getcwd()
+
+    # the processed data and the results are written relative to the working directory, so they are kept
+    # next to the dataset instead of overwriting the application's own files
+    os.chdir(directory)
+
+    try:
+        for _ in range(repeat):
+            rows = run_stages(paths, seconds)
+    finally:
+        os.chdir(working_dir)
+
+    return {
+        'resorts': resorts,
+        'input_bytes': sum(os.path.getsize(path) for path in paths.values()),
+        **rows,
+        'seconds': seconds,
+        'total_seconds': sum(seconds.values())
+    }
+
+
+"""
+Runs the benchmark suite and writes its results
+@param sizes: the numbers of resorts to benchmark
+@param output_file: path to the JSON file receiving the results
+@param data_dir: the directory holding the synthetic datasets, a temporary directory removed afterwards if None
+@param repeat: how many times every stage is run, the fastest time is kept
+@param seed: seed of the synthetic data
+@param verbosity: how much the benchmarked stages print, the printed output itself is discarded
+@return dictionary holding the results
+"""
+def run_benchmarks(sizes: list, output_file: str, data_dir: str = None, repeat: int = 1, seed: int = 0,
+                   verbosity: str = 'diagnostic') -> dict:
+
+    if repeat < 1:
+        raise ValueError("Value of repeat is negative, needs to be positive...")
+
+    set_verbosity(verbosity)
+
+    temporary = data_dir is None
+    data_dir = tempfile.mkdtemp(prefix='summitselect-benchmark-') if temporary else data_dir
+
+    report = {
+        'pipeline_version': PIPELINE_VERSION,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'seed': seed,
+        'repeat': repeat,
+        'verbosity': verbosity,
+        'results': []
+    }
+
+    try:
+        for resorts in sizes:
+
+            print(f"\nBenchmarking {resorts} Resorts...")
+            result = benchmark_size(resorts, data_dir, repeat, seed)
+            report['results'].append(result)
+
+            for stage, elapsed in result['seconds'].items():
+                print(f" {stage:<22} {elapsed:10.4f} s")
+            print(f" {'total':<22} {result['total_seconds']:10.4f} s")
+            print(f" {'skyline pruning rate':<22} {result['skyline_pruning_rate']:10.2%}")
+
+            # the results are written after every size, so a run stopped early still keeps them
+            with open(output_file, 'w') as f:
+                json.dump(report, f, indent=2)
+
+    finally:
+        if temporary:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    print(f"\nBenchmark Results Written to {output_file}")
+
+    return report
+
+
+"""
+Handles the arguments of the benchmark suite
+@return the parsed arguments
+"""
+def add_args():
+
+    parsing_helper = argparse.ArgumentParser(description="SummitSelect Benchmark Suite")
+
+    parsing_helper.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Numbers of Resorts to Benchmark.")
+    parsing_helper.add_argument('--output', type=str, default='benchmark_results.json', help="Path to the JSON File Receiving the Results.")
+    parsing_helper.add_argument('--data_dir', type=str, default=None, help="Directory Keeping the Synthetic Datasets Between Runs (Temporary if Not Given).")
+    parsing_helper.add_argument('--repeat', type=int, default=1, help="How Many Times Every Stage is Run, the Fastest Time is Kept.")
+    parsing_helper.add_argument('--seed', type=int, default=0, help="Seed of the Synthetic Data.")
+    parsing_helper.add_argument('--verbosity', type=str, default='diagnostic', choices=list(LEVELS), help="How Much the Benchmarked Stages Print.")
+
+    return parsing_helper.parse_args()
+
+
+if __name__ == "__main__":
+
+    try:
+        args = add_args()
+        run_benchmarks(args.sizes, args.output, args.data_dir, args.repeat, args.seed, args.verbosity)
+
+    except KeyboardInterrupt:
+        print("\nUser Ended the Benchmarks. Program Will Now Exit.")
+        sys.exit(1)
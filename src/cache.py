@@ -0,0 +1,126 @@
+from columnar import write_columns, read_columns, MANIFEST
+from verbosity import report
+import pandas as pd
+import hashlib
+import shutil
+import json
+import os
+
+"""
+This class caches the pre-processed resort data on disk in a binary columnar layout, so a run whose
+input files have not changed can load the processed data directly instead of repeating pre-processing.
+Every entry is keyed by a fingerprint of the input files' contents, the version of the pre-processing
+pipeline, and the settings the processed data depends on (the registered features and the scalers). The content hash of a file is only recomputed when its size or modification time changes.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+class ProcessedDataCache:
+
+
+    """
+    Constructor
+    @param cache_dir: the directory holding the cached data
+    @param max_entries: how many cached datasets to keep, the least recently used are removed first
+    """
+    def __init__(self, cache_dir: str, max_entries: int = 4):
+
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.fingerprint_file = os.path.join(cache_dir, 'fingerprints.json')
+
+
+    """
+    Computes the content hash of an input file, reusing the hash recorded on an earlier run when the
+    file's size and modification time are unchanged
+    @param input_file: path to the input file
+    @param fingerprints: the hashes recorded on earlier runs, updated in place
+    @return the SHA-256 hash of the file's contents
+    """
+    def file_hash(self, input_file: str, fingerprints: dict) -> str:
+
+        stats = os.stat(input_file)
+        path = os.path.abspath(input_file)
+        recorded = fingerprints.get(path)
+
+        if recorded and recorded['size'] == stats.st_size and recorded['mtime_ns'] == stats.st_mtime_ns:
+            return recorded['sha256']
+
+        digest = hashlib.sha256()
+
+        with open(input_file, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+
+        fingerprints[path] = {'size': stats.st_size, 'mtime_ns': stats.st_mtime_ns, 'sha256': digest.hexdigest()}
+
+        return fingerprints[path]['sha256']
+
+
+    """
+    Builds the key of the cached data for a set of input files
+    @param input_files: paths to the input files, in the order they are pre-processed
+    @param version: the version of the pre-processing pipeline
+    @param settings: anything else the processed data depends on, as values JSON can hold
+    @return the cache key
+    """
+    def key(self, input_files: list, version: str, settings=None) -> str:
+
+        fingerprints = {}
+
+        if os.path.exists(self.fingerprint_file):
+            with open(self.fingerprint_file, 'r') as f:
+                fingerprints = json.load(f)
+
+        hashes = [self.file_hash(input_file, fingerprints) for input_file in input_files]
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        with open(self.fingerprint_file, 'w') as f:
+            json.dump(fingerprints, f, indent=2)
+
+        return hashlib.sha256(json.dumps([str(version), settings] + hashes).encode('utf-8')).hexdigest()
+
+
+    """
+    Loads the cached data for a key
+    @param key: the cache key
+    @return the pre-processed data, or None if nothing is cached under the key
+    """
+    def load(self, key: str) -> pd.DataFrame:
+
+        directory = os.path.join(self.cache_dir, key)
+
+        if not os.path.exists(os.path.join(directory, MANIFEST)):
+            return None
+
+        try:
+            data = read_columns(directory)
+
+        except Exception as e:
+            print(f"Ran into an Error: Cached data could not be read, it will be rebuilt... {str(e)}")
+            return None
+
+        # marking the entry as recently used
+        os.utime(directory)
+        report(f"Loaded Pre-Processed Data From Cache: {directory}")
+
+        return data
+
+
+    """
+    Saves pre-processed data under a key, removing the least recently used entries beyond max_entries
+    @param key: the cache key
+    @param data: the pre-processed data
+    """
+    def store(self, key: str, data: pd.DataFrame) -> None:
+
+        directory = os.path.join(self.cache_dir, key)
+        write_columns(data, directory)
+
+        entries = [os.path.join(self.cache_dir, entry) for entry in os.listdir(self.cache_dir)]
+        entries = sorted((entry for entry in entries if os.path.isdir(entry)), key=os.path.getmtime, reverse=True)
+
+        for entry in entries[self.max_entries:]:
+            shutil.rmtree(entry, ignore_errors=True)
+
+        report(f"Pre-Processed Data Cached in: {directory}")
@@ -0,0 +1,207 @@
+import pandas as pd
+import numpy as np
+import shutil
+import json
+import os
+
+"""
+Helper functions for saving a frame of data column by column as binary NumPy (.npy) files, next to a
+JSON manifest describing the columns. Numeric columns are saved as they are. Text columns are interned:
+each distinct value is stored once in a UTF-8 table (one byte blob plus offsets), and the column itself
+is saved as integer codes into that table. Every file can therefore be memory-mapped when read back.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+
+MANIFEST = 'manifest.json'
+
+
+"""
+Interns a column of text into integer codes and a table of its distinct values
+@param values: the column of text, missing values are given the code -1
+@return the codes, the UTF-8 bytes of the distinct values, and the offset of each value in those bytes
+"""
+def encode_text(values) -> tuple:
+
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    encoded = [str(value).encode('utf-8') for value in uniques]
+
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(value) for value in encoded])
+    blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+    dtype = np.int32 if len(uniques) < 2 ** 31 else np.int64
+
+    return codes.astype(dtype), blob, offsets
+
+
+"""
+Rebuilds the table of distinct values interned by encode_text
+@param blob: the UTF-8 bytes of the distinct values
+@param offsets: the offset of each value in the bytes
+@return array holding the distinct values
+"""
+def decode_text(blob, offsets) -> np.ndarray:
+
+    data = np.asarray(blob).tobytes()
+    values = np.empty(len(offsets) - 1, dtype=object)
+    values[:] = [data[start:end].decode('utf-8') for start, end in zip(offsets[:-1], offsets[1:])]
+
+    return values
+
+
+"""
+Saves a frame of data as one .npy file per column (three for text columns) plus a manifest. The data is
+written to a temporary directory first, and only moved into place once it is complete.
+@param data: the frame of data, its index is not saved
+@param directory: the directory receiving the files, replaced if it already holds columns saved here (or is empty)
+@raise ValueError: Something other than saved columns is already at the directory's path
+"""
+def write_columns(data: pd.DataFrame, directory: str) -> None:
+
+    # only columns saved here before are replaced, a file or a directory of anything else is never deleted
+    if os.path.exists(directory) and not is_columnar(directory):
+        raise ValueError(f"'{directory}' Already Exists and Does Not Hold Saved Columns, it Will Not be Replaced...")
+
+    staging = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    columns = []
+
+    for i, col in enumerate(data.columns):
+
+        series = data.iloc[:, i]
+        entry = {'name': col, 'dtype': str(series.dtype), 'file': f'column_{i}.npy'}
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            entry['kind'] = 'category'
+            codes, blob, offsets = encode_text(series.cat.categories)
+            np.save(os.path.join(staging, entry['file']), series.cat.codes.to_numpy())
+
+        elif pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+            entry['kind'] = 'numeric'
+            np.save(os.path.join(staging, entry['file']), series.to_numpy())
+            blob = None
+
+        else:
+            entry['kind'] = 'text'
+            codes, blob, offsets = encode_text(series.to_numpy())
+            np.save(os.path.join(staging, entry['file']), codes)
+
+        if blob is not None:
+            entry['values'] = f'column_{i}_values.npy'
+            entry['offsets'] = f'column_{i}_offsets.npy'
+            np.save(os.path.join(staging, entry['values']), blob)
+            np.save(os.path.join(staging, entry['offsets']), offsets)
+
+        columns.append(entry)
+
+    with open(os.path.join(staging, MANIFEST), 'w') as f:
+        json.dump({'rows': len(data), 'columns': columns}, f, indent=2)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(staging, directory)
+
+
+"""
+Checks whether a path is a directory that write_columns may replace
+@param directory: the path
+@return True if the path is a directory holding a manifest, or an empty directory
+"""
+def is_columnar(directory: str) -> bool:
+
+    return os.path.isdir(directory) and (os.path.isfile(os.path.join(directory, MANIFEST)) or not os.listdir(directory))
+
+
+"""
+Reads the manifest of a directory written by write_columns
+@param directory: the directory holding the columns
+@return the manifest
+"""
+def read_manifest(directory: str) -> dict:
+
+    with open(os.path.join(directory, MANIFEST), 'r') as f:
+        return json.load(f)
+
+
+"""
+Loads the interned table of a text or category column saved by write_columns, without decoding it
+@param directory: the directory holding the columns
+@param entry: the column's entry in the manifest
+@param mmap: If true, the bytes of the table are memory-mapped instead of read into memory
+@return the UTF-8 bytes of the distinct values, and the offset of each value in those bytes
+"""
+def load_text_table(directory: str, entry: dict, mmap: bool = False) -> tuple:
+
+    blob = np.load(os.path.join(directory, entry['values']), mmap_mode='r' if mmap else None)
+    offsets = np.load(os.path.join(directory, entry['offsets']))
+
+    return blob, offsets
+
+
+"""
+Loads the raw arrays of a single column saved by write_columns
+@param directory: the directory holding the columns
+@param entry: the column's entry in the manifest
+@param mmap: If true, the arrays are memory-mapped instead of read into memory
+@return the column's values (or codes), and for text columns the table of distinct values
+"""
+def load_column(directory: str, entry: dict, mmap: bool = False) -> tuple:
+
+    values = np.load(os.path.join(directory, entry['file']), mmap_mode='r' if mmap else None)
+
+    if entry['kind'] == 'numeric':
+        return values, None
+
+    return values, decode_text(*load_text_table(directory, entry, mmap))
+
+
+"""
+Saves a single array as a .npy file next to the columns, so it can be memory-mapped when read back. The
+array is written to a temporary file first, and only moved into place once it is complete.
+@param directory: the directory holding the columns
+@param name: name of the array, saved as <name>.npy
+@param values: the array
+@return path to the saved array
+"""
+def write_array(directory: str, name: str, values) -> str:
+
+    path = os.path.join(directory, f'{name}.npy')
+    staging = f"{path}.tmp-{os.getpid()}.npy"
+
+    np.save(staging, np.ascontiguousarray(values))
+    os.replace(staging, path)
+
+    return path
+
+
+"""
+Loads a frame of data saved by write_columns, restoring every column to its original data type
+@param directory: the directory holding the columns
+@param mmap: If true, the arrays are memory-mapped instead of read into memory
+@return the frame of data
+"""
+def read_columns(directory: str, mmap: bool = False) -> pd.DataFrame:
+
+    manifest = read_manifest(directory)
+    columns = {}
+
+    for entry in manifest['columns']:
+
+        values, table = load_column(directory, entry, mmap)
+
+        if entry['kind'] == 'numeric':
+            columns[entry['name']] = values
+
+        elif entry['kind'] == 'category':
+            columns[entry['name']] = pd.Categorical.from_codes(np.asarray(values), categories=table)
+
+        else:
+            text = np.empty(len(values), dtype=object)
+            present = np.asarray(values) >= 0
+            text[present] = table[values[present]]
+            text[~present] = np.nan
+            columns[entry['name']] = pd.Series(text, dtype=entry['dtype'])
+
+    return pd.DataFrame(columns, index=pd.RangeIndex(manifest['rows']))
@@ -0,0 +1,128 @@
+"""
+This class declares a single feature of the resorts, such as the run count or the price of a lift ticket:
+the column holding it, the input file it is read from, whether higher or lower values are preferred, how
+it is scaled during pre-processing, and how its missing values are imputed. Every stage of the application
+works over the features of the registry below instead of naming them one by one, so a new feature (snowfall,
+vertical drop, acreage, ...) only needs to be declared once, with register_feature.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+class Feature:
+
+
+    """
+    Constructor
+    @param column: the column holding the feature
+    @param key: the name of the feature's criterion, as chosen by users (runs, price, elevation)
+    @param source: the name of the input file holding the feature (runs, prices, elevation)
+    @param title: the name of the feature in messages
+    @param label: the name of the feature when asking users for their preferences
+    @param ranking_column: the column holding each resort's rank when sorted by the feature
+    @param description: what a resort is missing when it has no value for the feature
+    @param prompt: explains what a 'Yes' preference for the feature means
+    @param higher_is_better: If true, resorts with higher values are preferred, otherwise lower values are
+    @param scaling: how pre-processing scales the feature ('z-score' or 'min-max')
+    @param imputation: what missing values are filled with after merging ('median', 'mean' or 'zero')
+    @param dtype: the data type of the feature once pre-processed ('int64' or 'float64')
+    @param read_fill: what missing values are filled with as the input file is organized ('zero', 'mean'),
+                      or None to leave them for the imputation after merging
+    @param absolute: If true, negative values are flipped as the input file is organized
+    @param weight_key: the name of the feature's weight in a preference profile, '<key>_weight' if None
+    @raise ValueError: The scaling, imputation or fill is not supported
+    """
+    def __init__(self, column: str, key: str, source: str, title: str, label: str, ranking_column: str, description: str, prompt: str,
+                 higher_is_better: bool, scaling: str = 'z-score', imputation: str = 'median', dtype: str = 'float64',
+                 read_fill: str = None, absolute: bool = False, weight_key: str = None):
+
+        if scaling not in ['z-score', 'min-max']:
+            raise ValueError(f"Scaling '{scaling}' is not 'z-score' or 'min-max'...")
+
+        if imputation not in ['median', 'mean', 'zero']:
+            raise ValueError(f"Imputation '{imputation}' is not 'median', 'mean' or 'zero'...")
+
+        if read_fill not in [None, 'mean', 'zero']:
+            raise ValueError(f"Fill '{read_fill}' is not 'mean' or 'zero'...")
+
+        self.column = column
+        self.key = key
+        self.source = source
+        self.title = title
+        self.label = label
+        self.ranking_column = ranking_column
+        self.description = description
+        self.prompt = prompt
+        self.higher_is_better = higher_is_better
+        self.scaling = scaling
+        self.imputation = imputation
+        self.dtype = dtype
+        self.read_fill = read_fill
+        self.absolute = absolute
+        self.weight_key = weight_key or f"{key}_weight"
+
+
+    def __repr__(self) -> str:
+
+        return f"Feature({self.column!r})"
+
+
+# the registry of features, in the order they are held by the matrix of features
+FEATURES = [
+    Feature('Run Count', 'runs', 'runs', 'Run Count', 'Run Count', 'Run Count Ranking', 'number of runs',
+            "A 'Yes' to Run Count will find resorts with the highest number of runs.",
+            higher_is_better=True, scaling='z-score', dtype='int64', read_fill='zero', absolute=True, weight_key='run_weight'),
+    Feature('Price (USD)', 'price', 'prices', 'Price', 'Prices', 'Price Ranking', 'prices',
+            "A 'Yes' to Prices will find resorts with the cheapest prices.",
+            higher_is_better=False, scaling='min-max'),
+    Feature('Peak Elevation (m)', 'elevation', 'elevation', 'Peak Elevation', 'Elevation', 'Elevation Ranking', 'peak elevation',
+            "A 'Yes' to Elevation will find resorts with the highest peak elevation (in meters)",
+            higher_is_better=True, scaling='z-score', read_fill='mean', absolute=True)
+]
+
+
+"""
+Adds a feature to the registry, it must be registered before any data is processed
+@param feature: the feature
+@raise ValueError: A registered feature already goes by the feature's column, criterion or input file
+"""
+def register_feature(feature: Feature) -> None:
+
+    names = {feature.column, feature.key, feature.source}
+
+    for registered in FEATURES:
+        if names & {registered.column, registered.key, registered.source}:
+            raise ValueError(f"Feature '{feature.column}' clashes with the registered feature '{registered.column}'...")
+
+    FEATURES.append(feature)
+
+
+"""
+Lists the columns of every registered feature
+@return the columns, in registry order
+"""
+def feature_columns() -> list:
+
+    return [feature.column for feature in FEATURES]
+
+
+"""
+Lists the definition of every registered feature, so anything worked out from the features can tell when they change
+@return the attributes of each feature, in registry order
+"""
+def feature_definitions() -> list:
+
+    return [dict(vars(feature)) for feature in FEATURES]
+
+
+"""
+Looks up a registered feature by its column, criterion or input file
+@param name: the column, criterion (runs, price, elevation) or input file (runs, prices, elevation) of the feature
+@return the feature
+@raise KeyError: No registered feature goes by the name
+"""
+def get_feature(name: str) -> Feature:
+
+    for feature in FEATURES:
+        if name in [feature.column, feature.key, feature.source]:
+            return feature
+
+    raise KeyError(f"{name} is not a registered feature...")
@@ -0,0 +1,382 @@
+from process_data import PreProcessing
+from features import FEATURES, get_feature
+from verbosity import report
+import pandas as pd
+import numpy as np
+
+"""
+This class keeps an already pre-processed dataset up to date as resorts are inserted, updated and deleted,
+without running PreProcessing.pre_process_data again. Each delta is keyed on 'Resort ID'. Running statistics
+are kept for every feature: the sorted observed values give the median used for imputation (and the min/max),
+and running sums give the mean and standard deviation of the z-scores. The scaling fitted on the data is
+only refitted when a delta moves it further than a tolerance; until then, only the rows touched by a delta
+are normalized again. Values left blank within an input file and filled as the file was read (such as the mean
+peak elevation) are kept as they were filled, where a full recompute would fill them again.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+class IncrementalUpdater:
+
+
+    """
+    Constructor
+    @param preprocessor: a PreProcessing object that has already pre-processed the data
+    @param tolerance: how far (relative to the fitted scale) the min/max, mean or standard deviation of a feature
+                      may move before the feature needs to be rescaled
+    """
+    def __init__(self, preprocessor: PreProcessing, tolerance: float = 0.01):
+
+        if preprocessor.debugged_data is None or preprocessor.imputed_features is None:
+            raise ValueError("The data must be pre-processed before it can be updated incrementally...")
+
+        # only a median can be kept up to date from the sorted observed values
+        if any(feature.imputation != 'median' for feature in FEATURES):
+            raise ValueError("Only features imputed with their median can be updated incrementally...")
+
+        self.tolerance = tolerance
+        self.scaling = {feature.column: feature.scaling for feature in FEATURES}
+        self.name_columns = {
+            'Resort': [col for col in preprocessor.debugged_data.columns if col.startswith('Resort') and col != 'Resort ID'],
+            'Country': [col for col in preprocessor.debugged_data.columns if col.startswith('Country')]
+        }
+
+        self.columns = list(preprocessor.debugged_data.columns)
+        self.raw = preprocessor.debugged_data.set_index('Resort ID', drop=False)
+        self.imputed = preprocessor.imputed_features.set_axis(self.raw.index)
+
+        # resorts inserted without a name or country are filled in the same way debug_data fills them
+        self.text_fill = {col: self.raw[col].mode()[0] for col in self.raw.select_dtypes(include=['object', 'category']).columns}
+
+        self.observed = {}
+        self.sums = {}
+        self.fills = {}
+
+        for feature in self.scaling:
+            values = self.raw[feature].to_numpy(dtype=float)
+            self.observed[feature] = np.sort(values[~self.imputed[feature].to_numpy()])
+            self.sums[feature] = [values.sum(), np.square(values).sum()]
+            self.fills[feature] = self.fill_value(feature)
+
+        self.fitted = self.current_scaling()
+        self.processed = self.raw.copy()
+        self.normalize_rows(None)
+
+
+    """
+    The value missing features are imputed with, the median of the observed values
+    @param feature: the feature being imputed
+    @return the imputed value
+    """
+    def fill_value(self, feature: str) -> float:
+
+        observed = self.observed[feature]
+
+        if len(observed) == 0:
+            return np.nan
+
+        middle = len(observed) // 2
+        median = observed[middle] if len(observed) % 2 else (observed[middle - 1] + observed[middle]) / 2
+
+        # the imputed values of whole-number features (such as run counts) are converted to integers by pre_process_data
+        return float(int(median)) if get_feature(feature).dtype == 'int64' else float(median)
+
+
+    """
+    Computes the scaling of every feature from the running statistics, as an (offset, scale) pair where
+    the normalized value is (value - offset) / scale, following MinMaxScaler and StandardScaler
+    @return the offset and scale of each feature
+    """
+    def current_scaling(self) -> dict:
+
+        scaling = {}
+        count = max(1, len(self.raw))
+
+        for feature, method in self.scaling.items():
+
+            if method == 'min-max':
+                low = self.observed[feature][0] if len(self.observed[feature]) else self.fills[feature]
+                high = self.observed[feature][-1] if len(self.observed[feature]) else self.fills[feature]
+
+                if self.imputed[feature].any():
+                    low, high = min(low, self.fills[feature]), max(high, self.fills[feature])
+
+                scaling[feature] = (low, high - low if high > low else 1.0)
+
+            else:
+                total, squares = self.sums[feature]
+                mean = total / count
+                std = np.sqrt(max(squares / count - mean ** 2, 0.0))
+
+                scaling[feature] = (mean, std if std > 0 else 1.0)
+
+        return scaling
+
+
+    """
+    Normalizes rows of the raw data into the processed data, using the fitted scaling
+    @param labels: the Resort IDs of the rows to normalize, every row if None
+    """
+    def normalize_rows(self, labels) -> None:
+
+        if labels is not None and len(labels) == 0:
+            return
+
+        for feature in self.scaling:
+
+            offset, scale = self.fitted[feature]
+            values = self.raw[feature] if labels is None else self.raw.loc[labels, feature]
+            values = (values.to_numpy(dtype=float) - offset) / scale
+
+            # validation converts the z-scores of whole-number features back to integers, and flips negative values
+            if get_feature(feature).dtype == 'int64':
+                values = np.trunc(values).astype(np.int64)
+
+            values = np.abs(values)
+
+            if labels is None:
+                self.processed[feature] = values
+            else:
+                self.processed.loc[labels, feature] = values
+
+
+    """
+    Removes values from the sorted observed values of a feature
+    @param feature: the feature
+    @param values: the values to remove
+    """
+    def remove_observed(self, feature: str, values) -> None:
+
+        values = np.sort(np.asarray(values, dtype=float))
+
+        if len(values) == 0:
+            return
+
+        # equal values are removed from consecutive positions
+        starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+        repeat = np.arange(len(values)) - np.repeat(starts, np.diff(np.r_[starts, len(values)]))
+        positions = np.searchsorted(self.observed[feature], values, side='left') + repeat
+
+        self.observed[feature] = np.delete(self.observed[feature], positions)
+
+
+    """
+    Adds values to the sorted observed values of a feature
+    @param feature: the feature
+    @param values: the values to add
+    """
+    def add_observed(self, feature: str, values) -> None:
+
+        values = np.sort(np.asarray(values, dtype=float))
+        positions = np.searchsorted(self.observed[feature], values)
+
+        self.observed[feature] = np.insert(self.observed[feature], positions, values)
+
+
+    """
+    Cleans the feature values of a delta the same way organize_data cleans the input files
+    @param feature: the feature
+    @param values: the values of the delta
+    @return the cleaned values
+    """
+    def clean_values(self, feature: str, values: pd.Series) -> pd.Series:
+
+        values = pd.to_numeric(values).abs()
+
+        return np.trunc(values) if get_feature(feature).dtype == 'int64' else values
+
+
+    """
+    Adds the values a categorical column (such as the country) has not seen yet to its categories
+    @param col: the column
+    @param values: the values about to be written to the column
+    """
+    def add_categories(self, col: str, values: pd.Series) -> None:
+
+        if not isinstance(self.raw[col].dtype, pd.CategoricalDtype):
+            return
+
+        unseen = pd.Index(values.dropna().unique()).difference(self.raw[col].cat.categories)
+
+        if len(unseen):
+            self.raw[col] = self.raw[col].cat.add_categories(unseen)
+            self.processed[col] = self.processed[col].cat.add_categories(unseen)
+
+
+    """
+    Applies a delta of inserted, updated and deleted resorts to the processed data
+    @param inserts: frame of new resorts, holding 'Resort ID' and any of the features, 'Resort' and 'Country'
+    @param updates: frame of changed resorts, holding 'Resort ID' and the values that changed (missing values are left alone)
+    @param deletes: the Resort IDs of removed resorts
+    @param rescale: If None, features are rescaled only when the delta moved their scaling past the tolerance,
+                    if true they are always rescaled, and if false they are never rescaled
+    @return report of the delta, and of how far it moved the scaling of each feature
+    @raise ValueError: A resort is inserted twice, an updated or deleted resort does not exist, or a value is not a number
+    """
+    def apply(self, inserts: pd.DataFrame = None, updates: pd.DataFrame = None, deletes=None, rescale: bool = None) -> dict:
+
+        deletes = pd.Index(deletes) if deletes is not None and len(deletes) else None
+        updates = updates.set_index('Resort ID', drop=False) if updates is not None and len(updates) else None
+        inserts = inserts.set_index('Resort ID', drop=False) if inserts is not None and len(inserts) else None
+
+        # the whole delta is checked, and its values cleaned, before any of it is applied, so a rejected delta leaves the data as it was
+        kept = self.raw.index
+
+        if deletes is not None:
+            missing = deletes.difference(kept)
+
+            if len(missing):
+                raise ValueError(f"Cannot Delete Resorts That Do Not Exist: {', '.join(map(str, missing))}")
+
+            kept = kept.difference(deletes)
+
+        if updates is not None:
+            missing = updates.index.difference(kept)
+
+            if len(missing):
+                raise ValueError(f"Cannot Update Resorts That Do Not Exist: {', '.join(map(str, missing))}")
+
+        if inserts is not None and (inserts.index.has_duplicates or len(inserts.index.intersection(kept))):
+            raise ValueError("Cannot Insert Resorts That Already Exist...")
+
+        updated = {}
+        inserted = {}
+
+        for feature in self.scaling:
+
+            if updates is not None and feature in updates.columns:
+                updated[feature] = self.clean_values(feature, updates[feature]).dropna()
+
+            if inserts is not None:
+                inserted[feature] = self.clean_values(feature, inserts[feature]) if feature in inserts.columns else pd.Series(np.nan, index=inserts.index)
+
+        touched = set()
+
+        if deletes is not None:
+
+            for feature in self.scaling:
+                values = self.raw.loc[deletes, feature]
+                self.remove_observed(feature, values[~self.imputed.loc[deletes, feature]])
+                self.sums[feature][0] -= values.sum()
+                self.sums[feature][1] -= np.square(values.to_numpy(dtype=float)).sum()
+
+            self.raw = self.raw.drop(index=deletes)
+            self.imputed = self.imputed.drop(index=deletes)
+            self.processed = self.processed.drop(index=deletes)
+
+        if updates is not None:
+
+            for feature, values in updated.items():
+
+                labels = values.index
+
+                old = self.raw.loc[labels, feature]
+                self.remove_observed(feature, old[~self.imputed.loc[labels, feature]])
+                self.add_observed(feature, values)
+
+                self.sums[feature][0] += values.sum() - old.sum()
+                self.sums[feature][1] += np.square(values.to_numpy()).sum() - np.square(old.to_numpy(dtype=float)).sum()
+
+                self.raw.loc[labels, feature] = values.astype(self.raw[feature].dtype)
+                self.imputed.loc[labels, feature] = False
+                touched.update(labels)
+
+            for name, columns in self.name_columns.items():
+                if name in updates.columns:
+                    names = updates[name].dropna()
+
+                    for col in columns:
+                        self.add_categories(col, names)
+                        self.raw.loc[names.index, col] = names
+                        self.processed.loc[names.index, col] = names
+
+        if inserts is not None:
+
+            rows = pd.DataFrame(index=inserts.index, columns=self.columns)
+            rows['Resort ID'] = inserts['Resort ID']
+
+            for name, columns in self.name_columns.items():
+                for col in columns:
+                    values = inserts[name] if name in inserts.columns else pd.Series(np.nan, index=inserts.index)
+                    rows[col] = values.fillna(self.text_fill.get(col, np.nan))
+
+            imputed = pd.DataFrame(index=inserts.index)
+
+            for feature, values in inserted.items():
+                imputed[feature] = values.isna()
+
+                self.add_observed(feature, values.dropna())
+                values = values.fillna(self.fills[feature])
+
+                self.sums[feature][0] += values.sum()
+                self.sums[feature][1] += np.square(values.to_numpy(dtype=float)).sum()
+                rows[feature] = values
+
+            # countries the data has not seen yet are added to the categories before the rows are typed
+            for col in self.raw.select_dtypes(include=['category']).columns:
+                self.add_categories(col, rows[col])
+
+            rows = rows.astype(self.raw.dtypes.to_dict())
+            self.raw = pd.concat([self.raw, rows])
+            self.imputed = pd.concat([self.imputed, imputed[self.imputed.columns]])
+            self.processed = pd.concat([self.processed, rows])
+            touched.update(inserts.index)
+
+        # imputed values follow the median, just like a full recompute would impute them
+        for feature in self.scaling:
+
+            fill = self.fill_value(feature)
+
+            if fill != self.fills[feature] and self.imputed[feature].any():
+                labels = self.imputed.index[self.imputed[feature].to_numpy()]
+
+                self.sums[feature][0] += len(labels) * (fill - self.fills[feature])
+                self.sums[feature][1] += len(labels) * (fill ** 2 - self.fills[feature] ** 2)
+
+                self.raw.loc[labels, feature] = fill
+                touched.update(labels)
+
+            self.fills[feature] = fill
+
+        current = self.current_scaling()
+        drift = {}
+
+        for feature, (offset, scale) in current.items():
+            fitted_offset, fitted_scale = self.fitted[feature]
+            drift[feature] = float(max(abs(offset - fitted_offset), abs(scale - fitted_scale)) / fitted_scale)
+
+        rescale_required = any(shift > self.tolerance for shift in drift.values())
+        rescaled = rescale if rescale is not None else rescale_required
+
+        if rescale_required:
+            moved = ', '.join(feature for feature, shift in drift.items() if shift > self.tolerance)
+            report(f"Scaling Moved Past the Tolerance ({self.tolerance}) For: {moved}")
+
+        if rescaled:
+            self.fitted = current
+            self.normalize_rows(None)
+            report(f"Rescaled All {len(self.raw)} Resorts...")
+        else:
+            self.normalize_rows(list(touched))
+
+        summary = {
+            'inserted': 0 if inserts is None else len(inserts),
+            'updated': 0 if updates is None else len(updates),
+            'deleted': 0 if deletes is None else len(deletes),
+            'renormalized': len(self.raw) if rescaled else len(touched),
+            'drift': drift,
+            'rescale_required': rescale_required,
+            'rescaled': bool(rescaled)
+        }
+
+        report(f"Delta Applied: {summary['inserted']} Inserted, {summary['updated']} Updated, {summary['deleted']} Deleted...")
+
+        return summary
+
+
+    """
+    The processed data, kept up to date with every delta. Resorts inserted by a delta are appended at the end.
+    @return the pre-processed data
+    """
+    def processed_data(self) -> pd.DataFrame:
+
+        return self.processed[self.columns].reset_index(drop=True)
@@ -0,0 +1,218 @@
+import tracemalloc
+import json
+import time
+
+"""
+This class measures every stage of the pipeline it is wrapped around: wall time, CPU time, peak memory,
+and the number of rows going in and coming out. Every finished stage is recorded, and handed to the hooks
+registered with the monitor, so the measurements can be printed, logged, or written out as JSON. Stages
+may be nested, each record names the stage it ran inside of.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+class StageMonitor:
+
+
+    """
+    Constructor
+    @param hooks: functions called with the record of every finished stage
+    @param trace_memory: If true, the peak memory of each stage is traced with tracemalloc, which slows
+                         the pipeline down noticeably
+    """
+    def __init__(self, hooks: list = None, trace_memory: bool = False):
+
+        self.enabled = True
+        self.hooks = list(hooks or [])
+        self.trace_memory = trace_memory
+        self.records = []
+        self.running = []
+
+
+    """
+    Registers a function to be called with the record of every finished stage
+    @param hook: the function receiving the records
+    """
+    def add_hook(self, hook) -> None:
+
+        self.hooks.append(hook)
+
+
+    """
+    Measures a single stage, used as a context manager around the stage:
+        with monitor.stage('merge_data', rows_in=rows) as stage:
+            ...
+            stage['rows_out'] = len(merged_data)
+    @param name: name of the stage
+    @param rows_in: the number of rows going into the stage
+    @return the context manager, yielding the record of the stage
+    """
+    def stage(self, name: str, rows_in: int = None):
+
+        return Stage(self, name, rows_in)
+
+
+    """
+    Starts measuring a stage
+    @param record: the record of the stage
+    """
+    def start(self, record: dict) -> None:
+
+        record['parent'] = self.running[-1]['stage'] if self.running else None
+
+        if self.trace_memory:
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+            # the peak of the stage this one runs inside of is kept before the peak is reset
+            if self.running:
+                parent = self.running[-1]
+                parent['peak_memory_bytes'] = max(parent['peak_memory_bytes'], tracemalloc.get_traced_memory()[1])
+
+            tracemalloc.reset_peak()
+            record['peak_memory_bytes'] = 0
+            record['start_memory_bytes'] = tracemalloc.get_traced_memory()[0]
+
+        self.running.append(record)
+        record['start_cpu'] = time.process_time()
+        record['start_wall'] = time.perf_counter()
+
+
+    """
+    Stops measuring a stage, recording it and handing it to every hook
+    @param record: the record of the stage
+    """
+    def stop(self, record: dict) -> None:
+
+        record['wall_seconds'] = time.perf_counter() - record.pop('start_wall')
+        record['cpu_seconds'] = time.process_time() - record.pop('start_cpu')
+        self.running.pop()
+
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            record['peak_memory_bytes'] = max(record['peak_memory_bytes'], peak)
+            record['memory_change_bytes'] = current - record.pop('start_memory_bytes')
+
+            if self.running:
+                parent = self.running[-1]
+                parent['peak_memory_bytes'] = max(parent['peak_memory_bytes'], record['peak_memory_bytes'])
+
+        self.records.append(record)
+
+        for hook in self.hooks:
+            hook(record)
+
+
+    """
+    Collects every recorded stage, in the order the stages finished
+    @return dictionary holding the records
+    """
+    def to_dict(self) -> dict:
+
+        return {'trace_memory': self.trace_memory, 'stages': self.records}
+
+
+    """
+    Writes every recorded stage to a JSON file
+    @param output_file: path to the JSON file
+    """
+    def write_json(self, output_file: str) -> None:
+
+        try:
+            with open(output_file, 'w') as f:
+                json.dump(self.to_dict(), f, indent=2)
+
+            print(f"Stage Measurements Written to: {output_file}")
+
+        except Exception as e:
+            print(f"Ran into an Error: Problem occurred while writing the stage measurements... {str(e)}")
+            raise
+
+
+"""
+Context manager measuring a single stage for a StageMonitor, the record it yields takes the number of rows
+coming out of the stage as 'rows_out'
+@author Aaron Howe
+@version Python 3.10.12
+"""
+class Stage:
+
+
+    """
+    Constructor
+    @param monitor: the monitor recording the stage
+    @param name: name of the stage
+    @param rows_in: the number of rows going into the stage
+    """
+    def __init__(self, monitor: StageMonitor, name: str, rows_in: int = None):
+
+        self.monitor = monitor
+        self.record = {'stage': name, 'rows_in': rows_in, 'rows_out': None}
+
+
+    def __enter__(self) -> dict:
+
+        self.monitor.start(self.record)
+
+        return self.record
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+
+        self.record['failed'] = exc_type is not None
+        self.monitor.stop(self.record)
+
+        return False
+
+
+"""
+Stand-in for a StageMonitor when instrumentation is turned off. Every stage is the same shared object,
+which measures nothing and ignores whatever is recorded on it, so the pipeline pays next to nothing for it.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+class DisabledMonitor:
+
+
+    def __init__(self):
+
+        self.enabled = False
+        self.records = []
+
+
+    def stage(self, name: str, rows_in: int = None):
+
+        return DISABLED_STAGE
+
+
+    def add_hook(self, hook) -> None:
+
+        raise ValueError("Hooks cannot be added while instrumentation is turned off...")
+
+
+"""
+The stage handed out by DisabledMonitor
+@author Aaron Howe
+@version Python 3.10.12
+"""
+class DisabledStage:
+
+
+    def __enter__(self):
+
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+
+        return False
+
+
+    def __setitem__(self, key, value) -> None:
+
+        pass
+
+
+# the shared monitor and stage used whenever instrumentation is turned off
+DISABLED_STAGE = DisabledStage()
+DISABLED_MONITOR = DisabledMonitor()
@@ -1,8 +1,19 @@
-from process_data import PreProcessing
-from ranking_data import RankingSkiResorts
-from weighted_sum import WeightedSumModel
+import time
+
+# recorded before any other import, to measure how long the application takes to start
+STARTUP_CLOCK = time.perf_counter()
+
+from process_data import PreProcessing, PIPELINE_VERSION
+from cache import ProcessedDataCache
+from features import FEATURES, feature_definitions
+from instrumentation import StageMonitor, DISABLED_MONITOR
+from verbosity import report, enabled, set_verbosity, DIAGNOSTIC, LEVELS
+from writers import WRITERS, CHUNK_ROWS
 import pandas as pd
 import argparse
+import json
+import math
+import csv
 import sys
 import os
 
@@ -20,16 +31,46 @@ class SummitSelect_Main:
     @param run_count_data: Path to data for the number of runs per resort
     @param price_data: Path to data for the price of a lift ticket per resort
     @param elevation_data: Path to data for the peak elevation (in meters) per resort
+    @param chunk_size: If given, the input files are streamed in chunks of this many rows
+    @param memory_limit: If given, the input files are streamed in chunks sized to stay under this many bytes
+    @param cache_dir: If given, pre-processed data is cached in this directory and reused while the input files are unchanged
+    @param workers: If given, the input files are read and organized concurrently by this many workers
+    @param executor: The kind of workers reading the files concurrently ('thread' or 'process')
+    @param parser_engine: The CSV parser, 'c' or the multithreaded 'pyarrow'
+    @param scaler_backend: The scalers normalizing the features, the built-in 'numpy' ones or scikit-learn's
+    @param monitor: If given, a StageMonitor measuring every stage of the application
+    @param ranking_workers: If given, the resorts are split into shards ranked and scored by this many worker processes
+    @param store_dir: If given, the pre-processed resorts are saved to this directory and ranked from a memory-mapping of it,
+                      which the ranking workers attach to instead of receiving copies of the resorts
+    @param result_cache: If given, a ResultCache memoizing the rankings, keyed by the version of the resorts they were worked out from
+    @param skyline: If true, the rankings of batch profiles only score the resorts of the first Pareto layers
+    @param compact: If true, the resorts are ranked from a compact store (see compact_column in resort_store.py),
+                    holding the features as float32, counts as small integers and names as interned codes
+    @param delta: If given, the paths of CSV files of resorts inserted, updated and deleted ('inserts', 'updates', 'deletes'),
+                  applied to the processed data by an IncrementalUpdater before the resorts are ranked
     """
-    def __init__(self, run_count_data: str, price_data: str, elevation_data: str):
+    def __init__(self, run_count_data: str, price_data: str, elevation_data: str, chunk_size: int = None, memory_limit: int = None, cache_dir: str = None,
+                 workers: int = None, executor: str = 'thread', parser_engine: str = 'c', scaler_backend: str = 'numpy', monitor: StageMonitor = None,
+                 ranking_workers: int = None, store_dir: str = None, result_cache: 'ResultCache' = None, skyline: bool = False,
+                 compact: bool = False, delta: dict = None):
 
         self.run_count_data = run_count_data
         self.price_data = price_data
         self.elevation_data = elevation_data
 
-        self.preprocessor = PreProcessing(run_count_data, price_data, elevation_data)
+        self.preprocessor = PreProcessing(run_count_data, price_data, elevation_data, chunk_size, memory_limit, workers, executor, parser_engine,
+                                          scaler_backend, monitor)
+        self.monitor = monitor or DISABLED_MONITOR
+        self.ranking_workers = ranking_workers
+        self.store_dir = store_dir
+        self.cache = ProcessedDataCache(cache_dir) if cache_dir else None
+        self.result_cache = result_cache
+        self.skyline = skyline
+        self.compact = compact
+        self.delta = delta
 
         self.data = None
+        self.store = None
         self.rank = None
         self.weighted_model = None
         
@@ -40,7 +81,8 @@ class SummitSelect_Main:
 
     """
     Data processing function, reading the data, loading it into memory, performing organization methods,
-    merging the three key features into one dataset, normalization, and validation.
+    merging the three key features into one dataset, normalization, and validation. When caching is enabled,
+    data cached from unchanged input files, features and scalers is loaded instead, skipping pre-processing altogether.
     @return the data pre-processed
     @raise: Exception: Errors during pre-processing
     """
@@ -48,13 +90,45 @@ class SummitSelect_Main:
 
         try:
 
-            print("Processing Data...")
-            self.processed_data = self.preprocessor.pre_process_data()
+            report("Processing Data...")
+            self.processed_data = None
+
+            if self.cache is not None:
+                # the processed data also depends on how each feature is declared and on the scalers normalizing them
+                settings = {'features': feature_definitions(), 'scaler_backend': self.preprocessor.scaler_backend}
+                cache_key = self.cache.key(list(self.preprocessor.input_files.values()), PIPELINE_VERSION, settings)
+                self.processed_data = self.cache.load(cache_key)
+
+            if self.processed_data is None:
+                self.processed_data = self.preprocessor.pre_process_data()
+
+                if self.cache is not None:
+                    self.cache.store(cache_key, self.processed_data)
+
+            if self.delta:
+                self.processed_data = self.apply_delta()
+
             self.data = self.processed_data
-            print("Data Successfully Processed!")
+            report("Data Successfully Processed!")
 
-            self.rank = RankingSkiResorts(self.processed_data)
-            self.weighted_model = WeightedSumModel(self.processed_data)
+            # the store and the rankers are only imported once there is data to rank, so parsing the arguments never waits on them
+            from resort_store import ResortStore
+            from ranking_data import RankingSkiResorts
+            from weighted_sum import WeightedSumModel
+
+            # both classes share the same read-only resort store, instead of each copying the data
+            self.store = ResortStore(self.processed_data, compact=self.compact)
+
+            if self.store_dir:
+                self.store.save(self.store_dir)
+                self.store = ResortStore.attach(self.store_dir)
+                report(f"Resorts Memory-Mapped From: {self.store_dir}")
+
+            if self.compact:
+                self.report_compact_store()
+
+            self.rank = RankingSkiResorts(self.store, self.ranking_workers, cache=self.result_cache)
+            self.weighted_model = WeightedSumModel(self.store, self.ranking_workers, cache=self.result_cache, skyline=self.skyline)
 
             return self.processed_data
         
@@ -64,6 +138,31 @@ class SummitSelect_Main:
             raise
     
 
+    """
+    Applies the delta of inserted, updated and deleted resorts to the processed data. The cache only holds the
+    normalized values, so when the processed data came from the cache the input files are pre-processed again,
+    giving the updater the values it scales.
+    @return the processed data, with the delta applied
+    @raise ValueError: A resort is inserted twice, or an updated or deleted resort does not exist
+    """
+    def apply_delta(self) -> pd.DataFrame:
+
+        from incremental import IncrementalUpdater
+
+        if self.preprocessor.debugged_data is None:
+            report("Cached Data Holds Only Normalized Values, Pre-Processing the Input Files to Apply the Delta...")
+            self.preprocessor.pre_process_data()
+
+        inserts = pd.read_csv(self.delta['inserts']) if self.delta.get('inserts') else None
+        updates = pd.read_csv(self.delta['updates']) if self.delta.get('updates') else None
+        deletes = pd.read_csv(self.delta['deletes'])['Resort ID'] if self.delta.get('deletes') else None
+
+        updater = IncrementalUpdater(self.preprocessor)
+        updater.apply(inserts, updates, deletes)
+
+        return updater.processed_data()
+
+
     """
     Developing the ranked list of each key feature from the input data
     @param data: Input data post-processing
@@ -79,7 +178,7 @@ class SummitSelect_Main:
         
         try:
 
-            print("Developing Ranked Data...")
+            report("Developing Ranked Data...")
 
             self.rankings = {
                 'runs': self.rank.sorting_by_run_count(),
@@ -87,11 +186,12 @@ class SummitSelect_Main:
                 'elevation': self.rank.sorting_by_elevation()
             }
 
-            print("Rankings Finished!")
+            report("Rankings Finished!")
 
-            for criterion, ranking in self.rankings.items():
-                print(f"\nTop Five Resorts, Sorted by {criterion}:")
-                print(ranking.head().to_string(index=False))
+            if enabled(DIAGNOSTIC):
+                for criterion, ranking in self.rankings.items():
+                    print(f"\nTop Five Resorts, Sorted by {criterion}:")
+                    print(ranking.head().to_string(index=False))
 
             return self.rankings
         
@@ -105,28 +205,30 @@ class SummitSelect_Main:
     Develops the final overall ranking of top-n ski resorts based on the computed results of the
     weighted sum model on the rankings of the three key features, based on user preference.
     @param rankings: The dictionary that holds the ranked data for each feature
+    @param top_k: If given, only the top k resorts are selected and sorted, otherwise every resort is ranked
     @return The overall ranked list of ski resorts
     @raise ValueError: An error indicating that the object reference of the WeightedSumModel has not
                        been initialized
     @raise Exception: Errors while developing the overall ranking
     """
-    def create_final_ranking(self, run_pref: bool, price_pref: bool, elevation_pref: bool) -> pd.DataFrame:
+    def create_final_ranking(self, run_pref: bool, price_pref: bool, elevation_pref: bool, top_k: int = None) -> pd.DataFrame:
 
         if self.weighted_model is None:
             raise ValueError("The Class 'WeightedSumModel' Has Not Been Properly Initialized...")
         
         try:
             # retrieving the user's selected preferences
-            print("\nCurating a list of resorts...")
+            report("\nCurating a list of resorts...")
             self.weighted_model.set_preferences(run_pref, price_pref, elevation_pref)
             self.weighted_model.normalize_data()
-            self.weighted_model.weighted_sum_model()
+            self.weighted_model.weighted_sum_model(top_k)
 
             self.final_ranking = self.weighted_model.ranking()
 
-            print("\nFinal List Successfully Developed!")
-            print("\nTop 10 Resorts:")
-            print(self.weighted_model.return_ranking(10).to_string(index=False))
+            report("\nFinal List Successfully Developed!")
+            if enabled(DIAGNOSTIC):
+                print("\nTop 10 Resorts:")
+                print(self.weighted_model.return_ranking(10).to_string(index=False))
 
             return self.final_ranking
         
@@ -137,50 +239,29 @@ class SummitSelect_Main:
 
 
     """
-    Dumping the final list into an output text file for the user to view and save their results
+    Dumping the final list into an output file for the user to view and save their results. The text format
+    is the human-readable report, the csv, jsonl and columnar formats hold the final ranking only.
     @param rankings: The dictionary that holds the rankings of each feature
     @param final_ranking: The dictionary that holds the final list of ranked ski resorts
     @param output_file: The variable holder for the output file to dump the results into
+    @param output_format: The format of the output file ('text', 'csv', 'jsonl' or 'columnar')
+    @param chunk_rows: How many resorts are formatted and written at a time
+    @raise ValueError: The output format does not exist
     @raise Exception: Errors while writing to a file
     """
-    def dump_output(self, rankings: dict, final_ranking: pd.DataFrame, output_file: str) -> None:
-
-        try:
-
-            print(f"\nDumping Output into {output_file}...")
-
-            with open(output_file, 'w') as f:
-
-                f.write("SummitSelect: List of Recommended Ski Resorts\n")
-                f.write("=" * 40 + "\n\n")
+    def dump_output(self, rankings: dict, final_ranking: pd.DataFrame, output_file: str, output_format: str = 'text',
+                    chunk_rows: int = CHUNK_ROWS) -> None:
 
-                f.write("Final List:\n")
-                f.write("-" * 40 + "\n")
+        if output_format not in WRITERS:
+            raise ValueError(f"Output Format '{output_format}' is not one of {', '.join(WRITERS)}...")
 
-                for _, resort in final_ranking.iterrows():
-                    f.write(f"{int(resort['Rank'])} Rank: {resort['Resort']}\n")
-                    f.write(f" Run Count: {int(resort['Run Count'])}\n")
-                    f.write(f" Price (USD): ${resort['Price (USD)']:.2f}\n")
-                    f.write(f" Peak Elevation (m): {int(resort['Peak Elevation (m)'])}\n")
-                    f.write("\n")
-
-                f.write("\nHow Each Feature Ranks Based on Your Preferences:\n")
-                f.write("-" * 40 + "\n")
-
-                for criterion, ranking in rankings.items():
-                    f.write(f"\nTop 10 Resorts By {criterion.capitalize()}:\n")
+        try:
 
-                    for i, (_, resort) in enumerate(ranking.head(10).iterrows(), 1):
-                        f.write(f"{i}. {resort['Resort']} - ")
+            report(f"\nDumping Output into {output_file}...")
 
-                        if criterion == 'runs':
-                            f.write(f"{int(resort['Run Count'])} runs\n")
-                        elif criterion == 'price':
-                            f.write(f"${resort['Price (USD)']:.2f}\n")
-                        elif criterion == 'elevation':
-                            f.write(f"{int(resort['Peak Elevation (m)'])} meters\n")
+            WRITERS[output_format](rankings, final_ranking, output_file, chunk_rows)
 
-            print(f"Houston, we have output in {output_file}...")
+            report(f"Houston, we have output in {output_file}...")
 
         except Exception as e:
 
@@ -191,11 +272,14 @@ class SummitSelect_Main:
     """
     This function executes the main application function, processing the data, developing the lists,
     curating a final list, and dumping the output into the results text file.
+    @param output_file: Path to the output file
+    @param output_format: The format of the output file ('text', 'csv', 'jsonl' or 'columnar')
+    @param final_count: How many resorts the final list holds, only these are selected and sorted, every resort if None
     @raise ValueError: Error indicating there's an issue with the input data.
     @raise FileNotFoundError: Error indicating there's an input file missing.
     @raise Exception: Errors when executing the list development from the input data.
     """
-    def run(self, output_file):
+    def run(self, output_file, output_format: str = 'text', final_count: int = None):
 
         try:
 
@@ -204,7 +288,9 @@ class SummitSelect_Main:
             print("We analyze data for the number of runs, price per lift ticket, and peak elevation from 100 different resorts across North America.")
             print("We will now curate your list...")
 
-            processed_data = self.process_data()
+            with self.monitor.stage('process_data') as stage:
+                processed_data = self.process_data()
+                stage['rows_out'] = len(processed_data)
             print("Processing Step Complete.\n")
 
             print("Please Specify Your Preferences: ")
@@ -213,17 +299,24 @@ class SummitSelect_Main:
             elevation_preference = input("Are you looking for a resort with a higher peak elevation? (Yes/No): ").lower() == 'yes'
 
             print("Now ranking each feature based on your preferences...")
-            rankings = self.create_rankings(processed_data)
+            with self.monitor.stage('create_rankings', len(processed_data)) as stage:
+                rankings = self.create_rankings(processed_data)
+                stage['rows_out'] = sum(len(ranking) for ranking in rankings.values())
             print("Rankings Developed.\n")
 
             print("Now developing a ranked list of resorts curated to your preferences...")
-            final_ranking = self.create_final_ranking(run_count_preference, price_preference, elevation_preference)
+            with self.monitor.stage('create_final_ranking', len(processed_data)) as stage:
+                final_ranking = self.create_final_ranking(run_count_preference, price_preference, elevation_preference, final_count)
+                stage['rows_out'] = len(final_ranking)
             print("List Created Successfully.\n")
+            self.report_result_cache()
 
             print("Sending your list to the output folder...")
             
             try:
-                self.dump_output(rankings, final_ranking, output_file)
+                with self.monitor.stage('dump_output', len(final_ranking)) as stage:
+                    self.dump_output(rankings, final_ranking, output_file, output_format)
+                    stage['rows_out'] = len(final_ranking)
             except Exception as e:
                 print(f"Ran into an Error: Problem occurred writing to the output file... {str(e)}")
                 print("Execution Will Continue.")
@@ -249,6 +342,208 @@ class SummitSelect_Main:
             print("\nI hope this program has helped you in finding your dream resort. If you're going to shred, shred hard, but be safe!.")                
     
 
+    """
+    Reports the hits and misses of the result cache, if there is one
+    """
+    def report_result_cache(self) -> None:
+
+        if self.result_cache is not None:
+            stats = self.result_cache.stats()
+            report(f"Result Cache: {stats['hits']} Hits, {stats['misses']} Misses ({stats['hit_rate']:.1%}), {stats['evictions']} Evictions, "
+                   f"{stats['entries']} Rankings Held in {stats['bytes']} Bytes", DIAGNOSTIC)
+
+
+    """
+    Reports how many bytes the compact store saves, and checks that it ranks the resorts exactly as the
+    full-precision data does, reporting how far any resort moved otherwise. Skipped unless diagnostics are printed.
+    """
+    def report_compact_store(self) -> None:
+
+        if not enabled(DIAGNOSTIC):
+            return
+
+        # the check is only imported by the runs asking for a compact store
+        from resort_store import ResortStore
+        from rank_drift import rank_drift
+
+        reference = ResortStore(self.processed_data)
+        full_bytes = sum(reference.memory_usage().values())
+        compact_bytes = sum(usage for col, usage in self.store.memory_usage().items() if col in self.store.column_names)
+
+        print(f"Compact Store: {compact_bytes} of {full_bytes} Bytes ({compact_bytes / max(1, full_bytes):.1%})")
+
+        drift = rank_drift(reference, self.store)
+        moved = [ranking for ranking in drift['rankings'] if ranking['moved']]
+
+        if drift['unchanged']:
+            print(f"Compact Store Rankings Unchanged Across {len(drift['rankings'])} Rankings...")
+            return
+
+        print(f"Compact Store Rank Drift: {len(moved)} of {len(drift['rankings'])} Rankings Changed, Resorts Moved up to "
+              f"{drift['max_displacement']} Places, Scores Changed up to {drift['max_score_error']:.2e}")
+
+        for ranking in moved:
+            print(f"  {ranking['ranking']}: {ranking['moved']} Resorts Moved, up to {ranking['max_displacement']} Places")
+
+
+    """
+    Shuts down the workers of the sharded rankings, if any were started
+    """
+    def close(self) -> None:
+
+        for ranker in [self.rank, self.weighted_model]:
+            if ranker is not None:
+                ranker.close()
+    
+
+    """
+    Executes the application without prompting, processing the data once and then ranking the resorts for
+    every preference profile in the batch, writing each profile's ranking as one JSON line.
+    @param profiles_file: Path to the JSONL or CSV file of preference profiles, or '-' to read from stdin
+    @param output_file: Path to the JSONL file receiving the rankings
+    @raise ValueError: Error indicating there's an issue with the input data or a profile.
+    @raise Exception: Errors while ranking the profiles or writing the results.
+    """
+    def run_batch(self, profiles_file: str, output_file: str) -> None:
+
+        try:
+
+            profiles = read_profiles(profiles_file)
+            report(f"Loaded {len(profiles)} Preference Profiles...")
+
+            if not profiles:
+                raise ValueError("No Preference Profiles Found...")
+
+            with self.monitor.stage('process_data') as stage:
+                processed_data = self.process_data()
+                stage['rows_out'] = len(processed_data)
+            report("Processing Step Complete.\n")
+
+            weights = [profile['weights'] for profile in profiles]
+            preferences = [profile['preferences'] for profile in profiles]
+            n = max(profile['n'] for profile in profiles)
+
+            with self.monitor.stage('batch_ranking', len(processed_data)) as stage:
+                rankings = self.weighted_model.batch_ranking(weights, preferences, n)
+                stage['rows_out'] = sum(len(ranking) for ranking in rankings)
+
+            report(f"\nDumping Output into {output_file}...")
+
+            with self.monitor.stage('write_batch_output') as stage, open(output_file, 'w') as f:
+
+                for profile, ranking in zip(profiles, rankings):
+                    resorts = ranking.head(profile['n']).to_dict(orient='records')
+                    f.write(json.dumps({'id': profile['id'], 'ranking': resorts}) + "\n")
+
+                stage['rows_out'] = len(profiles)
+
+            report(f"Rankings for {len(profiles)} Profiles Written to {output_file}")
+            self.report_result_cache()
+
+            if self.weighted_model.index is not None:
+                report(f"Skyline Index: {self.weighted_model.index.pruning_rate():.2%} of Resorts Pruned Over {self.weighted_model.index.queries} Rankings", DIAGNOSTIC)
+
+        except Exception as e:
+
+            print(f"Ran into an Error: Problem occurred while ranking the batch of profiles... {str(e)}")
+            raise
+    
+
+
+"""
+Reads a batch of preference profiles from a JSONL or CSV file, or from stdin. Each profile may give an 'id',
+a yes/no preference for each registered feature ('runs', 'price', 'elevation'), the weight of each feature
+('run_weight', 'price_weight', 'elevation_weight'), and 'n', the number of resorts to return. Anything left
+out falls back to the defaults of the interactive mode.
+@param profiles_file: Path to the profiles, or '-' to read them from stdin
+@return list of profiles, each holding its id, weights, preferences and n
+@raise ValueError: A profile holds a value that could not be understood
+"""
+def read_profiles(profiles_file: str) -> list:
+
+    if profiles_file == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(profiles_file, 'r') as f:
+            lines = f.read().splitlines()
+
+    # the line each profile was read from, so errors point at it
+    line_numbers = [number for number, line in enumerate(lines, 1) if line.strip()]
+    lines = [line for line in lines if line.strip()]
+
+    # JSON lines open with a brace, anything else is read as CSV with a header row
+    if lines and lines[0].lstrip().startswith('{'):
+        records = [json.loads(line) for line in lines]
+    else:
+        records = list(csv.DictReader(lines))
+        line_numbers = line_numbers[1:]
+
+    profiles = []
+
+    for i, (record, line_number) in enumerate(zip(records, line_numbers), 1):
+
+        try:
+            profiles.append(parse_profile(record, i))
+
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Profile {i} (Line {line_number}) could not be read: {str(e)}")
+
+    return profiles
+
+
+"""
+Reads a single preference profile, as given in a batch file or in a request to the ranking service
+@param record: dictionary holding the fields of the profile, any of them may be left out
+@param default_id: the id of the profile when it does not give one
+@return the profile, holding its id, weights, preferences and n
+@raise ValueError: The profile holds a value that could not be understood
+@raise TypeError: The profile holds a value of the wrong type
+"""
+def parse_profile(record: dict, default_id) -> dict:
+
+    def field(key: str, default):
+
+        value = record.get(key)
+
+        return default if value is None or str(value).strip() == '' else value
+
+    def preference(value) -> bool:
+
+        if isinstance(value, bool):
+            return value
+
+        response = str(value).strip().lower()
+
+        if response in ['y', 'yes', 'true', '1']:
+            return True
+        if response in ['n', 'no', 'false', '0']:
+            return False
+
+        raise ValueError(f"Input Error: Preference '{value}' is not a 'Yes' or 'No' Response...")
+
+    def weight(value) -> float:
+
+        weight = float(value)
+
+        # NaN or infinite weights would rank nothing and write scores JSON can not hold
+        if not math.isfinite(weight):
+            raise ValueError(f"Input Error: Weight '{value}' is not a finite number...")
+
+        return weight
+
+    n = int(field('n', 10))
+
+    if n < 1:
+        raise ValueError("Resorts 'n' is found to not hold a positive value...")
+
+    return {
+        'id': field('id', default_id),
+        'preferences': [preference(field(feature.key, True)) for feature in FEATURES],
+        'weights': [weight(field(feature.weight_key, 0.33)) for feature in FEATURES],
+        'n': n
+    }
+
+
 """
 Functiong for parsing command-line arguments
 @return parsed arguments
@@ -261,6 +556,38 @@ def add_args():
     parsing_helper.add_argument('--price_data', type=str, required=True, help="Path to Price Data For Each Resort.")
     parsing_helper.add_argument('--elevation_data', type=str, required=True, help="Path to Peak Elevation Data for Each Resort.")
     parsing_helper.add_argument('--output', type=str, default='Ski_Resort_Results.txt', help="Path to the Output File.")
+    parsing_helper.add_argument('--final_count', type=int, default=None, help="Only List the Top this Many Resorts in the Final List (Every Resort if Not Given).")
+    parsing_helper.add_argument('--output_format', type=str, default='text', choices=list(WRITERS), help="Format of the Output File, Every Format but 'text' Holds the Final List Only.")
+    parsing_helper.add_argument('--batch', type=str, default=None, help="Path to a JSONL/CSV File of Preference Profiles to Rank Without Prompting ('-' for stdin).")
+    parsing_helper.add_argument('--batch_output', type=str, default='Ski_Resort_Batch_Results.jsonl', help="Path to the Output File of Batch Mode.")
+    parsing_helper.add_argument('--serve', action='store_true', help="Serve Rankings Over HTTP/JSON Instead of Prompting, Keeping the Processed Resorts Loaded.")
+    parsing_helper.add_argument('--host', type=str, default='127.0.0.1', help="Address the Ranking Service Listens On.")
+    parsing_helper.add_argument('--port', type=int, default=8080, help="Port the Ranking Service Listens On.")
+    parsing_helper.add_argument('--batch_window', type=float, default=5, help="Milliseconds a Ranking Request Waits to be Scored Along With Others.")
+    parsing_helper.add_argument('--max_batch', type=int, default=256, help="Most Profiles the Ranking Service Scores in One Pass.")
+    parsing_helper.add_argument('--max_concurrency', type=int, default=64, help="Most Requests the Ranking Service Handles at Once.")
+    parsing_helper.add_argument('--max_queue', type=int, default=1024, help="Most Profiles Waiting to be Scored Before Requests are Turned Away.")
+    parsing_helper.add_argument('--chunk_size', type=int, default=None, help="Stream the Input Files in Chunks of this Many Rows.")
+    parsing_helper.add_argument('--memory_limit', type=float, default=None, help="Stream the Input Files in Chunks Sized to Stay Under this Many Megabytes.")
+    parsing_helper.add_argument('--cache_dir', type=str, default='data-sets/.cache', help="Directory Caching the Pre-Processed Data Between Runs (Caching is On by Default, See --no_cache).")
+    parsing_helper.add_argument('--no_cache', action='store_true', help="Always Pre-Process the Input Files, Without Reading or Writing the Cache.")
+    parsing_helper.add_argument('--workers', type=int, default=None, help="Read and Organize the Input Files Concurrently With this Many Workers.")
+    parsing_helper.add_argument('--executor', type=str, default='thread', choices=['thread', 'process'], help="Kind of Workers Reading the Input Files Concurrently.")
+    parsing_helper.add_argument('--ranking_workers', type=int, default=None, help="Split the Resorts Into Shards Ranked by this Many Worker Processes.")
+    parsing_helper.add_argument('--store_dir', type=str, default=None, help="Save the Processed Resorts to this Directory and Rank From a Memory-Mapping of it.")
+    parsing_helper.add_argument('--result_cache', type=int, default=None, help="Memoize up to this Many Rankings, so Repeated Queries Skip Scoring.")
+    parsing_helper.add_argument('--result_cache_mb', type=float, default=64, help="Megabytes the Memoized Rankings May Take Up at Most.")
+    parsing_helper.add_argument('--skyline', action='store_true', help="Rank Batch Profiles From a Pareto-Layer Index, Scoring Only the Resorts that Can Reach the Top n.")
+    parsing_helper.add_argument('--delta_inserts', type=str, default=None, help="Path to a CSV File of Resorts to Insert Into the Processed Data.")
+    parsing_helper.add_argument('--delta_updates', type=str, default=None, help="Path to a CSV File of Changed Resorts, Keyed on Resort ID.")
+    parsing_helper.add_argument('--delta_deletes', type=str, default=None, help="Path to a CSV File Holding the Resort IDs of Resorts to Delete.")
+    parsing_helper.add_argument('--compact', action='store_true', help="Rank From a Compact Store (float32 Features, Small Integers, Interned Names), Checking it for Rank Drift.")
+    parsing_helper.add_argument('--parser_engine', type=str, default='c', choices=['c', 'pyarrow'], help="CSV Parser, 'pyarrow' is Multithreaded but Needs pyarrow Installed.")
+    parsing_helper.add_argument('--scaler_backend', type=str, default='numpy', choices=['numpy', 'sklearn'], help="Scalers Normalizing the Features, 'sklearn' Needs scikit-learn Installed.")
+    parsing_helper.add_argument('--startup_time', action='store_true', help="Print How Long the Application Took to Import and Parse its Arguments.")
+    parsing_helper.add_argument('--verbosity', type=str, default='diagnostic', choices=list(LEVELS), help="How Much is Printed, 'quiet' Skips Progress Messages and Diagnostics.")
+    parsing_helper.add_argument('--stage_metrics', type=str, default=None, help="Path to a JSON File Receiving the Time, Memory and Rows of Every Stage.")
+    parsing_helper.add_argument('--trace_memory', action='store_true', help="Also Trace the Peak Memory of Every Stage (Slower).")
 
     args = parsing_helper.parse_args()
 
@@ -276,8 +603,40 @@ def main():
 
     try:
         args = add_args()
-        app = SummitSelect_Main(args.run_count_data, args.price_data, args.elevation_data)
-        app.run(args.output)
+        set_verbosity(args.verbosity)
+
+        if args.startup_time:
+            print(f"Startup Time: {time.perf_counter() - STARTUP_CLOCK:.3f} Seconds")
+
+        memory_limit = int(args.memory_limit * 1024 * 1024) if args.memory_limit else None
+        cache_dir = None if args.no_cache else args.cache_dir
+        monitor = StageMonitor(trace_memory=args.trace_memory) if args.stage_metrics else None
+        result_cache = None
+
+        if args.result_cache:
+            from result_cache import ResultCache
+            result_cache = ResultCache(args.result_cache, int(args.result_cache_mb * 1024 * 1024))
+
+        delta = {'inserts': args.delta_inserts, 'updates': args.delta_updates, 'deletes': args.delta_deletes}
+        app = SummitSelect_Main(args.run_count_data, args.price_data, args.elevation_data, args.chunk_size, memory_limit, cache_dir,
+                                args.workers, args.executor, args.parser_engine, args.scaler_backend, monitor,
+                                args.ranking_workers, args.store_dir, result_cache, args.skyline, args.compact,
+                                delta if any(delta.values()) else None)
+
+        try:
+            if args.serve:
+                from service import run_service
+                run_service(app, host=args.host, port=args.port, batch_window=args.batch_window / 1000, max_batch=args.max_batch,
+                            max_concurrency=args.max_concurrency, max_queue=args.max_queue)
+            elif args.batch:
+                app.run_batch(args.batch, args.batch_output)
+            else:
+                app.run(args.output, args.output_format, args.final_count)
+        finally:
+            app.close()
+
+            if monitor is not None:
+                monitor.write_json(args.stage_metrics)
 
     except KeyboardInterrupt:
         print("\nUser Ended Program Functions. Program Will Now Exit.")
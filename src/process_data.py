@@ -1,8 +1,200 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler, StandardScaler
+from instrumentation import DISABLED_MONITOR
+from verbosity import report, enabled, DIAGNOSTIC
+from features import FEATURES, feature_columns, get_feature
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import os
 
+# bumped whenever a change to pre-processing changes its output, invalidating cached results
+PIPELINE_VERSION = '4'
+
+# the columns every input file holds about a resort, kept once in the merged data rather than once per file
+SHARED_COLUMNS = ['Resort', 'Country']
+
+# the columns every input file holds about a resort and the data type each is parsed as, followed in
+# each file by the column of the feature it holds (see features.py)
+KEY_SCHEMA = {'Resort ID': 'Int64', 'Resort': 'object', 'Country': 'category'}
+
+
+"""
+The columns read from an input file and the data type each is parsed as, every listed column is required,
+and any other column (such as the unnamed trailing columns of the run counts) is ignored
+@param source: the name of the input file (runs, prices, elevation)
+@return dictionary holding the data type of each column
+"""
+def input_schema(source: str) -> dict:
+
+    return {**KEY_SCHEMA, get_feature(source).column: 'float64'}
+
+
+"""
+Min-max scaling of features to the range 0 to 1, computed the same way as sklearn's MinMaxScaler
+@param values: the values of a single feature, or a matrix with one column per feature
+@return the scaled values
+"""
+def min_max_scale(values) -> np.ndarray:
+
+    values = np.asarray(values, dtype=float)
+    data_range = np.nanmax(values, axis=0) - np.nanmin(values, axis=0)
+
+    # a constant feature is left unscaled, rather than divided by zero
+    scale = 1.0 / np.where(data_range >= 10 * np.finfo(float).eps, data_range, 1.0)
+
+    return values * scale - np.nanmin(values, axis=0) * scale
+
+
+"""
+Z-score normalization of features, computed the same way as sklearn's StandardScaler
+@param values: the values of a single feature, or a matrix with one column per feature
+@return the normalized values
+"""
+def z_score(values) -> np.ndarray:
+
+    # column-major, so every column is summed exactly as it would be on its own
+    values = np.asarray(values, dtype=float, order='F')
+    count = np.count_nonzero(~np.isnan(values), axis=0)
+    mean = np.nansum(values, axis=0) / count
+
+    # corrected two-pass variance
+    difference = values - mean
+    variance = (np.nansum(difference ** 2, axis=0) - np.nansum(difference, axis=0) ** 2 / count) / count
+    std = np.sqrt(variance)
+
+    return (values - mean) / np.where(std >= 10 * np.finfo(float).eps, std, 1.0)
+
+
+"""
+Works out the value the missing values of a feature are filled with
+@param values: the values of the feature
+@param imputation: how the value is worked out ('median', 'mean' or 'zero')
+@return the value
+"""
+def impute_value(values: pd.Series, imputation: str) -> float:
+
+    if imputation == 'zero':
+        return 0
+
+    return values.mean() if imputation == 'mean' else values.median()
+
+
+"""
+Joins any number of frames on a key in a single pass. Every frame is aligned to the sorted union of the keys
+once, and its columns are gathered through that alignment, instead of merging the frames two at a time.
+Columns held by several frames (the shared columns) are kept once, taking each row's value from the first
+frame holding it. A frame holding a key more than once only contributes its first row for the key.
+@param frames: the frames of data, each holding the key
+@param key: the column the frames are joined on
+@param shared_columns: the columns kept once, every other column must belong to a single frame
+@return the joined frame of data, and a frame of the same length flagging, for every column that is not
+        shared, the rows missing a value (either absent from the column's frame, or blank within it)
+"""
+def outer_join(frames: list, key: str = 'Resort ID', shared_columns: list = SHARED_COLUMNS) -> tuple:
+
+    # a single hashing pass over every frame's keys gives the sorted union, and where each row's key falls in it
+    codes, union = pd.factorize(pd.concat([frame[key] for frame in frames], ignore_index=True), sort=True, use_na_sentinel=False)
+    bounds = np.cumsum([0] + [len(frame) for frame in frames])
+
+    # the position of every key of the union within each frame, -1 where the frame does not hold the key
+    indexers = [first_positions(codes[start:end], len(union)) for start, end in zip(bounds[:-1], bounds[1:])]
+
+    joined = {key: union.array}
+    missing = {}
+
+    for col in shared_columns:
+
+        sources = [(frame[col], indexer) for frame, indexer in zip(frames, indexers) if col in frame.columns]
+
+        if sources:
+            joined[col] = coalesce(sources)
+
+    for frame, indexer in zip(frames, indexers):
+
+        for col in frame.columns:
+
+            if col == key or col in shared_columns:
+                continue
+
+            if col in joined:
+                raise ValueError(f"Column '{col}' is held by more than one frame, it must be listed as a shared column...")
+
+            # rows absent from the frame are filled with missing values by the gather itself
+            values = frame[col].array if pd.api.types.is_extension_array_dtype(frame[col].dtype) else frame[col].to_numpy()
+            joined[col] = pd.api.extensions.take(values, indexer, allow_fill=True)
+            missing[col] = np.asarray(pd.isna(joined[col]))
+
+    index = pd.RangeIndex(len(union))
+
+    return pd.DataFrame(joined, index=index), pd.DataFrame(missing, index=index)
+
+
+"""
+Looks up where each key of the union first appears in a frame
+@param frame_codes: the position within the union of the key of each of the frame's rows, in row order
+@param size: the number of keys in the union
+@return array holding the row position of each key of the union, -1 for keys the frame does not hold
+"""
+def first_positions(frame_codes: np.ndarray, size: int) -> np.ndarray:
+
+    positions = np.full(size, -1, dtype=np.int64)
+
+    # written from the last row to the first, so the first row holding a key is the one kept
+    positions[frame_codes[::-1]] = np.arange(len(frame_codes) - 1, -1, -1)
+
+    return positions
+
+
+"""
+Combines the same column of several frames into one, taking each row's value from the first frame holding it.
+Each frame after the first is only looked up for the rows still missing a value.
+@param sources: the column of each frame, paired with the row position of every joined key within that frame
+@return the combined column, categorical (over the union of the categories) if every frame holds it as a category
+"""
+def coalesce(sources: list):
+
+    rows = len(sources[0][1])
+    categorical = all(isinstance(column.dtype, pd.CategoricalDtype) for column, _ in sources)
+
+    if categorical:
+        categories = sources[0][0].cat.categories
+
+        for column, _ in sources[1:]:
+            categories = categories.union(column.cat.categories)
+
+        values = np.full(rows, -1, dtype=np.int64)
+
+    else:
+        values = np.full(rows, np.nan, dtype=object)
+
+    # the rows still missing a value
+    pending = np.arange(rows)
+
+    for column, indexer in sources:
+
+        positions = indexer[pending]
+        found = positions >= 0
+        filled = pending[found]
+
+        if categorical:
+            # the frame's codes are translated into codes of the combined categories
+            recode = categories.get_indexer(column.cat.categories)
+            codes = column.cat.codes.to_numpy()[positions[found]]
+            taken = np.where(codes >= 0, recode[codes], -1)
+            present = taken >= 0
+
+        else:
+            taken = column.to_numpy(dtype=object)[positions[found]]
+            present = ~np.asarray(pd.isna(taken))
+
+        values[filled[present]] = taken[present]
+        pending = np.sort(np.concatenate([pending[~found], filled[~present]]))
+
+    if categorical:
+        return pd.Categorical.from_codes(values, categories=categories)
+
+    return values
+
+
 """
 This class performs data pre-processing on the three ski resort datasets, where we are
 managing reading and loading the data into memory, and merging the three key features (run count, prices, elevation).
@@ -18,15 +210,140 @@ class PreProcessing:
     @param run_count_data: path to data for each ski resorts' run counts
     @param price_data: path to data for each ski resorts' adult lift ticket price
     @param elevation_data: path to data for each ski resorts' peak elevation
+    @param chunk_size: if given, the input files are streamed in chunks of this many rows
+    @param memory_limit: if given, the input files are streamed in chunks sized to stay under this many bytes
+    @param workers: if given, the input files are read and organized concurrently by this many workers
+    @param executor: the kind of workers reading the files concurrently ('thread' or 'process')
+    @param parser_engine: the read_csv parser, 'c' or the multithreaded 'pyarrow' (which needs pyarrow installed),
+                          streamed files are always read by the 'c' parser as pyarrow cannot read in chunks
+    @param scaler_backend: 'numpy' for the built-in scalers, or 'sklearn' to import and use scikit-learn's scalers
+    @param monitor: if given, a StageMonitor measuring every stage of pre-processing
+    @param feature_data: paths to the input files of any further registered features (see features.py), keyed by
+                         the name of each feature's input file
+    @raise ValueError: A registered feature has no input file
     """
-    def __init__(self, run_count_data, price_data, elevation_data):
+    def __init__(self, run_count_data, price_data, elevation_data, chunk_size: int = None, memory_limit: int = None,
+                 workers: int = None, executor: str = 'thread', parser_engine: str = 'c', scaler_backend: str = 'numpy',
+                 monitor=None, feature_data: dict = None):
+
+        if executor not in ['thread', 'process']:
+            raise ValueError(f"Executor '{executor}' is not 'thread' or 'process'...")
+
+        if scaler_backend not in ['numpy', 'sklearn']:
+            raise ValueError(f"Scaler Backend '{scaler_backend}' is not 'numpy' or 'sklearn'...")
 
         self.run_count_data = run_count_data
         self.price_data = price_data
         self.elevation_data = elevation_data
-        self.run_count_dataframe = None
-        self.price_dataframe = None
-        self.elevation_dataframe = None
+        # the input file of every feature, keyed by the name of the file
+        self.input_files = {'runs': run_count_data, 'prices': price_data, 'elevation': elevation_data, **(feature_data or {})}
+
+        missing_files = [feature.source for feature in FEATURES if feature.source not in self.input_files]
+
+        if missing_files:
+            raise ValueError(f"No Input File Given for: {', '.join(missing_files)}")
+
+        self.chunk_size = chunk_size
+        self.memory_limit = memory_limit
+        self.workers = workers
+        self.executor = executor
+        self.parser_engine = parser_engine
+        self.scaler_backend = scaler_backend
+        self.monitor = monitor or DISABLED_MONITOR
+        # the frame of data read from each input file, keyed by the name of the file
+        self.dataframes = {source: None for source in self.input_files}
+        self.merged_data = None
+        # which feature values each merged resort is missing, found while joining the files
+        self.missing_features = None
+        # the merged data before normalization, and which of its feature values were imputed
+        self.debugged_data = None
+        self.imputed_features = None
+
+
+    """
+    The frame of data read from the run counts
+    """
+    @property
+    def run_count_dataframe(self) -> pd.DataFrame:
+
+        return self.dataframes['runs']
+
+
+    @run_count_dataframe.setter
+    def run_count_dataframe(self, data: pd.DataFrame) -> None:
+
+        self.dataframes['runs'] = data
+
+
+    """
+    The frame of data read from the prices
+    """
+    @property
+    def price_dataframe(self) -> pd.DataFrame:
+
+        return self.dataframes['prices']
+
+
+    @price_dataframe.setter
+    def price_dataframe(self, data: pd.DataFrame) -> None:
+
+        self.dataframes['prices'] = data
+
+
+    """
+    The frame of data read from the peak elevations
+    """
+    @property
+    def elevation_dataframe(self) -> pd.DataFrame:
+
+        return self.dataframes['elevation']
+
+
+    @elevation_dataframe.setter
+    def elevation_dataframe(self, data: pd.DataFrame) -> None:
+
+        self.dataframes['elevation'] = data
+
+
+    """
+    Counts the rows currently held across the frames of the input files
+    @return the number of rows
+    """
+    def frame_rows(self) -> int:
+
+        return sum(len(frame) for frame in self.dataframes.values() if frame is not None)
+
+
+    """
+    Builds the options that make read_csv apply an input file's schema while parsing, reading only the
+    columns of the schema, each as its declared data type
+    @param input_file: path to the input file
+    @param name: the key feature held by the file (runs, prices, elevation)
+    @return the keyword arguments for read_csv
+    @raise ValueError: The file is missing a column required by its schema
+    """
+    def schema_options(self, input_file: str, name: str) -> dict:
+
+        schema = input_schema(name)
+        header = pd.read_csv(input_file, nrows=0).columns
+        missing_columns = [col for col in schema if col not in header]
+
+        if missing_columns:
+            raise ValueError(f"Input file {input_file} is missing required columns: {', '.join(missing_columns)}")
+
+        return {'usecols': list(schema), 'dtype': schema}
+
+
+    """
+    Reads a single input file with its schema, using the configured parser
+    @param input_file: path to the input file
+    @param name: the key feature held by the file (runs, prices, elevation)
+    @return the frame of data read from the file
+    """
+    def read_file(self, input_file: str, name: str) -> pd.DataFrame:
+
+        return pd.read_csv(input_file, engine=self.parser_engine, **self.schema_options(input_file, name))
+
 
     """
     Reads the data from each input file and loads them into memory
@@ -34,9 +351,8 @@ class PreProcessing:
     def read_data(self):
 
         try:
-            self.run_count_dataframe = pd.read_csv(self.run_count_data)
-            self.price_dataframe = pd.read_csv(self.price_data)
-            self.elevation_dataframe = pd.read_csv(self.elevation_data)
+            for source, input_file in self.input_files.items():
+                self.dataframes[source] = self.read_file(input_file, source)
         except FileNotFoundError as e:
             print(f"Ran into an Error: One of the input files could not be found. {e}")
             raise
@@ -51,77 +367,264 @@ class PreProcessing:
             raise
 
 
+    """
+    Reads (or streams) and organizes a single input file, the work each worker does when loading concurrently
+    @param input_file: path to the input file
+    @param name: the key feature held by the file (runs, prices, elevation)
+    @return the organized frame of data
+    """
+    def load_file(self, input_file: str, name: str) -> pd.DataFrame:
+
+        if self.chunk_size or self.memory_limit:
+            return self.stream_file(input_file, name)
+
+        return self.organize_data(self.read_file(input_file, name), name)
+
+
+    """
+    Reads and organizes the input files concurrently, as they are independent of each other until
+    they are merged. The time taken is bounded by the slowest file rather than the sum of all of them.
+    """
+    def load_data_concurrently(self):
+
+        pool = ThreadPoolExecutor if self.executor == 'thread' else ProcessPoolExecutor
+
+        try:
+            with pool(max_workers=self.workers) as workers:
+                loads = {source: workers.submit(self.load_file, input_file, source) for source, input_file in self.input_files.items()}
+
+                for source, load in loads.items():
+                    self.dataframes[source] = load.result()
+
+        except FileNotFoundError as e:
+            print(f"Ran into an Error: One of the input files could not be found. {e}")
+            raise
+        except pd.errors.EmptyDataError:
+            print("Ran into an Error: One of the input files does not contain data.")
+            raise
+        except pd.errors.ParserError as e:
+            print(f"Ran into an Error: A problem occurred while parsing one of the input files: {e}")
+            raise
+        except Exception as e:
+            print(f"Ran into an Error: Failed to load input data into memory concurrently: {e}")
+            raise
+
+
+    """
+    Streams each input file in bounded chunks, organizing every chunk as it is read, so that only the
+    organized data (and not the raw files) is ever held in memory as a whole
+    """
+    def stream_data(self):
+
+        try:
+            for source, input_file in self.input_files.items():
+                self.dataframes[source] = self.stream_file(input_file, source)
+        except FileNotFoundError as e:
+            print(f"Ran into an Error: One of the input files could not be found. {e}")
+            raise
+        except pd.errors.EmptyDataError:
+            print("Ran into an Error: One of the input files does not contain data.")
+            raise
+        except pd.errors.ParserError as e:
+            print(f"Ran into an Error: A problem occurred while parsing one of the input files: {e}")
+            raise
+        except Exception as e:
+            print(f"Ran into an Error: Failed to stream input data into memory: {e}")
+            raise
+
+
+    """
+    Works out how many rows to read per chunk, either the configured chunk size or as many rows
+    as fit the memory limit, estimated from a sample of the file
+    @param input_file: path to the file being streamed
+    @param name: the key feature held by the file (runs, prices, elevation)
+    @return number of rows per chunk
+    """
+    def rows_per_chunk(self, input_file: str, name: str) -> int:
+
+        if self.chunk_size:
+            return self.chunk_size
+
+        sample = pd.read_csv(input_file, nrows=1000, **self.schema_options(input_file, name))
+        row_bytes = sample.memory_usage(deep=True, index=False).sum() / max(1, len(sample))
+
+        # the raw chunk, its organized copy and the row hashes are alive at the same time
+        return max(1, int(self.memory_limit // (3 * max(1.0, row_bytes))))
+
+
+    """
+    Streams a single input file in chunks, applying the organization steps of organize_data to each chunk.
+    Duplicates are found by hashing every raw row, so rows repeated across chunks are still removed.
+    @param input_file: path to the file being streamed
+    @param name: the key feature held by the file (runs, prices, elevation)
+    @return the organized frame of data
+    """
+    def stream_file(self, input_file: str, name: str) -> pd.DataFrame:
+
+        chunks = []
+        hashes = []
+        rows = 0
+
+        options = self.schema_options(input_file, name)
+
+        # every chunk is parsed with the same data types, so equal raw rows hash equally whichever chunk holds them
+        for chunk in pd.read_csv(input_file, chunksize=self.rows_per_chunk(input_file, name), **options):
+
+            rows += len(chunk)
+
+            chunk = chunk.dropna(how='all')
+            hashes.append(pd.util.hash_pandas_object(chunk, index=False).to_numpy())
+
+            chunks.append(self.organize_feature(self.clean_values(chunk, name), name, fill_missing=False))
+
+        data = pd.concat(chunks, ignore_index=True)
+
+        # chunks holding different countries are concatenated as plain text
+        for col, dtype in options['dtype'].items():
+            if dtype == 'category' and not isinstance(data[col].dtype, pd.CategoricalDtype):
+                data[col] = data[col].astype('category')
+
+        data = data[~pd.Series(np.concatenate(hashes)).duplicated().to_numpy()]
+        data = self.organize_feature(data, name)
+
+        report(f"Streamed {rows} Rows from {input_file}, Kept {len(data)}...")
+        return data
+
+
+    """
+    Strips white space from every text column. Columns typed by the input file's schema are already
+    parsed as numbers, any other text column holding numbers is converted into numbers.
+    @param data: a single frame of data
+    @param name: the key feature held by the frame (runs, prices, elevation)
+    """
+    def clean_values(self, data: pd.DataFrame, name: str = None) -> pd.DataFrame:
+
+        schema = input_schema(name) if name else {}
+
+        for col in data.columns:
+
+            dtype = schema.get(col)
+
+            # ignoring white space, of the few distinct countries rather than every row
+            if dtype == 'category':
+                categories = data[col].cat.categories.str.strip()
+
+                if categories.is_unique:
+                    data[col] = data[col].cat.rename_categories(categories)
+                else:
+                    data[col] = data[col].astype(object).str.strip().astype('category')
+
+            elif dtype == 'Int64':
+                if not data[col].hasnans:
+                    data[col] = data[col].astype('int64')
+
+            elif data[col].dtype == 'object':
+                data[col] = data[col].str.strip()
+
+                if dtype is None:
+                    try:
+                        # type conversion
+                        data[col] = pd.to_numeric(data[col])
+                    except ValueError:
+                        pass
+
+        return data
+
+
+    """
+    Organizes the column of the key feature held by a frame of data
+    @param data: a single frame of data
+    @param name: the key feature held by the frame (runs, prices, elevation)
+    @param fill_missing: If false, missing values filled with the mean are left for a later pass over the whole frame
+    """
+    def organize_feature(self, data: pd.DataFrame, name: str, fill_missing: bool = True) -> pd.DataFrame:
+
+        feature = get_feature(name)
+
+        # a mean is only known once every chunk of the file is read
+        if feature.column not in data.columns or (feature.read_fill == 'mean' and not fill_missing):
+            return data
+
+        values = data[feature.column]
+
+        if feature.read_fill is not None:
+            values = values.fillna(impute_value(values, feature.read_fill))
+
+        if feature.absolute:
+            values = values.abs()
+
+        data[feature.column] = values.astype(feature.dtype)
+
+        return data
+
+
     """
     Organizes each frame of data
     @param data: a single frame of data
     """
     def organize_data(self, data: pd.DataFrame, name: str) -> pd.DataFrame:
 
-        data = data.drop(columns=[col for col in data.columns if 'Unnamed:' in col])
+        # only frames that were not read with a schema still hold unnamed columns
+        unnamed_columns = [col for col in data.columns if 'Unnamed:' in col]
+
+        if unnamed_columns:
+            data = data.drop(columns=unnamed_columns)
 
         # dumping duplicated rows
         rows = len(data)
         data.drop_duplicates(inplace=True)
-        print(f"Removed {rows - len(data)} Duplicates...")
+        report(f"Removed {rows - len(data)} Duplicates...")
 
         # dumping non-numerical vals
         data.dropna(how='all', inplace=True)
-        print(f"Removed non-numerical values from the data.")
+        report(f"Removed non-numerical values from the data.")
 
-        # ignoring white space
-        for col in data.select_dtypes(include=['object']).columns:
-            data[col] = data[col].str.strip()
-
-        for col in data.columns:
-            if data[col].dtype == 'object':
-                try:
-                    # type conversion
-                    data[col] = pd.to_numeric(data[col])
-                except ValueError:
-                    pass
+        data = self.clean_values(data, name)
 
         # organizing the data-frames of each key feature
-        if name == 'runs':
-            if 'Run Count' in data.columns:
-                data['Run Count'] = data['Run Count'].fillna(0).abs().astype(int)
-        elif name == 'prices':
-            if 'Price (USD)' in data.columns:
-                data['Price (USD)'] = data['Price (USD)'].astype(float)
-        elif name == 'elevation':
-            if 'Peak Elevation (m)' in data.columns:
-                data['Peak Elevation (m)'] = data['Peak Elevation (m)'].fillna(data['Peak Elevation (m)'].mean()).abs()
-
-        print(f"Data Organized")
+        data = self.organize_feature(data, name)
+
+        report(f"Data Organized")
         return data
 
 
     """
-    Method to merge all three datasets into a single frame of data
+    Method to merge every dataset into a single frame of data, with one row per resort and a single
+    name and country column, recording which features each resort is missing along the way
     """
     def merge_data(self) -> pd.DataFrame:
 
-        if self.run_count_dataframe is None or self.price_dataframe is None or self.elevation_dataframe is None:
-            raise ValueError("Data from all three files must first be loaded into memory before they can be merged.")
+        if any(frame is None for frame in self.dataframes.values()):
+            raise ValueError("Data from all input files must first be loaded into memory before they can be merged.")
         try:
-            # merging run count and price data
-            merged_data = pd.merge(self.run_count_dataframe, self.price_dataframe, on='Resort ID', how='outer')
+            # joining every file on Resort ID at once, the names and countries are kept once
+            merged_data, self.missing_features = outer_join(list(self.dataframes.values()))
+
+            # rows without a Resort ID cannot be matched across the files, the single row the join gives them is dropped
+            keyed = merged_data['Resort ID'].notna().to_numpy()
 
-            # merging run-price merge with elevation
-            merged_data = pd.merge(merged_data, self.elevation_dataframe, on="Resort ID", how='outer')
+            if not keyed.all():
+                unkeyed_rows = sum(int(frame['Resort ID'].isna().sum()) for frame in self.dataframes.values())
+                merged_data = merged_data[keyed].reset_index(drop=True)
+                self.missing_features = self.missing_features[keyed].reset_index(drop=True)
 
-            # handling missing data
-            missing_runs = merged_data[merged_data['Run Count'].isna()]['Resort']
-            missing_prices = merged_data[merged_data['Price (USD)'].isna()]['Resort']
-            missing_elevation = merged_data[merged_data['Peak Elevation (m)'].isna()]['Resort']
+                # the IDs left are whole, so they are held as plain integers like those of a file with no blank IDs
+                if merged_data['Resort ID'].dtype == 'Int64':
+                    merged_data['Resort ID'] = merged_data['Resort ID'].astype('int64')
 
-            if not missing_runs.empty:
-                print(f"Resorts missing data for number of runs: {', '.join(missing_runs)}")
-            if not missing_prices.empty:
-                print(f"Resorts missing data for prices: {', '.join(missing_prices)}")
-            if not missing_elevation.empty:
-                print(f"Resorts missing data for peak elevation: {', '.join(missing_elevation)}")
+                report(f"Removed {unkeyed_rows} Rows Without a Resort ID...")
 
-            print(f"Input Data Merged!")
+            # reporting missing data from the join, only looked up when the diagnostics are printed
+            if enabled(DIAGNOSTIC):
+
+                for feature in FEATURES:
+
+                    missing_resorts = merged_data['Resort'][self.missing_features[feature.column].to_numpy()]
+
+                    if not missing_resorts.empty:
+                        print(f"Resorts missing data for {feature.description}: {', '.join(missing_resorts.astype(str))}")
+
+            report(f"Input Data Merged!")
 
             # return merged data-set
             self.merged_data = merged_data
@@ -142,32 +645,31 @@ class PreProcessing:
     """
     def debug_data(self, data: pd.DataFrame) -> pd.DataFrame:
 
-        missing_data = data.isnull().sum()
-        print("Missing Values:")
-        print(missing_data[missing_data > 0])
-
-        # handling missing values under each feature
-        if 'Run Count' in data.columns:
-            data['Run Count'] = data['Run Count'].fillna(data['Run Count'].median())
-        if 'Price (USD)' in data.columns:
-            data['Price (USD)'] = data['Price (USD)'].fillna(data['Price (USD)'].median())
-        if 'Peak Elevation (m)' in data.columns:
-            data['Peak Elevation (m)'] = data['Peak Elevation (m)'].fillna(data['Peak Elevation (m)'].median())
+        if enabled(DIAGNOSTIC):
+            missing_data = data.isnull().sum()
+            print("Missing Values:")
+            print(missing_data[missing_data > 0])
+
+        # handling missing values under each feature, as declared by the feature
+        for feature in FEATURES:
+            if feature.column in data.columns:
+                data[feature.column] = data[feature.column].fillna(impute_value(data[feature.column], feature.imputation))
             
-        feature_column = data.select_dtypes(include=['object']).columns
+        feature_column = data.select_dtypes(include=['object', 'category']).columns
         
         for col in feature_column:
             data[col] = data[col].fillna(data[col].mode()[0])
 
-        # extra-cautionary checking for missing data
-        double_check = data.isnull().sum()
-        print("\nMissing Values:")
-        print(double_check[double_check > 0])
+        # extra-cautionary checking for missing data, validation checks for holes again either way
+        if enabled(DIAGNOSTIC):
+            double_check = data.isnull().sum()
+            print("\nMissing Values:")
+            print(double_check[double_check > 0])
 
-        if double_check.sum() == 0:
-            print("There are no holes in the data...")
-        else:
-            print("Potential Problem: There are still some values missing in the data...")
+            if double_check.sum() == 0:
+                print("There are no holes in the data...")
+            else:
+                print("Potential Problem: There are still some values missing in the data...")
 
         return data
 
@@ -178,22 +680,32 @@ class PreProcessing:
     """
     def normalize_data(self, data: pd.DataFrame) -> pd.DataFrame:
 
-        normalized = data.copy()
+        # the scaled columns replace the originals in a shallow copy, every other column is shared with data
+        normalized = data.copy(deep=False)
         data_columns = normalized.select_dtypes(include=['int64', 'float64']).columns
         data_columns = [col for col in data_columns if col != 'Resort ID']
 
-        # min-max scaling price data
-        if 'Price (USD)' in data_columns:
-            min_max_scaler = MinMaxScaler()
-            normalized['Price (USD)'] = min_max_scaler.fit_transform(normalized[['Price (USD)']])
+        # scikit-learn takes longer to import than everything else combined, so it is only imported when asked for
+        if self.scaler_backend == 'sklearn':
+            from sklearn.preprocessing import MinMaxScaler, StandardScaler
 
-        # normalizing run-count and peak elevation via the z-score method
-        for col in ['Run Count', 'Peak Elevation (m)']:
-            if col in data_columns:
-                standard_scaler = StandardScaler()
-                normalized[col] = standard_scaler.fit_transform(normalized[[col]])
+        # every feature sharing a scaling is scaled at once, as a matrix with one column per feature
+        scalers = {
+            'min-max': MinMaxScaler().fit_transform if self.scaler_backend == 'sklearn' else min_max_scale,
+            'z-score': StandardScaler().fit_transform if self.scaler_backend == 'sklearn' else z_score
+        }
 
-        double_check = set(data_columns) - {'Price (USD)', 'Run Count', 'Peak Elevation (m)'}
+        for scaling, scaler in scalers.items():
+
+            columns = [feature.column for feature in FEATURES if feature.scaling == scaling and feature.column in data_columns]
+
+            if columns:
+                scaled = scaler(normalized[columns].to_numpy(dtype=float))
+
+                for i, col in enumerate(columns):
+                    normalized[col] = scaled[:, i]
+
+        double_check = set(data_columns) - set(feature_columns())
         
         if double_check:
             print(f"Potential Problem: Data not Normalized: {', '.join(double_check)}")
@@ -211,7 +723,7 @@ class PreProcessing:
         valid = True
 
         # validating column headers
-        data_columns = ['Resort ID', 'Resort', 'Country', 'Run Count', 'Price (USD)', 'Peak Elevation (m)']
+        data_columns = list(KEY_SCHEMA) + feature_columns()
         missing_columns = set(data_columns) - set(data.columns)
 
         if missing_columns:
@@ -228,10 +740,8 @@ class PreProcessing:
         data_types = {
             'Resort ID': 'int64',
             'Resort': 'object',
-            'Country': 'object',
-            'Run Count': 'int64',
-            'Price (USD)': 'float64',
-            'Peak Elevation (m)': 'float64'
+            'Country': 'category',
+            **{feature.column: feature.dtype for feature in FEATURES}
         }
 
         for col, expected_data_type in data_types.items():
@@ -239,20 +749,13 @@ class PreProcessing:
                 if data[col].dtype != expected_data_type:
                     print(f"Ran into an Error: Column '{col}' has Data Type {data[col].dtype}, but Expected {expected_data_type}")
                     data[col] = data[col].astype(expected_data_type)
-                    print(f"Converted '{col}' to {expected_data_type}")
+                    report(f"Converted '{col}' to {expected_data_type}")
 
         # validating value signs
-        if 'Run Count' in data.columns and (data['Run Count'] < 0).any():
-            print("Ran into an Error: Run Count contains negative values...")
-            data['Run Count'] = data['Run Count'].abs()
-
-        if 'Price (USD)' in data.columns and (data['Price (USD)'] < 0).any():
-            print("Ran into an Error: Price contains negative values...")
-            data['Price (USD)'] = data['Price (USD)'].abs()
-
-        if 'Peak Elevation (m)' in data.columns and (data['Peak Elevation (m)'] < 0).any():
-            print("Ran into an Error: Peak Elevation contains negative values...")
-            data['Peak Elevation (m)'] = data['Peak Elevation (m)'].abs()
+        for feature in FEATURES:
+            if feature.column in data.columns and (data[feature.column] < 0).any():
+                print(f"Ran into an Error: {feature.title} contains negative values...")
+                data[feature.column] = data[feature.column].abs()
 
         # validating that each resort has a unique ID#
         if 'Resort ID' in data.columns and not data['Resort ID'].is_unique:
@@ -266,7 +769,7 @@ class PreProcessing:
                 valid = False
 
         if valid:
-            print("Validation Checks Passed Successfully!")
+            report("Validation Checks Passed Successfully!")
         else:
             print("Validation Checks Failed, There are Errors in Data Organization.")
         
@@ -287,7 +790,7 @@ class PreProcessing:
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
             data.to_csv(output_file, index=False)
-            print(f"Pre-Processed Data Written to: {output_file}")
+            report(f"Pre-Processed Data Written to: {output_file}")
 
         except IOError as e:
             print(f"Ran into an Error: Problem occurred saving processed data to a CSV: {e}")
@@ -303,36 +806,72 @@ class PreProcessing:
     """
     def pre_process_data(self) -> pd.DataFrame:
 
-        try:
-            self.read_data()
-            print("Data Read and Loaded into Memory...")
-
-            self.run_count_dataframe = self.organize_data(self.run_count_dataframe, 'runs')
-            self.price_dataframe = self.organize_data(self.price_dataframe, 'prices')
-            self.elevation_dataframe = self.organize_data(self.elevation_dataframe, 'elevation')
-            print("Data Organized...")
-
-            merged_data = self.merge_data()
-            print("Data Merged...")
-
-            debugged_data = self.debug_data(merged_data)
-            print("Data Debugged...")
-
-            debugged_data['Run Count'] = debugged_data['Run Count'].astype(int)
-            debugged_data['Price (USD)'] = debugged_data['Price (USD)'].astype(float)
-            debugged_data['Peak Elevation (m)'] = debugged_data['Peak Elevation (m)'].astype(float)
-            print("Converted Data Types...")
+        monitor = self.monitor
 
-            normalized_data = self.normalize_data(debugged_data)
-            print("Data Normalized...")
-
-            if not self.validation(normalized_data):
+        try:
+            if self.workers:
+                with monitor.stage('load_data_concurrently') as stage:
+                    self.load_data_concurrently()
+                    stage['rows_out'] = self.frame_rows()
+                report(f"Data Read, Organized and Loaded into Memory by {self.workers} {self.executor.capitalize()} Workers...")
+
+            elif self.chunk_size or self.memory_limit:
+                with monitor.stage('stream_data') as stage:
+                    self.stream_data()
+                    stage['rows_out'] = self.frame_rows()
+                report("Data Streamed, Organized and Loaded into Memory...")
+
+            else:
+                with monitor.stage('read_data') as stage:
+                    self.read_data()
+                    stage['rows_out'] = self.frame_rows()
+                report("Data Read and Loaded into Memory...")
+
+                with monitor.stage('organize_data', self.frame_rows()) as stage:
+                    for source, data in self.dataframes.items():
+                        self.dataframes[source] = self.organize_data(data, source)
+                    stage['rows_out'] = self.frame_rows()
+                report("Data Organized...")
+
+            with monitor.stage('merge_data', self.frame_rows()) as stage:
+                merged_data = self.merge_data()
+                stage['rows_out'] = len(merged_data)
+            report("Data Merged...")
+
+            self.imputed_features = self.missing_features[feature_columns()]
+
+            with monitor.stage('debug_data', len(merged_data)) as stage:
+                debugged_data = self.debug_data(merged_data)
+                stage['rows_out'] = len(debugged_data)
+            report("Data Debugged...")
+
+            with monitor.stage('convert_types', len(debugged_data)) as stage:
+                for feature in FEATURES:
+                    debugged_data[feature.column] = debugged_data[feature.column].astype(feature.dtype)
+                stage['rows_out'] = len(debugged_data)
+            report("Converted Data Types...")
+
+            self.debugged_data = debugged_data
+
+            with monitor.stage('normalize_data', len(debugged_data)) as stage:
+                normalized_data = self.normalize_data(debugged_data)
+                stage['rows_out'] = len(normalized_data)
+            report("Data Normalized...")
+
+            with monitor.stage('validation', len(normalized_data)) as stage:
+                valid = self.validation(normalized_data)
+                stage['rows_out'] = len(normalized_data)
+
+            if not valid:
                 raise ValueError("Potential Error Warning: Validation Failed, Execution Will Continue, But May Fail...")
 
             pre_processed_data = normalized_data
 
             output_file = ("data-sets", "processed-resorts-data.csv")
-            self.write_csv(pre_processed_data, output_file)
+
+            with monitor.stage('write_csv', len(pre_processed_data)) as stage:
+                self.write_csv(pre_processed_data, output_file)
+                stage['rows_out'] = len(pre_processed_data)
 
             return pre_processed_data
 
@@ -0,0 +1,117 @@
+from resort_store import ResortStore
+from ranking_data import RankingSkiResorts
+from weighted_sum import WeightedSumModel
+from features import FEATURES
+from verbosity import set_verbosity, QUIET
+import verbosity
+import numpy as np
+import itertools
+
+"""
+Helper functions checking that a compact resort store (see compact_column in resort_store.py) ranks the
+resorts exactly as the full-precision store it was built from. Holding prices and elevations as float32
+can round resorts with nearly equal values onto the same value, or past one another, and the check
+reports how far any resort moved. It covers both RankingSkiResorts (every feature, in both directions)
+and WeightedSumModel (every combination of preferences the application asks users for, plus any batch
+of weights given).
+@author Aaron Howe
+@version Python 3.10.12
+"""
+
+
+"""
+Compares the rankings of a compact store against those of the full-precision store
+@param reference: the full-precision store
+@param compact: the compact store, holding the same resorts in the same order
+@param n: how many resorts the weighted sum rankings are compared over
+@param weights: optional matrix of batch profiles, one row of signed feature weights per profile, whose top n
+                (as scored by WeightedSumModel.batch_ranking) are compared as well
+@return dictionary holding whether every ranking is unchanged, the largest number of places any resort moved,
+        the largest change of a weighted score, and for each ranking the number of moved resorts and their
+        largest move
+@raise ValueError: The stores do not hold the same number of resorts
+"""
+def rank_drift(reference: ResortStore, compact: ResortStore, n: int = 10, weights=None) -> dict:
+
+    if len(reference) != len(compact):
+        raise ValueError("The Compact Store Does Not Hold the Same Resorts...")
+
+    # the rankings of both stores are worked out quietly, only the drift between them is reported
+    previous = verbosity.level
+    set_verbosity(QUIET)
+
+    try:
+        rankings = []
+        score_error = 0.0
+
+        # every resort of every feature ranking, compared by the rank each store gives it
+        reference_ranker, compact_ranker = RankingSkiResorts(reference), RankingSkiResorts(compact)
+
+        for feature, ascending in itertools.product(reference.features, [True, False]):
+
+            displacement = np.abs(reference_ranker.feature_ranks(feature, ascending) - compact_ranker.feature_ranks(feature, ascending))
+            rankings.append(drift(f"{feature} ({'Ascending' if ascending else 'Descending'})", displacement))
+
+        # the top n of the weighted sum, for every combination of yes/no preferences
+        reference_model, compact_model = WeightedSumModel(reference), WeightedSumModel(compact)
+        reference_model.normalize_data()
+        compact_model.normalize_data()
+
+        for preferences in itertools.product([True, False], repeat=len(FEATURES)):
+
+            for model in [reference_model, compact_model]:
+                model.preferences = dict(zip(reference.features, preferences))
+                model.weighted_sum_model(top_k=n)
+
+            name = "Weighted Sum (" + ", ".join(f"{feature}: {'Yes' if preference else 'No'}" for feature, preference in zip(reference.features, preferences)) + ")"
+            rankings.append(drift(name, top_n_displacement(reference_model.order, compact_model.order)))
+            score_error = max(score_error, float(np.abs(reference_model.ranked_scores - compact_model.ranked_scores).max()))
+
+        if weights is not None:
+
+            weights = np.atleast_2d(np.asarray(weights, dtype=float))
+            n = min(n, len(reference))
+
+            for i, ((reference_top, reference_scores), (compact_top, compact_scores)) in enumerate(zip(reference_model.score_profiles(weights, n),
+                                                                                                        compact_model.score_profiles(weights, n))):
+                rankings.append(drift(f"Batch Profile {i + 1}", top_n_displacement(reference_top, compact_top)))
+                score_error = max(score_error, float(np.abs(reference_scores - compact_scores).max()))
+
+    finally:
+        set_verbosity(previous)
+
+    return {
+        'unchanged': all(ranking['moved'] == 0 for ranking in rankings),
+        'max_displacement': max(ranking['max_displacement'] for ranking in rankings),
+        'max_score_error': score_error,
+        'rankings': rankings
+    }
+
+
+"""
+Measures how far the resorts of the top n of one ranking moved in another, a resort missing from the other
+top n counts as moved to the place just past it
+@param reference: the positions of the top n resorts, best first
+@param compact: the positions of the top n resorts of the other ranking, best first
+@return the number of places each resort of the reference top n moved
+"""
+def top_n_displacement(reference: np.ndarray, compact: np.ndarray) -> np.ndarray:
+
+    places = {position: place for place, position in enumerate(compact.tolist())}
+
+    return np.array([abs(places.get(position, len(compact)) - place) for place, position in enumerate(reference.tolist())], dtype=np.int64)
+
+
+"""
+Summarizes how far the resorts of a single ranking moved
+@param name: name of the ranking
+@param displacement: the number of places each resort moved
+@return dictionary holding the name of the ranking, the number of resorts that moved, and the largest move
+"""
+def drift(name: str, displacement: np.ndarray) -> dict:
+
+    return {
+        'ranking': name,
+        'moved': int(np.count_nonzero(displacement)),
+        'max_displacement': int(displacement.max()) if len(displacement) else 0
+    }
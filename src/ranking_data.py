@@ -1,3 +1,9 @@
+from selection import sort_order, ties_settled, top_k_indices
+from resort_store import ResortStore
+from sharding import ShardedRanker
+from result_cache import ResultCache
+from features import feature_columns, get_feature
+from verbosity import report, DIAGNOSTIC
 import pandas as pd
 import numpy as np
 
@@ -16,157 +22,302 @@ class RankingSkiResorts:
 
     """
     Constructor
-    @param data: data from pre-processing
+    @param data: data from pre-processing, or a ResortStore shared with other classes
+    @param workers: if given, the resorts are split into shards ranked by this many workers (see sharding.py),
+                    instead of sorting every resort up front
+    @param executor: the kind of workers ranking the shards ('process' or 'thread')
+    @param cache: If given, the rankings worked out by the sharded ranker are memoized in this cache
+                  (see result_cache.py), which may be shared with other classes ranking the same resorts
     """
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data, workers: int = None, executor: str = 'process', cache: ResultCache = None):
 
         # if not isinstance(data, pd.DataFrame):
 
         #     raise TypeError("Input data needs to be a DataFrame...")
         
-        data_columns = ['Resort ID', 'Resort', 'Country', 'Run Count', 'Price (USD)', 'Peak Elevation (m)']
-        missing_cols = set(data_columns) - set(data.columns)
+        self.features = feature_columns()
+        self.sort_index = {}
+        self.rank_index = {}
+        self.workers = workers
+        self.executor = executor
+        self.ranker = None
+        self.cache = cache
+
+        self.store = data
+        # the latest ranking of each feature, keyed by its criterion (runs, price, elevation)
+        self.feature_rankings = {}
+        # how deep the latest exact final list had to read the sorted lists
+        self.scan_depth = None
+
+        report(f"Class Constructed with {len(self.store)} Resorts...")
+    
 
-        if missing_cols:
-            
-            raise ValueError(f"Missing input data: {', '.join(missing_cols)}")
-        
-        self.data = data.copy()
-        self.run_count_ranking = None
-        self.price_ranking = None
-        self.elevation_ranking = None
+    """
+    The resort data being ranked, shared by reference and never modified
+    """
+    @property
+    def store(self) -> ResortStore:
 
-        print(f"Class Constructed with {len(self.data)} Resorts...")
+        return self._store
     
 
     """
-    Sorting the data by number of runs
-    @param ascending: If false, sort from most to least number of runs
-    @return pandas.DataFrame: a single frame of data containing the sorted list by run count
+    Replacing the resort data rebuilds the sort order of every feature
+    @param data: the new resort data, a frame of data is wrapped in a ResortStore without being copied
     """
-    def sorting_by_run_count(self, ascending=False) -> pd.DataFrame:
+    @store.setter
+    def store(self, data) -> None:
+
+        self._store = data if data is None or isinstance(data, ResortStore) else ResortStore(data)
+        self.build_sort_index()
+    
+
+    """
+    Sorts the resorts once per feature, so every ranking afterwards is served from the stored order, and
+    a top k is always the head of the full ranking. Tied resorts are ordered exactly as pandas' sort_values
+    orders them (see sort_order in selection.py). With workers, nothing is sorted up front: each ranking is
+    worked out by the sharded ranker when asked for, and a ranking holding ties falls back to sort_order.
+    """
+    def build_sort_index(self) -> None:
+
+        self.sort_index = {}
+        self.rank_index = {}
+        self.close()
+
+        if self._store is None:
+            return
+
+        if self.workers:
+            self.ranker = ShardedRanker(self._store.feature_matrix(), self.workers, executor=self.executor,
+                                        source=self._store.array_path('features'))
+            return
+
+        for feature in self.features:
+
+            values = self._store.column(feature)
+
+            self.sort_index[(feature, True)] = sort_order(values, True)
+            self.sort_index[(feature, False)] = sort_order(values, False)
+    
+
+    """
+    Shuts down the workers of the sharded ranker, if it was started
+    """
+    def close(self) -> None:
+
+        if self.ranker is not None:
+            self.ranker.close()
+            self.ranker = None
+    
+
+    """
+    Looks up the rank of every resort for a single feature, from the stored sort order
+    @param feature: the feature (column) the resorts are ranked by
+    @param ascending: If true, the lowest values are ranked first
+    @return array holding the rank (starting at 1) of each resort, in the row order of the data
+    """
+    def feature_ranks(self, feature: str, ascending: bool) -> np.ndarray:
+
+        ascending = bool(ascending)
+
+        if (feature, ascending) not in self.rank_index:
+
+            order = self.top_k_index(feature, ascending)
+            ranks = np.empty(len(order), dtype=np.int64)
+            ranks[order] = np.arange(1, len(order) + 1)
+
+            self.rank_index[(feature, ascending)] = ranks
+
+        return self.rank_index[(feature, ascending)]
+    
+
+    """
+    Looks up the positions of the top k resorts for a single feature, in ranked order, from the stored
+    sort order, or from the cache when the sharded ranker already worked them out. Resorts tied on the
+    feature are listed the way the stored sort order lists them.
+    @param feature: the feature (column) to rank the resorts by
+    @param ascending: If true, the lowest values are ranked first
+    @param top_k: how many resorts to select, every resort if None
+    @return read-only view of the stored sort order, holding the positions of the selected resorts
+    """
+    def top_k_index(self, feature: str, ascending: bool, top_k: int = None) -> np.ndarray:
+
+        if top_k is not None and top_k < 1:
+
+            raise ValueError("Value of top_k is negative, needs to be positive...")
+
+        key = (feature, bool(ascending))
+
+        if key in self.sort_index:
+            order = self.sort_index[key][:top_k]
+
+        else:
+            # ranking the feature across the shards, the lowest values come first when the feature is negated
+            weights = np.zeros(len(self.store.features))
+            weights[self.store.features.index(feature)] = -1.0 if ascending else 1.0
+
+            def rank() -> np.ndarray:
+
+                n = top_k or len(self.store)
+                order, scores = self.ranker.top_k([weights], n + 1)[0]
+
+                # resorts tied on the feature are listed the way the stored sort order lists them
+                if ties_settled(scores[:n], scores[n] if len(scores) > n else None):
+                    return order[:n]
+
+                self.sort_index[key] = sort_order(self.store.column(feature), ascending)
+
+                return self.sort_index[key][:n]
+
+            if self.cache is None:
+                order = rank()
+            else:
+                order = self.cache.get(self.store.version, ('top_k_index', feature, bool(ascending), top_k), rank)
+
+            if len(order) == len(self.store):
+                self.sort_index[key] = order
+
+        order.flags.writeable = False
+
+        return order
+    
+
+    """
+    Gathers the rows of the top k resorts for a single feature, in ranked order
+    @param feature: the feature (column) to rank the resorts by
+    @param ascending: If true, the lowest values are ranked first
+    @param top_k: how many resorts to select, every resort if None
+    @param columns: the columns returned, every column of the store if None
+    @return pandas.DataFrame: the selected rows, sorted by the feature
+    """
+    def top_k_rows(self, feature: str, ascending: bool, top_k: int = None, columns: list = None) -> pd.DataFrame:
+
+        return self.store.rows(self.top_k_index(feature, ascending, top_k), columns)
+    
+
+    """
+    Sorting the data by a single registered feature (see features.py)
+    @param name: the feature's column or criterion (runs, price, elevation)
+    @param ascending: If true, sort from lowest to highest value
+    @param top_k: If given, only the top k resorts are selected and sorted
+    @return pandas.DataFrame: a single frame of data containing the sorted list by the feature
+    """
+    def sorting_by_feature(self, name: str, ascending: bool, top_k: int = None) -> pd.DataFrame:
+
+        if self.store is None:
 
-        if self.data is None:
-            
             raise ValueError("Could Not Find Data...")
         
+        feature = get_feature(name)
+
         try:
 
-            sorted_data = self.data.sort_values(by='Run Count', ascending=ascending)
+            sorted_data = self.top_k_rows(feature.column, ascending, top_k, ['Resort ID', 'Resort', 'Country', feature.column])
             # adding a new ranking column
-            sorted_data['Run Count Ranking'] = range(1, len(sorted_data) + 1)
+            sorted_data[feature.ranking_column] = range(1, len(sorted_data) + 1)
 
-            data_columns = ['Run Count Ranking', 'Resort ID', 'Resort', 'Country', 'Run Count']
-            self.run_count_ranking = sorted_data[data_columns]
+            data_columns = [feature.ranking_column, 'Resort ID', 'Resort', 'Country', feature.column]
+            ranking = sorted_data[data_columns]
+            self.feature_rankings[feature.key] = ranking
 
-            print(f"Sorted by Run Count ({'ascending' if ascending else 'descending'} Order...)")
-            print(self.run_count_ranking.head().to_string(index=False))
+            report(f"Sorted by {feature.title} ({'ascending' if ascending else 'descending'} Order...)")
+            report(lambda: ranking.head().to_string(index=False), DIAGNOSTIC)
             
-            return self.run_count_ranking
+            return ranking
         
         except KeyError:
 
-            raise KeyError("Run Count not Found. Potential Issue with Data Processing...")
+            raise KeyError(f"{feature.column} not Found. Potential Issue with Data Processing...")
         
         except Exception as e:
 
             raise Exception(f"Ran into an Error: Problem occurred while sorting the data... {str(e)}")
     
 
+    """
+    Sorting the data by number of runs
+    @param ascending: If false, sort from most to least number of runs
+    @param top_k: If given, only the top k resorts are selected and sorted
+    @return pandas.DataFrame: a single frame of data containing the sorted list by run count
+    """
+    def sorting_by_run_count(self, ascending=False, top_k: int = None) -> pd.DataFrame:
+
+        return self.sorting_by_feature('runs', ascending, top_k)
+    
+
     """
     Sorting the data by prices of lift tickets
     @param ascending: If true, sort from least to most expensive
+    @param top_k: If given, only the top k resorts are selected and sorted
     @return pandas.DataFrame: a single frame of data containing the sorted list by price
     """
-    def sorting_by_price(self, ascending=True) -> pd.DataFrame:
-
-        if self.data is None:
+    def sorting_by_price(self, ascending=True, top_k: int = None) -> pd.DataFrame:
 
-            raise ValueError("Could Not Find Data...")
-        
-        try:
-
-            sorted_data = self.data.sort_values(by='Price (USD)', ascending=ascending)
-            sorted_data['Price Ranking'] = range(1, len(sorted_data) + 1)
-
-            data_columns = ['Price Ranking', 'Resort ID', 'Resort', 'Country', 'Price (USD)']
-            self.price_ranking = sorted_data[data_columns]
-
-            print(f"Sorted by Price ({'ascending' if ascending else 'descending'} Order...)")
-            print(self.price_ranking.head().to_string(index=False))
-
-            return self.price_ranking
-
-        except KeyError:
-
-            raise KeyError("Price (USD) not found. Potential Issue with Data Processing...")
-
-        except Exception as e:
-
-            raise Exception(f"Ran into an Error: Problem occurred while while sorting the data... {str(e)}")        
+        return self.sorting_by_feature('price', ascending, top_k)
 
 
     """
     Sorting the data by peak elevation (a metric to estimate quality of snow)
     @param ascending: If false, sort from highest to lowest peak elevation
+    @param top_k: If given, only the top k resorts are selected and sorted
     @return pandas.DataFrame: a single frame of data containing the sorted list by peak elevation
     """
-    def sorting_by_elevation(self, ascending=False) -> pd.DataFrame:
+    def sorting_by_elevation(self, ascending=False, top_k: int = None) -> pd.DataFrame:
 
-        if self.data is None:
+        return self.sorting_by_feature('elevation', ascending, top_k)
 
-            raise ValueError("Could not Find Data...")
-        
-        try:
 
-            sorted_data = self.data.sort_values(by='Peak Elevation (m)', ascending=ascending)
-            sorted_data['Elevation Ranking'] = range(1, len(sorted_data) + 1)
+    """
+    The latest ranking by number of runs
+    """
+    @property
+    def run_count_ranking(self) -> pd.DataFrame:
 
-            data_columns = ['Elevation Ranking', 'Resort ID', 'Resort', 'Country', 'Peak Elevation (m)']
-            self.elevation_ranking = sorted_data[data_columns]
+        return self.feature_rankings.get('runs')
 
-            print(f"Sorted by Peak Elevation ({'ascending' if ascending else 'descending'} Order...)")
-            print(self.elevation_ranking.head().to_string(index=False))
 
-            return self.elevation_ranking
-        
-        except KeyError:
+    """
+    The latest ranking by price
+    """
+    @property
+    def price_ranking(self) -> pd.DataFrame:
 
-            raise KeyError("Peak Elevation not Found. Potential Problem with Data Processing...")
-        
-        except Exception as e:
+        return self.feature_rankings.get('price')
+
+
+    """
+    The latest ranking by peak elevation
+    """
+    @property
+    def elevation_ranking(self) -> pd.DataFrame:
 
-            raise Exception(f"Ran into an Error: Problem occurred while sorting data... {str(e)}")
+        return self.feature_rankings.get('elevation')
     
 
     """
     constructs a ranking of resorts based on user selected criteria, using the sorted lists
     @param user_criteria: users' selected feature (runs, prices, elevation)
     @param ascending: If false, constructs a ranking from "I care" to "I don't care"
+    @param top_k: If given, only the top k resorts of the ranking are selected and sorted
     """
-    def criteria(self, user_criteria: str, ascending=False) -> pd.DataFrame:
+    def criteria(self, user_criteria: str, ascending=False, top_k: int = None) -> pd.DataFrame:
 
-        if self.data is None:
+        if self.store is None:
 
             raise ValueError("Could not Find Data...")
         
-        hash = {
-            'runs': ('Run Count', 'Run Count Rank', self.sorting_by_run_count),
-            'price': ('Price (USD)', 'Price Rank', self.sorting_by_price),
-            'elevation': ('Peak Elevation (m)', 'Elevation Rank', self.sorting_by_elevation)
-        }
-        
-        sorting_function = hash[user_criteria.lower()]
+        feature = get_feature(user_criteria.lower())
 
-        if user_criteria.lower() == 'price':
+        # features where lower values are preferred (such as prices) are sorted the other way round
+        if not feature.higher_is_better:
 
-            ranking = sorting_function(not ascending)
+            ranking = self.sorting_by_feature(feature.key, not ascending, top_k)
 
         else:
 
-            ranking = sorting_function(ascending)
+            ranking = self.sorting_by_feature(feature.key, ascending, top_k)
 
-        print(f"Resorts Sorted by {user_criteria} ({'ascending' if ascending else 'descending'} Order.)")
+        report(f"Resorts Sorted by {user_criteria} ({'ascending' if ascending else 'descending'} Order.)")
 
         return ranking
             
@@ -199,21 +350,24 @@ class RankingSkiResorts:
 
         top_n = ranking.head(n)
 
-        print(f"Producing Top {n} Resorts...")
+        report(f"Producing Top {n} Resorts...")
 
         return top_n
     
 
     """
     This functions then takes the top n resorts from each of the three ranked lists, and uses
-    weighted sum learning to construct the overall best bang-for-buck top n list
+    weighted sum learning to construct the overall best bang-for-buck top n list. Only resorts in the
+    top n of some list are considered, unless the exact list is asked for (see threshold_list).
     @param run_count_weight: weight of feature 'number of runs'
     @param price_weight: weight of feature 'lift ticket price'
     @param elevation_weight: weight of feature 'peak elevation'
     @param n: the top n resorts based on user preference
+    @param exact: If true, every resort is considered, reading the ranked lists only as deep as needed
     @return ranked list of resorts
     """
-    def final_list(self, run_count_weight: float = 0.33, price_weight: float = 0.33, elevation_weight: float = 0.33, n: int = 10) -> pd.DataFrame:
+    def final_list(self, run_count_weight: float = 0.33, price_weight: float = 0.33, elevation_weight: float = 0.33, n: int = 10,
+                   exact: bool = False) -> pd.DataFrame:
 
         # validation computation
         if not np.isclose(run_count_weight + price_weight + elevation_weight, 1.0):
@@ -224,10 +378,13 @@ class RankingSkiResorts:
 
             raise ValueError("Weights Found to be Negative, This is an Error...")
 
-        # feature rankings
-        run_ranking = self.sorting_by_run_count()
-        price_ranking = self.sorting_by_price()
-        elevation_ranking = self.sorting_by_elevation()
+        if exact:
+            return self.threshold_list({'runs': run_count_weight, 'price': price_weight, 'elevation': elevation_weight}, n)
+
+        # feature rankings, only the top n of each are ever used
+        run_ranking = self.sorting_by_run_count(top_k=n)
+        price_ranking = self.sorting_by_price(top_k=n)
+        elevation_ranking = self.sorting_by_elevation(top_k=n)
 
         top_n_runs = self.return_ranking(run_ranking, n)
         top_n_prices = self.return_ranking(price_ranking, n)
@@ -249,6 +406,109 @@ class RankingSkiResorts:
         final_ranking['Overall Ranking'] = final_ranking.index + 1
         final_ranking = final_ranking[['Overall Ranking', 'Resort ID', 'Resort', 'Country', 'Country', 'Run Count', 'Price (USD)', 'Peak Elevation (m)', 'Scores']]
 
-        print(f"Final Ranked List of Top {len(final_ranking)} Resorts Constructed!")
+        report(f"Final Ranked List of Top {len(final_ranking)} Resorts Constructed!")
         
         return final_ranking
+    
+
+    """
+    Constructs the exact top n list with the threshold algorithm. Every resort is scored on its rank in each
+    list, as the sum of weight * (resorts - rank + 1) / resorts, and the ranked lists are read together, one
+    depth at a time: a resort not yet read at some depth ranks below it in every list, so it scores at most
+    as much as a resort ranked just below that depth everywhere. Reading stops at the first depth where the
+    n-th best score read beats that bound, and the depth is kept in scan_depth. Lists are read in growing
+    blocks of depths, and the exact stopping depth is then found within the last block.
+    @param weights: dictionary holding the weight of each criterion (runs, price, elevation)
+    @param n: the top n resorts based on user preference
+    @return ranked list of resorts, along with their rank in each list
+    """
+    def threshold_list(self, weights: dict, n: int = 10) -> pd.DataFrame:
+
+        if self.store is None:
+
+            raise ValueError("Could Not Find Data...")
+        
+        if n < 1:
+
+            raise ValueError("Value of N is negative, needs to be positive...")
+
+        features = [get_feature(criterion) for criterion in weights]
+        size = len(self.store)
+        n = min(n, size)
+
+        # the rank of every resort in each list, for looking resorts up once they are read
+        ranks = [self.feature_ranks(feature.column, not feature.higher_is_better) for feature in features]
+
+        def scores(rows: np.ndarray) -> np.ndarray:
+
+            total = 0
+
+            for weight, rank in zip(weights.values(), ranks):
+                total = total + weight * (size - rank[rows] + 1) / size
+
+            return total
+
+        # the best score of a resort ranked below depth in every list
+        def bound(depth: int) -> float:
+
+            total = 0
+
+            for weight in weights.values():
+                total = total + weight * (size - depth) / size
+
+            return total
+
+        def settled(candidate_scores: np.ndarray, depth: int) -> bool:
+
+            if depth >= size:
+                return True
+
+            if len(candidate_scores) < n:
+                return False
+
+            return -np.partition(-candidate_scores, n - 1)[n - 1] > bound(depth)
+
+        depth, step = 0, n
+
+        while True:
+
+            read_depth = min(size, depth + step)
+            candidates = np.unique(np.concatenate([self.top_k_index(feature.column, not feature.higher_is_better, read_depth)
+                                                   for feature in features]))
+            candidate_scores = scores(candidates)
+
+            if settled(candidate_scores, read_depth):
+                break
+
+            depth, step = read_depth, 2 * step
+
+        # the first depth of the last block where the top n are settled, the depth a resort-by-resort read stops at
+        first_read = np.min([rank[candidates] for rank in ranks], axis=0)
+        low, high = depth + 1, read_depth
+
+        while low < high:
+
+            middle = (low + high) // 2
+
+            if settled(candidate_scores[first_read <= middle], middle):
+                high = middle
+            else:
+                low = middle + 1
+
+        self.scan_depth = low
+
+        # candidates are in table order, so resorts with equal scores are ranked by their position
+        best = top_k_indices(candidate_scores, n)
+        rows = candidates[best]
+
+        final_ranking = self.store.rows(rows, ['Resort ID', 'Resort', 'Country'] + [feature.column for feature in features]).reset_index(drop=True)
+        final_ranking.insert(0, 'Overall Ranking', np.arange(1, len(rows) + 1))
+
+        for feature, rank in zip(features, ranks):
+            final_ranking[feature.ranking_column] = rank[rows]
+
+        final_ranking['Scores'] = candidate_scores[best]
+
+        report(f"Exact List of Top {len(final_ranking)} Resorts Constructed, Reading Each List {self.scan_depth} of {size} Resorts Deep...")
+
+        return final_ranking
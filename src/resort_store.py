@@ -0,0 +1,343 @@
+from columnar import write_columns, write_array, read_manifest, load_column, load_text_table, encode_text, decode_text
+from features import feature_columns
+import pandas as pd
+import numpy as np
+import itertools
+import sys
+import os
+
+# every store built or attached takes the next version, so results worked out from other resorts are never mistaken for its own
+STORE_VERSIONS = itertools.count(1)
+
+"""
+This class holds the pre-processed resorts once, as one read-only array per column, so the ranking
+and scoring classes can share the same data by reference instead of each keeping their own copy.
+Rankings are worked out as arrays of row positions, and only the rows actually returned are ever
+gathered into a frame of data. A store can be saved to a directory and attached to from there by any
+number of processes: every column, and the feature matrix, is then memory-mapped rather than copied,
+and the names of resorts and countries are looked up in interned tables only for the rows returned.
+A compact store holds every column at reduced precision (see compact_column), so larger catalogs fit in memory.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+class ResortStore:
+
+    # the columns identifying each resort, the registered features (see features.py) are held after them
+    KEY_COLUMNS = ['Resort ID', 'Resort', 'Country']
+
+
+    """
+    Constructor, the columns are shared with the given data rather than copied, so the data must not be
+    modified afterwards
+    @param data: data from pre-processing
+    @param compact: If true, the columns are held at reduced precision (see compact_column) instead of being shared
+                    with the data, the rankings may then drift from those of the data (see rank_drift.py)
+    @raise ValueError: The data is missing one of the columns of the store
+    """
+    def __init__(self, data: pd.DataFrame, compact: bool = False):
+
+        # the columns of the feature matrix, and every column held by the store in the order rows are returned
+        self.features = feature_columns()
+        self.column_names = self.KEY_COLUMNS + self.features
+
+        missing_cols = [col for col in self.column_names if col not in data.columns]
+
+        if missing_cols:
+
+            raise ValueError(f"Missing input data: {', '.join(missing_cols)}")
+
+        self.columns = {}
+
+        for col in self.column_names:
+
+            # categorical columns keep their codes and categories, every other column is a plain array
+            values = data[col].array if isinstance(data[col].dtype, pd.CategoricalDtype) else data[col].to_numpy()
+
+            if compact:
+                values = compact_column(values)
+
+            if isinstance(values, np.ndarray):
+                values = values.view()
+                values.flags.writeable = False
+
+            self.columns[col] = values
+
+        self.size = len(data)
+        self.directory = None
+        self.arrays = {}
+        self.version = next(STORE_VERSIONS)
+
+
+    """
+    Attaches to a store saved by save, memory-mapping its columns instead of reading them into memory.
+    Any number of processes may attach to the same directory at once, they share its pages.
+    @param directory: the directory holding the saved store
+    @return the attached store
+    @raise ValueError: The directory is missing one of the columns of the store
+    """
+    @classmethod
+    def attach(cls, directory: str):
+
+        store = cls.__new__(cls)
+        store.features = feature_columns()
+        store.column_names = cls.KEY_COLUMNS + store.features
+
+        manifest = read_manifest(directory)
+        entries = {entry['name']: entry for entry in manifest['columns']}
+        missing_cols = [col for col in store.column_names if col not in entries]
+
+        if missing_cols:
+
+            raise ValueError(f"Missing input data: {', '.join(missing_cols)}")
+
+        store.columns = {}
+
+        for col in store.column_names:
+
+            entry = entries[col]
+
+            if entry['kind'] == 'numeric':
+                store.columns[col] = load_column(directory, entry, mmap=True)[0]
+            else:
+                codes = np.load(os.path.join(directory, entry['file']), mmap_mode='r')
+                store.columns[col] = InternedColumn(codes, *load_text_table(directory, entry, mmap=True), entry['kind'] == 'category')
+
+        store.size = manifest['rows']
+        store.directory = directory
+        store.arrays = {}
+        store.version = next(STORE_VERSIONS)
+
+        return store
+
+
+    def __len__(self) -> int:
+
+        return self.size
+
+
+    """
+    Looks up a single column of the store
+    @param col: name of the column
+    @return the read-only values of the column, one per resort
+    """
+    def column(self, col: str):
+
+        return self.columns[col]
+
+
+    """
+    Gathers rows of the store into a frame of data
+    @param index: the positions of the rows, in the order they are returned, every row if None
+    @param columns: the columns returned, every column of the store if None
+    @return pandas.DataFrame: the rows, labelled by their position in the store
+    """
+    def rows(self, index=None, columns: list = None) -> pd.DataFrame:
+
+        columns = self.column_names if columns is None else columns
+        index = np.arange(self.size) if index is None else np.asarray(index)
+
+        return pd.DataFrame({col: self.columns[col][index] for col in columns}, index=index)
+
+
+    """
+    Looks up an array derived from the resorts, building it only the first time it is asked for. For a
+    saved store the array is kept next to the columns and memory-mapped, so every process attached to
+    the store shares the one copy.
+    @param name: name of the array
+    @param build: function building the array from the store
+    @return the read-only array
+    """
+    def array(self, name: str, build):
+
+        if name not in self.arrays:
+
+            path = self.array_path(name)
+
+            if path is None:
+                values = np.asarray(build()).view()
+                values.flags.writeable = False
+
+            else:
+
+                if not os.path.exists(path):
+                    write_array(self.directory, name, build())
+
+                values = np.load(path, mmap_mode='r')
+
+            self.arrays[name] = values
+
+        return self.arrays[name]
+
+
+    """
+    The file holding an array derived from the resorts, worker processes memory-map it from there
+    @param name: name of the array
+    @return path to the .npy file, or None if the store was not saved
+    """
+    def array_path(self, name: str) -> str:
+
+        return None if self.directory is None else os.path.join(self.directory, f'{name}.npy')
+
+
+    """
+    Collects the features into a single matrix, one row per resort and one column per registered feature.
+    The matrix is held as float32 when every feature fits in it without rounding (as in a compact store),
+    and as float64 otherwise.
+    @return the read-only matrix of features
+    """
+    def feature_matrix(self) -> np.ndarray:
+
+        dtype = np.result_type(np.float32, *[self.columns[col].dtype for col in self.features])
+
+        return self.array('features', lambda: np.column_stack([self.columns[col] for col in self.features]).astype(dtype))
+
+
+    """
+    Measures how many bytes the columns of the store, and the arrays derived from them, take up in memory
+    @return dictionary holding the bytes of every column and derived array
+    """
+    def memory_usage(self) -> dict:
+
+        usage = {}
+
+        for col, values in list(self.columns.items()) + list(self.arrays.items()):
+
+            if isinstance(values, InternedColumn):
+                usage[col] = values.nbytes()
+            elif isinstance(values, pd.Categorical):
+                usage[col] = int(values.memory_usage(deep=True))
+            elif values.dtype == object:
+                usage[col] = int(values.nbytes + sum(sys.getsizeof(value) for value in values))
+            else:
+                usage[col] = int(values.nbytes)
+
+        return usage
+
+
+    """
+    Saves the store to a directory in the binary columnar layout (see columnar.py), along with its
+    feature matrix, so it can be attached to by other processes
+    @param directory: the directory receiving the store, replaced if it already holds a saved store (see write_columns)
+    """
+    def save(self, directory: str) -> None:
+
+        try:
+            write_columns(self.rows(), directory)
+            write_array(directory, 'features', self.feature_matrix())
+
+        except Exception as e:
+            print(f"Ran into an Error: Problem occurred while saving the resort store... {str(e)}")
+            raise
+
+
+"""
+A text column of an attached store, held as memory-mapped integer codes into an interned table of its
+distinct values. Only the values of the rows actually looked up are decoded, unless a lookup covers a
+large share of the table, in which case the whole table is decoded once and kept.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+class InternedColumn:
+
+
+    """
+    Constructor
+    @param codes: the code of each row's value, -1 for a missing value
+    @param blob: the UTF-8 bytes of the distinct values
+    @param offsets: the offset of each distinct value in those bytes
+    @param categorical: If true, rows are looked up as a pandas.Categorical over every distinct value
+    """
+    def __init__(self, codes, blob, offsets, categorical: bool = False):
+
+        self.codes = codes
+        self.blob = blob
+        self.offsets = np.asarray(offsets)
+        self.categorical = categorical
+        self.categories = decode_text(blob, self.offsets) if categorical else None
+        self.values = self.categories
+
+
+    def __len__(self) -> int:
+
+        return len(self.codes)
+
+
+    """
+    Measures how many bytes the codes and the interned table take up
+    @return the size of the column in bytes
+    """
+    def nbytes(self) -> int:
+
+        return int(self.codes.nbytes + self.blob.nbytes + self.offsets.nbytes)
+
+
+    """
+    Looks up the values of rows
+    @param index: the position of a single row, or the positions of many rows
+    @return the value of the row, or the values of the rows
+    """
+    def __getitem__(self, index):
+
+        codes = np.asarray(self.codes[index])
+
+        if codes.ndim == 0:
+            return self.decode(codes.reshape(1))[0]
+
+        if self.categorical:
+            return pd.Categorical.from_codes(codes, categories=self.categories)
+
+        return self.decode(codes)
+
+
+    """
+    Decodes the values of a set of codes from the interned table
+    @param codes: the codes
+    @return array holding the values, missing values are NaN
+    """
+    def decode(self, codes) -> np.ndarray:
+
+        # decoding the whole table once is cheaper than decoding a large share of it value by value
+        if self.values is None and len(codes) * 8 >= len(self.offsets):
+            self.values = decode_text(self.blob, self.offsets)
+
+        values = np.empty(len(codes), dtype=object)
+        present = codes >= 0
+        values[~present] = np.nan
+
+        if self.values is not None:
+            values[present] = self.values[codes[present]]
+
+        else:
+            starts, ends = self.offsets[:-1], self.offsets[1:]
+
+            for i in np.flatnonzero(present):
+                values[i] = bytes(self.blob[starts[codes[i]]:ends[codes[i]]]).decode('utf-8')
+
+        return values
+
+
+"""
+Converts a column of the store to its compact form: floats are held as float32, integers by the smallest
+signed type holding every value (so negating them for a descending sort keeps their order), categories keep their codes (already as small as they can be), and text is
+interned into codes pointing into a table holding each distinct value once
+@param values: the values of the column
+@return the compact column
+"""
+def compact_column(values):
+
+    if isinstance(values, pd.Categorical):
+        return values
+
+    if values.dtype == object:
+        return InternedColumn(*encode_text(values))
+
+    if np.issubdtype(values.dtype, np.floating):
+        return values.astype(np.float32)
+
+    if np.issubdtype(values.dtype, np.integer) and len(values):
+
+        for dtype in [np.int8, np.int16, np.int32, np.int64]:
+            if np.iinfo(dtype).min <= values.min() and values.max() <= np.iinfo(dtype).max:
+                return values.astype(dtype)
+
+    return values
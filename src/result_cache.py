@@ -0,0 +1,164 @@
+from collections import OrderedDict
+import pandas as pd
+import numpy as np
+import sys
+
+"""
+This class memoizes the results of ranking queries in memory, so a query asked again (the same preferences,
+weights and number of resorts, against the same resorts) is answered without scoring or sorting the resorts
+again. Every result is keyed by the version of the resort store it was worked out from, along with the
+query's parameters, so results of resorts that have since changed are never returned, while stores sharing
+the cache each keep their own results. The cache is bounded both by the number of results and by their size
+in bytes, the least recently used results are evicted first, whichever version they belong to.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+class ResultCache:
+
+
+    """
+    Constructor
+    @param max_entries: how many results to keep at most
+    @param max_bytes: how many bytes the kept results may take up at most
+    @raise ValueError: One of the bounds is not a positive value
+    """
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("Result Cache Bounds are found to not hold a positive value...")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+
+    def __len__(self) -> int:
+
+        return len(self.entries)
+
+
+    """
+    Looks up the result of a query, working it out and keeping it on a miss
+    @param version: the version of the resort store the query runs against
+    @param query: hashable parameters of the query, such as its preferences, weights and n
+    @param compute: function working out the result, only called on a miss
+    @return the result, which is shared with the cache and must not be modified
+    """
+    def get(self, version, query: tuple, compute):
+
+        result = self.lookup(version, query)
+
+        if result is None:
+            result = compute()
+            self.put(version, query, result)
+
+        return result
+
+
+    """
+    Looks up the result of a query without working it out, for callers answering many queries at once
+    @param version: the version of the resort store the query runs against
+    @param query: hashable parameters of the query
+    @return the result, or None on a miss
+    """
+    def lookup(self, version, query: tuple):
+
+        key = (version,) + tuple(query)
+
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+
+            return self.entries[key][0]
+
+        self.misses += 1
+
+        return None
+
+
+    """
+    Keeps the result of a query, evicting the least recently used results until the cache is back within
+    its bounds. A result larger than max_bytes on its own is not kept at all.
+    @param version: the version of the resort store the query ran against
+    @param query: hashable parameters of the query
+    @param result: the result
+    """
+    def put(self, version, query: tuple, result) -> None:
+
+        key = (version,) + tuple(query)
+        size = result_size(result)
+
+        if size > self.max_bytes:
+            return
+
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key)[1]
+
+        self.entries[key] = (result, size)
+        self.bytes += size
+
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+
+    """
+    Drops the results of a version of the resorts, or every result. Results of versions no longer asked about
+    do not need to be dropped, they are evicted like any other result once the cache fills up.
+    @param version: the version of the resort store whose results are dropped, every result if None
+    """
+    def invalidate(self, version=None) -> None:
+
+        keys = list(self.entries) if version is None else [key for key in self.entries if key[0] == version]
+
+        if keys:
+            self.invalidations += 1
+
+        for key in keys:
+            self.bytes -= self.entries.pop(key)[1]
+
+
+    """
+    Collects the metrics of the cache
+    @return dictionary holding the hits, misses, hit rate, evictions, invalidations, entries, versions and bytes kept
+    """
+    def stats(self) -> dict:
+
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'entries': len(self.entries),
+            'versions': len({key[0] for key in self.entries}),
+            'bytes': self.bytes
+        }
+
+
+"""
+Estimates how many bytes a result takes up in memory
+@param result: an array, a frame of data, or a tuple or list of them
+@return the size of the result in bytes
+"""
+def result_size(result) -> int:
+
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(deep=True).sum())
+
+    if isinstance(result, (tuple, list)):
+        return sys.getsizeof(result) + sum(result_size(value) for value in result)
+
+    return sys.getsizeof(result)
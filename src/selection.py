@@ -0,0 +1,126 @@
+import numpy as np
+
+"""
+Helper functions for selecting the top k entries out of a list of scores without sorting the
+whole list. Only the k winners are sorted, and entries holding equal values keep their original
+order, just as they would under a stable sort of every entry. The full sort order of a single feature
+follows pandas' sort_values instead, so the rankings list tied resorts the way they always have.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+
+
+"""
+Selects the positions of the top k values, in ranked order
+@param values: one-dimensional array of values (scores, prices, run counts...)
+@param k: how many positions to select
+@param ascending: If false, the largest values are ranked first
+@return array holding the positions of the k best values, best first
+"""
+def top_k_indices(values, k: int, ascending: bool = False) -> np.ndarray:
+
+    values = np.asarray(values)
+
+    # the smallest integer of a type has no negation within it, so integers are negated as int64
+    if not ascending and np.issubdtype(values.dtype, np.integer):
+        values = values.astype(np.int64)
+
+    keys = values if ascending else -values
+    k = max(0, min(int(k), len(keys)))
+
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+
+    if k == len(keys):
+        return np.argsort(keys, kind='stable')
+
+    # the k-th smallest key splits the winners from the rest, NaN values always land last
+    threshold = np.partition(keys, k - 1)[k - 1]
+
+    if np.issubdtype(keys.dtype, np.floating) and np.isnan(threshold):
+        missing = np.isnan(keys)
+        winners = np.flatnonzero(~missing)
+        ties = np.flatnonzero(missing)[:k - len(winners)]
+    else:
+        winners = np.flatnonzero(keys < threshold)
+        ties = np.flatnonzero(keys == threshold)[:k - len(winners)]
+
+    chosen = np.sort(np.concatenate([winners, ties]))
+
+    return chosen[np.argsort(keys[chosen], kind='stable')]
+
+
+"""
+Sorts values the way pandas' sort_values does by default, with its (unstable) quicksort and NaN values
+last, so resorts tied on a value are listed in the same order the rankings have always listed them
+@param values: one-dimensional array of the values to sort
+@param ascending: If false, the largest values come first
+@return array holding the positions of the values, in sorted order
+"""
+def sort_order(values, ascending: bool = True) -> np.ndarray:
+
+    values = np.asarray(values)
+
+    # numpy's quicksort breaks ties differently for small integer types, so a compact column is sorted as int64
+    if np.issubdtype(values.dtype, np.integer):
+        values = values.astype(np.int64)
+
+    missing = np.isnan(values) if np.issubdtype(values.dtype, np.floating) else np.zeros(len(values), dtype=bool)
+
+    positions = np.flatnonzero(~missing)
+    present = values[positions]
+
+    # a descending sort is an ascending sort of the reversed values, reversed again
+    if not ascending:
+        positions, present = positions[::-1], present[::-1]
+
+    order = positions[np.argsort(present, kind='quicksort')]
+
+    if not ascending:
+        order = order[::-1]
+
+    return np.concatenate([order, np.flatnonzero(missing)])
+
+
+"""
+Tells whether ranked values leave no tie for the full sort to break, so every way of sorting them agrees
+@param ranked_values: the values of the ranked entries, best first
+@param next_value: the value of the best entry left out of the ranking, if any
+@return true if no two ranked values are equal or missing, and the last of them is not tied with the next
+"""
+def ties_settled(ranked_values, next_value=None) -> bool:
+
+    ranked_values = np.asarray(ranked_values)
+
+    if np.issubdtype(ranked_values.dtype, np.floating) and np.isnan(ranked_values).any():
+        return False
+
+    if (ranked_values[1:] == ranked_values[:-1]).any():
+        return False
+
+    return next_value is None or len(ranked_values) == 0 or next_value != ranked_values[-1]
+
+
+"""
+Selects the positions of the top k values in the order sort_order lists them, so a top k is always the head
+of the full ranking. Only the winners are sorted, unless tied values among them leave their order to the full sort.
+@param values: one-dimensional array of values
+@param k: how many positions to select
+@param ascending: If false, the largest values are ranked first
+@return array holding the positions of the k best values, best first
+"""
+def sorted_top_k(values, k: int, ascending: bool = False) -> np.ndarray:
+
+    values = np.asarray(values)
+    k = max(0, min(int(k), len(values)))
+
+    if k == len(values):
+        return sort_order(values, ascending)
+
+    # one entry past the top k tells whether the last of them is tied with a resort left out
+    top = top_k_indices(values, k + 1, ascending)
+
+    if ties_settled(values[top[:k]], values[top[k]]):
+        return top[:k]
+
+    return sort_order(values, ascending)[:k]
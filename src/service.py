@@ -0,0 +1,420 @@
+from main import SummitSelect_Main, parse_profile
+from verbosity import report
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
+
+"""
+This class serves rankings over HTTP/JSON from a single long-running process, so the resorts are processed
+once and the ranking classes stay warm between requests, instead of every query starting the application
+over. Ranking requests arriving within a short window of each other are coalesced into a single call to
+WeightedSumModel.batch_ranking, which scores all of them in one vectorized pass. The number of requests
+handled at once is limited, and once too many profiles are waiting to be scored, new requests are turned
+away with '503 Service Unavailable' instead of queueing without end. It only needs the standard library,
+and listens on localhost unless told otherwise.
+
+Endpoints:
+    POST /rank        one preference profile, as in batch mode (see main.read_profiles), returns its ranking
+    POST /criteria    {"criterion": "price", "n": 10}, returns the top n resorts of a single feature
+    GET  /health      whether the service is up, and how many resorts it ranks
+    GET  /stats       requests served and turned away, batches scored, and the result cache's hits and misses
+@author Aaron Howe
+@version Python 3.10.12
+"""
+class RankingService:
+
+    # the reason phrase of every status the service responds with
+    STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+              500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+    """
+    Constructor
+    @param app: the application holding the paths to the input files and the ranking settings
+    @param host: the address the service listens on
+    @param port: the port the service listens on
+    @param batch_window: how many seconds a ranking request waits for others to be scored along with it
+    @param max_batch: how many profiles are scored in a single pass at most
+    @param max_concurrency: how many requests are handled at once, the rest wait for their turn
+    @param max_queue: how many profiles may wait to be scored before new requests are turned away
+    @param max_body: how many bytes the body of a request may hold at most
+    @param read_timeout: how many seconds a connection may take to send a request
+    @raise ValueError: One of the limits is not a positive value
+    """
+    def __init__(self, app: SummitSelect_Main, host: str = '127.0.0.1', port: int = 8080, batch_window: float = 0.005, max_batch: int = 256,
+                 max_concurrency: int = 64, max_queue: int = 1024, max_body: int = 1024 * 1024, read_timeout: float = 30.0):
+
+        if min(max_batch, max_concurrency, max_queue, max_body) < 1 or batch_window < 0:
+            raise ValueError("Service Limits are found to not hold a positive value...")
+
+        self.app = app
+        self.host = host
+        self.port = port
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_body = max_body
+        self.read_timeout = read_timeout
+
+        # the ranking classes are not thread-safe, so every ranking runs on one thread, off the event loop
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.queue = None
+        self.slots = None
+        self.server = None
+
+        self.requests = 0
+        self.rejected = 0
+        self.batches = 0
+        self.profiles = 0
+
+
+    """
+    Processes the resorts, then serves requests until the service is stopped
+    """
+    async def serve(self) -> None:
+
+        loop = asyncio.get_running_loop()
+
+        if self.app.weighted_model is None:
+            await loop.run_in_executor(self.executor, self.app.process_data)
+
+        self.queue = asyncio.Queue(maxsize=self.max_queue)
+        self.slots = asyncio.Semaphore(self.max_concurrency)
+        batcher = asyncio.create_task(self.batcher())
+
+        try:
+            self.server = await asyncio.start_server(self.handle, self.host, self.port)
+            self.port = self.server.sockets[0].getsockname()[1]
+            print(f"Serving Rankings of {len(self.app.store)} Resorts on http://{self.host}:{self.port}")
+
+            async with self.server:
+                await self.server.serve_forever()
+
+        finally:
+            batcher.cancel()
+            self.executor.shutdown(wait=False)
+
+
+    """
+    Stops serving requests
+    """
+    def stop(self) -> None:
+
+        if self.server is not None:
+            self.server.close()
+
+
+    """
+    Collects the profiles waiting to be scored, waiting up to batch_window after the first of them for
+    others to arrive, and scores them all in one pass
+    """
+    async def batcher(self) -> None:
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+
+            while len(batch) < self.max_batch:
+
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), max(0, deadline - loop.time())))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                rankings = await loop.run_in_executor(self.executor, self.rank_profiles, [profile for profile, _ in batch])
+
+                for (_, future), ranking in zip(batch, rankings):
+                    if not future.done():
+                        future.set_result(ranking)
+
+            except Exception:
+
+                # one profile failing must not fail the others scored along with it, so each is scored on its own
+                for profile, future in batch:
+
+                    try:
+                        ranking = (await loop.run_in_executor(self.executor, self.rank_profiles, [profile]))[0]
+
+                        if not future.done():
+                            future.set_result(ranking)
+
+                    except Exception as e:
+
+                        if not future.done():
+                            future.set_exception(e)
+
+            self.batches += 1
+            self.profiles += len(batch)
+
+
+    """
+    Ranks a batch of profiles, the work done on the ranking thread
+    @param profiles: the profiles, as read by main.parse_profile
+    @return list holding the top n resorts of each profile, as JSON-ready records
+    """
+    def rank_profiles(self, profiles: list) -> list:
+
+        weights = [profile['weights'] for profile in profiles]
+        preferences = [profile['preferences'] for profile in profiles]
+        n = max(profile['n'] for profile in profiles)
+
+        rankings = self.app.weighted_model.batch_ranking(weights, preferences, n)
+
+        return [ranking.head(profile['n']).to_dict(orient='records') for profile, ranking in zip(profiles, rankings)]
+
+
+    """
+    Handles a single connection, serving requests on it until the client closes it
+    @param reader: the stream of the connection's requests
+    @param writer: the stream receiving the responses
+    """
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+
+        try:
+            while True:
+
+                try:
+                    request = await asyncio.wait_for(self.read_request(reader), self.read_timeout)
+                except ValueError as e:
+                    await self.respond(writer, 400, {'error': str(e)}, False)
+                    break
+
+                if request is None:
+                    break
+
+                method, path, keep_alive, body = request
+
+                if body is None:
+                    status, payload = 413, {'error': f"Request Body is Larger Than {self.max_body} Bytes..."}
+                    keep_alive = False
+                else:
+                    async with self.slots:
+                        status, payload = await self.route(method, path, body)
+
+                await self.respond(writer, status, payload, keep_alive)
+
+                if not keep_alive:
+                    break
+
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+        finally:
+            writer.close()
+
+
+    """
+    Reads a single HTTP request from a connection
+    @param reader: the stream of the connection's requests
+    @return the method, path, whether the connection is kept alive, and body of the request (None if the body
+            is too large), or None once the client has closed the connection
+    @raise ValueError: The request is not valid HTTP
+    """
+    async def read_request(self, reader: asyncio.StreamReader):
+
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+
+        except asyncio.IncompleteReadError as e:
+
+            if e.partial.strip():
+                raise ValueError("Request Ended Before its Headers...")
+
+            return None
+
+        except asyncio.LimitOverrunError:
+            raise ValueError("Request Headers are Too Large...")
+
+        lines = head.decode('latin-1').split('\r\n')
+        parts = lines[0].split(' ')
+
+        if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+            raise ValueError(f"Request Line '{lines[0]}' is not Valid HTTP...")
+
+        method, target, version = parts
+        headers = {}
+
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise ValueError("Content-Length is not a Number...")
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+
+        if length > self.max_body:
+            return method, target.split('?', 1)[0], False, None
+
+        body = await reader.readexactly(length) if length > 0 else b''
+
+        return method, target.split('?', 1)[0], keep_alive, body
+
+
+    """
+    Routes a request to its endpoint
+    @param method: the HTTP method of the request
+    @param path: the path of the request
+    @param body: the body of the request
+    @return the status and the JSON-ready payload of the response
+    """
+    async def route(self, method: str, path: str, body: bytes) -> tuple:
+
+        self.requests += 1
+        endpoints = {
+            '/rank': ('POST', self.rank),
+            '/criteria': ('POST', self.criteria),
+            '/health': ('GET', self.health),
+            '/stats': ('GET', self.stats)
+        }
+
+        if path not in endpoints:
+            return 404, {'error': f"No Endpoint at {path}..."}
+
+        allowed, endpoint = endpoints[path]
+
+        if method != allowed:
+            return 405, {'error': f"{path} Only Accepts {allowed} Requests..."}
+
+        try:
+            record = json.loads(body) if body else {}
+
+            if not isinstance(record, dict):
+                raise ValueError("Request Body is not a JSON Object...")
+
+            return await endpoint(record)
+
+        except (TypeError, ValueError) as e:
+            return 400, {'error': str(e)}
+
+        except KeyError as e:
+            return 400, {'error': str(e.args[0]) if e.args else str(e)}
+
+        except Exception as e:
+            print(f"Ran into an Error: Problem occurred while serving a request... {str(e)}")
+            return 500, {'error': str(e)}
+
+
+    """
+    Ranks the resorts for one preference profile, scored along with every other profile arriving within batch_window
+    @param record: the profile
+    @return the status, and the profile's id and ranking
+    """
+    async def rank(self, record: dict) -> tuple:
+
+        profile = parse_profile(record, self.requests)
+        future = asyncio.get_running_loop().create_future()
+
+        try:
+            self.queue.put_nowait((profile, future))
+
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return 503, {'error': "Too Many Rankings Waiting to be Scored, Try Again Shortly..."}
+
+        return 200, {'id': profile['id'], 'ranking': await future}
+
+
+    """
+    Ranks the resorts by a single feature
+    @param record: the criterion (runs, price, elevation), along with n and ascending, both optional
+    @return the status, and the top n resorts of the feature
+    """
+    async def criteria(self, record: dict) -> tuple:
+
+        if 'criterion' not in record:
+            raise ValueError("Request is Missing its 'criterion'...")
+
+        criterion = str(record['criterion'])
+        n = int(record.get('n', 10))
+        ascending = bool(record.get('ascending', False))
+
+        if n < 1:
+            raise ValueError("Resorts 'n' is found to not hold a positive value...")
+
+        def rank_feature() -> list:
+
+            return self.app.rank.criteria(criterion, ascending, top_k=n).to_dict(orient='records')
+
+        ranking = await asyncio.get_running_loop().run_in_executor(self.executor, rank_feature)
+
+        return 200, {'criterion': criterion, 'ranking': ranking}
+
+
+    """
+    Reports that the service is up
+    @param record: unused
+    @return the status, and the number of resorts served
+    """
+    async def health(self, record: dict) -> tuple:
+
+        return 200, {'status': 'ok', 'resorts': len(self.app.store)}
+
+
+    """
+    Collects the metrics of the service
+    @param record: unused
+    @return the status, and the metrics
+    """
+    async def stats(self, record: dict) -> tuple:
+
+        stats = {
+            'requests': self.requests,
+            'rejected': self.rejected,
+            'batches': self.batches,
+            'profiles': self.profiles,
+            'mean_batch_size': self.profiles / self.batches if self.batches else 0.0,
+            'waiting': self.queue.qsize(),
+            'max_concurrency': self.max_concurrency,
+            'max_queue': self.max_queue
+        }
+
+        if self.app.result_cache is not None:
+            stats['result_cache'] = self.app.result_cache.stats()
+
+        return 200, stats
+
+
+    """
+    Writes a JSON response
+    @param writer: the stream receiving the response
+    @param status: the HTTP status
+    @param payload: the JSON-ready body of the response
+    @param keep_alive: If false, the connection is closed after the response
+    """
+    async def respond(self, writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool) -> None:
+
+        body = json.dumps(payload).encode('utf-8')
+        headers = [f"HTTP/1.1 {status} {self.STATUS[status]}", "Content-Type: application/json",
+                   f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+
+        if status == 503:
+            headers.append("Retry-After: 1")
+
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode('latin-1') + body)
+        await writer.drain()
+
+
+"""
+Runs the ranking service until it is stopped with Ctrl+C
+@param app: the application holding the paths to the input files and the ranking settings
+@param settings: the host, port and limits of the service (see RankingService)
+"""
+def run_service(app: SummitSelect_Main, **settings) -> None:
+
+    service = RankingService(app, **settings)
+
+    try:
+        asyncio.run(service.serve())
+
+    except KeyboardInterrupt:
+        report("\nRanking Service Stopped.")
@@ -0,0 +1,182 @@
+from selection import top_k_indices, sorted_top_k, ties_settled
+from weighted_sum import WeightedSumModel
+from features import FEATURES, get_feature
+from verbosity import report, DIAGNOSTIC
+import pandas as pd
+import numpy as np
+
+"""
+This class keeps the ranking of an interactive session up to date as the user moves the weight sliders.
+Instead of scoring, sorting and copying every resort on each change, the session keeps a buffer of the best
+resorts under the weights it last ranked every resort with, and re-sorts only that buffer: resorts whose
+scores cross as the weights move (the pairwise crossover points in weight space) swap places, and no other
+resort needs to be looked at. A resort outside the buffer can gain at most the change of the weights times
+the spread of the features, so as long as the k-th best score of the buffer stays above that bound, the top
+k are exactly those of ranking every resort. Once the weights drift too far, every resort is scored again
+and the buffer is rebuilt around the new weights.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+class RankingSession:
+
+
+    """
+    Constructor
+    @param model: the WeightedSumModel holding the resorts and the user's preferences
+    @param k: how many resorts the session ranks
+    @param buffer: how many of the best resorts are kept and re-sorted on every change, 8 * k (at least 1024) if None
+    @raise ValueError: The number of resorts to rank is not a positive value
+    """
+    def __init__(self, model: WeightedSumModel, k: int = 10, buffer: int = None):
+
+        if not isinstance(k, int) or k < 1:
+            raise ValueError("Resorts 'k' is found to not hold a positive value...")
+
+        self.model = model
+        self.features = model.feature_matrix()
+        self.k = min(k, len(self.features))
+        self.buffer = min(max(buffer or max(8 * k, 1024), self.k), len(self.features))
+
+        # the spread of every feature, bounding how much a resort outside the buffer can gain
+        self.lowest = self.features.min(axis=0)
+        self.highest = self.features.max(axis=0)
+
+        self.weights = None
+        self.base_weights = None
+        self.candidates = None
+        self.floor = None
+        self.order = None
+        self.scores = None
+        self.ranking = None
+
+        self.updates = 0
+        self.rebuilds = 0
+        self.swaps = 0
+
+        self.update(model.weights)
+
+
+    """
+    Updates the ranking for new weights, re-sorting the buffer only, unless the weights moved too far from
+    those the buffer was built with
+    @param weights: dictionary holding the weight of each feature, by column or criterion (runs, price, elevation),
+                    features left out keep their current weight
+    @return the top k resorts under the new weights
+    """
+    def update(self, weights: dict) -> pd.DataFrame:
+
+        current = dict(zip([feature.column for feature in FEATURES], self.weights)) if self.weights is not None else {}
+        current.update({get_feature(name).column: weight for name, weight in weights.items()})
+
+        # weights of features the user does not prefer are flipped, exactly as WeightedSumModel flips them
+        signed = np.array([current[feature.column] if self.model.preferences[feature.column] else -current[feature.column]
+                           for feature in FEATURES], dtype=float)
+
+        self.weights = np.array([current[feature.column] for feature in FEATURES], dtype=float)
+        self.updates += 1
+
+        order, scores = self.rerank(signed)
+
+        if order is None:
+            order, scores = self.rebuild(signed)
+
+        if self.order is not None:
+            self.swaps += crossings(self.order, order)
+
+        self.order, self.scores = order, scores
+
+        self.ranking = self.model.store.rows(order).reset_index(drop=True)
+        self.ranking.insert(0, 'Rank', np.arange(1, len(order) + 1))
+        self.ranking['Total Weighted Score'] = scores
+
+        report(lambda: f"Session Ranking Updated, {self.rebuilds} of {self.updates} Updates Scored Every Resort", DIAGNOSTIC)
+
+        return self.ranking
+
+
+    """
+    Re-sorts the buffer for new weights
+    @param weights: the signed weight of every feature
+    @return the positions and scores of the top k resorts, or None for both if the buffer can no longer
+            guarantee them, or if tied scores leave their order to a sort of every resort
+    """
+    def rerank(self, weights: np.ndarray) -> tuple:
+
+        if self.candidates is None:
+            return None, None
+
+        scores = score(self.features[self.candidates], weights)
+        top = top_k_indices(scores, self.k + 1)
+
+        # a resort outside the buffer always scores below the k-th best, so only the buffer can tie with it
+        if not ties_settled(scores[top[:self.k]], scores[top[self.k]] if len(top) > self.k else None):
+            return None, None
+
+        top = top[:self.k]
+
+        # the most any resort outside the buffer can have gained since the buffer was built
+        change = weights - self.base_weights
+        bound = self.floor + np.maximum(change * self.lowest, change * self.highest).sum()
+
+        # rounding of the scores is covered by a margin far wider than it
+        margin = 1e-9 * max(1.0, abs(bound))
+
+        if len(self.candidates) < len(self.features) and not scores[top[-1]] > bound + margin:
+            return None, None
+
+        return self.candidates[top], scores[top]
+
+
+    """
+    Scores every resort for new weights, building the buffer around them
+    @param weights: the signed weight of every feature
+    @return the positions and scores of the top k resorts
+    """
+    def rebuild(self, weights: np.ndarray) -> tuple:
+
+        scores = score(self.features, weights)
+        best = top_k_indices(scores, self.buffer)
+
+        self.rebuilds += 1
+        self.base_weights = weights
+        self.floor = scores[best[-1]]
+        self.candidates = np.sort(best)
+
+        # resorts tied on their score are listed the way WeightedSumModel lists them
+        top = sorted_top_k(scores, self.k)
+
+        return top, scores[top]
+
+
+"""
+Scores resorts the same way WeightedSumModel.weighted_sum_model does, as a sum of weighted columns
+@param features: matrix of normalized features of the resorts
+@param weights: the signed weight of every feature
+@return the scores of the resorts
+"""
+def score(features: np.ndarray, weights: np.ndarray) -> np.ndarray:
+
+    total = 0
+
+    for i, weight in enumerate(weights):
+        total = total + features[:, i] * weight
+
+    return total
+
+
+"""
+Counts the pairs of resorts, among those ranked both before and after a change, that swapped places
+@param before: the positions of the ranked resorts before the change
+@param after: the positions of the ranked resorts after the change
+@return the number of swapped pairs
+"""
+def crossings(before: np.ndarray, after: np.ndarray) -> int:
+
+    kept_before = before[np.isin(before, after)]
+    kept_after = after[np.isin(after, before)]
+
+    # the place after the change of every resort, in the order they were ranked before it
+    sorter = np.argsort(kept_after)
+    places = sorter[np.searchsorted(kept_after, kept_before, sorter=sorter)]
+
+    return int(np.triu(places[:, np.newaxis] > places[np.newaxis, :], 1).sum())
@@ -0,0 +1,171 @@
+from selection import top_k_indices
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+import os
+
+"""
+This class ranks very large tables of resorts across many cores. The rows of a feature matrix are split
+into contiguous shards, each worker scores its own shard and keeps only its local top k, and the local
+winners of every shard are merged into the global top k. The merge is exact: a resort in the global top k
+is beaten by fewer than k resorts overall, and so by fewer than k resorts of its own shard, meaning it is
+always among that shard's winners. Resorts with equal scores keep their original order, exactly as they
+do when ranking on a single core.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+class ShardedRanker:
+
+
+    """
+    Constructor
+    @param features: matrix of features, one row per resort and one column per feature
+    @param workers: how many workers score the shards at once, every core if None
+    @param shards: how many shards the resorts are split into, one per worker if None
+    @param executor: the kind of workers scoring the shards ('process' or 'thread')
+    @param block_elements: upper bound on the number of scores a worker holds in memory at once
+    @param source: path to a .npy file holding the same features, worker processes then memory-map their
+                   shard from it instead of each receiving a copy of the shard
+    """
+    def __init__(self, features, workers: int = None, shards: int = None, executor: str = 'process', block_elements: int = 2 ** 24,
+                 source: str = None):
+
+        if executor not in ['thread', 'process']:
+            raise ValueError(f"Executor '{executor}' is not 'thread' or 'process'...")
+
+        # features held in single precision (see compact_column in resort_store.py) are not copied to double precision
+        self.features = np.asarray(features)
+        self.features = self.features if np.issubdtype(self.features.dtype, np.floating) else self.features.astype(float)
+        self.workers = workers or os.cpu_count() or 1
+        self.shards = max(1, min(shards or self.workers, len(self.features)))
+        self.executor = executor
+        self.block_elements = block_elements
+        self.source = source
+        self.pool = None
+
+        bounds = np.linspace(0, len(self.features), self.shards + 1).astype(np.int64)
+        self.bounds = list(zip(bounds[:-1], bounds[1:]))
+
+
+    """
+    Ranks the resorts for one or many sets of weights, returning the top k of each
+    @param weights: matrix with one row of feature weights per ranking
+    @param k: how many resorts each ranking keeps
+    @return list holding the positions of the top k resorts and their scores, best first, for each set of weights
+    """
+    def top_k(self, weights, k: int) -> list:
+
+        weights = np.atleast_2d(np.asarray(weights, dtype=float))
+        k = max(0, min(int(k), len(self.features)))
+
+        if self.pool is None:
+            pool = ThreadPoolExecutor if self.executor == 'thread' else ProcessPoolExecutor
+            self.pool = pool(max_workers=self.workers)
+
+        # threads share the features already, processes attach to the file holding them if there is one
+        if self.executor == 'process' and self.source is not None:
+            tasks = [self.pool.submit(attached_shard_top_k, self.source, start, end, weights, k, self.block_elements)
+                     for start, end in self.bounds]
+        else:
+            tasks = [self.pool.submit(shard_top_k, self.features[start:end], weights, k, start, self.block_elements)
+                     for start, end in self.bounds]
+        shard_results = [task.result() for task in tasks]
+
+        return [merge_top_k([result[i] for result in shard_results], k) for i in range(len(weights))]
+
+
+    """
+    Shuts the workers down, they are started again by the next ranking
+    """
+    def close(self) -> None:
+
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+
+"""
+Scores a single shard of resorts and keeps its local top k for every set of weights, the work each worker does
+@param features: the rows of the feature matrix held by the shard
+@param weights: matrix with one row of feature weights per ranking
+@param k: how many resorts each ranking keeps
+@param offset: the position of the shard's first resort in the whole table
+@param block_elements: upper bound on the number of scores held in memory at once
+@return list holding the positions (in the whole table) of the local top k and their scores, for each set of weights
+"""
+def shard_top_k(features, weights, k: int, offset: int, block_elements: int) -> list:
+
+    results = []
+    block_size = max(1, block_elements // max(1, len(features)))
+    # one contiguous row per feature, so every weighted column is read in a single pass
+    columns = np.ascontiguousarray(np.asarray(features).T)
+
+    for start in range(0, len(weights), block_size):
+
+        block = weights[start:start + block_size]
+        scores = weighted_scores(columns, block)
+
+        for profile_scores in scores:
+            top = top_k_indices(profile_scores, k)
+            results.append((top + offset, profile_scores[top]))
+
+    return results
+
+
+"""
+Scores a single shard of resorts memory-mapped from a .npy file, so the worker attaches to the features
+instead of receiving a copy of them
+@param source: path to the .npy file holding the features
+@param start: the position of the shard's first resort
+@param end: the position after the shard's last resort
+@param weights: matrix with one row of feature weights per ranking
+@param k: how many resorts each ranking keeps
+@param block_elements: upper bound on the number of scores held in memory at once
+@return list holding the positions (in the whole table) of the local top k and their scores, for each set of weights
+"""
+def attached_shard_top_k(source: str, start: int, end: int, weights, k: int, block_elements: int) -> list:
+
+    features = np.load(source, mmap_mode='r')
+
+    return shard_top_k(features[start:end], weights, k, start, block_elements)
+
+
+"""
+Scores resorts for many sets of weights at once, as sums of weighted columns added up one feature at a time,
+exactly as WeightedSumModel.weighted_sum_model adds them up. Unlike a BLAS matrix product, which rounds a
+score differently depending on where it falls in the product, every score is rounded the same way whichever
+resorts and profiles it is scored along with, so scoring a shard, or a few Pareto layers, gives exactly the
+scores of scoring every resort.
+@param columns: matrix of features, one row per feature and one column per resort
+@param weights: matrix with one row of feature weights per ranking
+@return matrix of scores, one row per ranking and one column per resort
+"""
+def weighted_scores(columns, weights) -> np.ndarray:
+
+    scores = np.zeros((len(weights), columns.shape[1]))
+
+    # one profile at a time, so the weighted columns being added stay in cache
+    for row, profile in zip(scores, weights):
+        for column, weight in zip(columns, profile):
+            row += column * weight
+
+    return scores
+
+
+"""
+Merges the local top k of every shard into the global top k, breaking ties by position in the whole table
+@param candidates: the positions and scores of each shard's local top k
+@param k: how many resorts to keep
+@return the positions of the global top k and their scores, best first
+"""
+def merge_top_k(candidates: list, k: int) -> tuple:
+
+    positions = np.concatenate([shard_positions for shard_positions, _ in candidates])
+    scores = np.concatenate([shard_scores for _, shard_scores in candidates])
+
+    # putting the candidates back in table order, so equal scores are ranked by their position
+    table_order = np.argsort(positions, kind='stable')
+    positions, scores = positions[table_order], scores[table_order]
+
+    best = top_k_indices(scores, k)
+
+    return positions[best], scores[best]
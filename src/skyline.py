@@ -0,0 +1,270 @@
+from selection import top_k_indices
+from sharding import weighted_scores
+import numpy as np
+
+"""
+This class indexes the resorts by their Pareto layers (the skyline of the resorts, then the skyline of the
+resorts left over, and so on), so a weighted sum with weights of a fixed sign only has to score the first
+few layers instead of every resort. A resort in a later layer is dominated by a resort of every earlier
+layer, meaning it can never score higher than the resort dominating it. The top k therefore always come
+from the first k layers, and a ranking stops scanning as soon as the best score of a layer falls below the
+k-th best score found so far. Layers are worked out once per combination of weight signs, and only as deep
+as the rankings asked for need them.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+class SkylineIndex:
+
+    # how many of the best resorts (by the sum of their features) are layered first, to rule out the rest
+    SAMPLE_ROWS = 4096
+
+
+    """
+    Constructor
+    @param features: matrix of normalized features, one row per resort, higher values are always preferred
+    @param version: the version of the resort store the features belong to, the index is rebuilt for any other
+    @param block_elements: upper bound on the number of comparisons held in memory at once
+    @raise ValueError: The features hold missing values, which can not be ordered by dominance
+    """
+    def __init__(self, features, version=None, block_elements: int = 2 ** 22):
+
+        # features held in single precision (see compact_column in resort_store.py) are not copied to double precision
+        self.features = np.asarray(features)
+        self.features = self.features if np.issubdtype(self.features.dtype, np.floating) else self.features.astype(float)
+
+        if np.isnan(self.features).any():
+            raise ValueError("Features Hold Missing Values, the Skyline Can Not be Built...")
+
+        self.version = version
+        self.block_elements = block_elements
+        # the layers of every combination of weight signs, as (positions in layer order, start of each layer, complete)
+        self.layers = {}
+
+        self.queries = 0
+        self.scanned = 0
+        self.last_scanned = 0
+
+
+    """
+    Works out the first layers of the resorts, for weights of the given signs
+    @param signs: for every feature, True if its weight is positive (or zero), False if negative
+    @param depth: how many layers to work out
+    @return the positions of the layered resorts in layer order, the start of every layer among them, and
+            whether every resort is layered
+    """
+    def build(self, signs: tuple, depth: int) -> tuple:
+
+        # flipping the features of negative weights, so higher values are always better
+        points = self.features * np.where(signs, 1.0, -1.0)
+        layers = np.full(len(points), depth + 1, dtype=np.int64)
+
+        if len(points) <= self.SAMPLE_ROWS:
+            layers[:] = pareto_layers(points, depth, self.block_elements)
+
+        else:
+            # resorts dominated by the last layer of the best resorts lie deeper than depth, so only the rest
+            # (usually a small share) are layered exactly
+            sample = top_k_indices(points.sum(axis=1), self.SAMPLE_ROWS)
+            sample_layers = pareto_layers(points[sample], depth, self.block_elements)
+            boundary = points[sample[sample_layers == depth]]
+
+            candidates = np.ones(len(points), dtype=bool)
+            candidates[sample] = False
+            others = np.flatnonzero(candidates)
+
+            if len(boundary):
+                others = others[~dominated(points[others], boundary, self.block_elements)]
+
+            pool = np.sort(np.concatenate([sample[sample_layers <= depth], others]))
+            layers[pool] = pareto_layers(points[pool], depth, self.block_elements)
+
+        layered = np.flatnonzero(layers <= depth)
+        layered = layered[np.argsort(layers[layered], kind='stable')]
+        starts = np.searchsorted(layers[layered], np.arange(1, depth + 2))
+
+        self.layers[signs] = (layered, starts, len(layered) == len(points))
+
+        return self.layers[signs]
+
+
+    """
+    Selects the top k resorts for a set of weights, scoring the resorts one layer at a time until the top k
+    are final. The scores, and the order of resorts with equal scores, are exactly those of scoring every resort.
+    @param weights: the weight of every feature, negative to prefer lower values
+    @param k: how many resorts to select
+    @return the positions of the top k resorts and their scores, best first
+    """
+    def top_k(self, weights, k: int) -> tuple:
+
+        weights = np.asarray(weights, dtype=float)
+        k = max(0, min(int(k), len(self.features)))
+        signs = tuple(bool(sign) for sign in weights >= 0)
+
+        positions, scores = [], []
+        found, kth_best, scanned = 0, None, 0
+        layer = 0
+
+        while k:
+
+            layered, starts, complete = self.layers.get(signs, (None, [0], False))
+
+            # working out more layers when the ones built so far do not settle the top k
+            if layer >= len(starts) - 1:
+
+                if complete:
+                    break
+
+                layered, starts, complete = self.build(signs, max(2 * (len(starts) - 1), k + 1))
+                continue
+
+            rows = layered[starts[layer]:starts[layer + 1]]
+            layer += 1
+
+            if len(rows) == 0:
+                continue
+
+            layer_scores = self.score(rows, weights)
+            scanned += len(rows)
+
+            # every resort of a later layer scores at most the best of this one
+            if kth_best is not None and layer_scores.max() < kth_best:
+                break
+
+            positions.append(rows)
+            scores.append(layer_scores)
+            found += len(rows)
+
+            if found >= k:
+                kth_best = -np.partition(-np.concatenate(scores), k - 1)[k - 1]
+
+        self.queries += 1
+        self.scanned += scanned
+        self.last_scanned = scanned
+
+        if not positions:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        positions, scores = np.concatenate(positions), np.concatenate(scores)
+
+        # putting the candidates back in table order, so equal scores are ranked by their position
+        table_order = np.argsort(positions, kind='stable')
+        positions, scores = positions[table_order], scores[table_order]
+
+        best = top_k_indices(scores, k)
+
+        return positions[best], scores[best]
+
+
+    """
+    Scores a set of resorts exactly as scoring every resort would (see weighted_scores in sharding.py)
+    @param rows: the positions of the resorts
+    @param weights: the weight of every feature
+    @return the scores of the resorts
+    """
+    def score(self, rows, weights) -> np.ndarray:
+
+        return weighted_scores(self.features[rows].T, weights[np.newaxis, :])[0]
+
+
+    """
+    The share of resorts the rankings did not have to score
+    @return the pruning rate, between 0 and 1
+    """
+    def pruning_rate(self) -> float:
+
+        if self.queries == 0:
+            return 0.0
+
+        return 1.0 - self.scanned / (self.queries * len(self.features))
+
+
+"""
+Works out the first Pareto layers of a set of points, peeling off the skyline of the points left over
+one layer at a time
+@param points: matrix with one row per point, higher values are better
+@param depth: how many layers to work out
+@param block_elements: upper bound on the number of comparisons held in memory at once
+@return array holding the layer (starting at 1) of every point, depth + 1 for points lying deeper
+"""
+def pareto_layers(points: np.ndarray, depth: int, block_elements: int = 2 ** 22) -> np.ndarray:
+
+    layers = np.full(len(points), depth + 1, dtype=np.int64)
+    remaining = np.arange(len(points))
+
+    for layer in range(1, depth + 1):
+
+        if len(remaining) == 0:
+            break
+
+        on_skyline = skyline(points[remaining], block_elements)
+        layers[remaining[on_skyline]] = layer
+        remaining = remaining[~on_skyline]
+
+    return layers
+
+
+"""
+Finds the skyline of a set of points, the points no other point dominates. Points are visited best sum
+first, since a point can only be dominated by points with a sum at least as high, so every visited point
+left standing belongs to the skyline and rules out the points it dominates before they are visited.
+@param points: matrix with one row per point, higher values are better
+@param block_elements: upper bound on the number of comparisons held in memory at once
+@return boolean array, True for the points of the skyline
+"""
+def skyline(points: np.ndarray, block_elements: int = 2 ** 22) -> np.ndarray:
+
+    sums = points.sum(axis=1)
+    order = np.argsort(-sums, kind='stable')
+    on_skyline = np.zeros(len(points), dtype=bool)
+    remaining = order
+
+    while len(remaining):
+
+        # the next block of points, along with every point sharing the sum of its last point
+        end = min(len(remaining), 256)
+        end = np.searchsorted(-sums[remaining], -sums[remaining[end - 1]], side='right')
+        block, remaining = remaining[:end], remaining[end:]
+
+        winners = block[~dominated(points[block], points[block], block_elements)]
+        on_skyline[winners] = True
+
+        if len(remaining):
+            remaining = remaining[~dominated(points[remaining], points[winners], block_elements)]
+
+    return on_skyline
+
+
+"""
+Checks which points are dominated by a set of others: no worse on any feature, and better on at least one.
+The others are compared a block at a time, and only against the points no earlier block dominated, so the
+comparisons shrink quickly when the first few of them dominate most of the points.
+@param points: matrix with one row per point checked, higher values are better
+@param dominators: matrix with one row per point that may dominate them
+@param block_elements: upper bound on the number of comparisons held in memory at once
+@return boolean array, True for the points dominated by at least one of the others
+"""
+def dominated(points: np.ndarray, dominators: np.ndarray, block_elements: int = 2 ** 22) -> np.ndarray:
+
+    result = np.zeros(len(points), dtype=bool)
+    undecided = np.arange(len(points))
+    start = 0
+
+    while start < len(dominators) and len(undecided):
+
+        block_size = max(1, block_elements // max(1, len(undecided) * points.shape[1]))
+        block = dominators[start:start + block_size]
+        start += block_size
+
+        candidates = points[undecided]
+        no_worse = np.ones((len(candidates), len(block)), dtype=bool)
+        equal = np.ones((len(candidates), len(block)), dtype=bool)
+
+        for i in range(points.shape[1]):
+            no_worse &= block[np.newaxis, :, i] >= candidates[:, i, np.newaxis]
+            equal &= block[np.newaxis, :, i] == candidates[:, i, np.newaxis]
+
+        hit = (no_worse & ~equal).any(axis=1)
+        result[undecided[hit]] = True
+        undecided = undecided[~hit]
+
+    return result
@@ -0,0 +1,160 @@
+import pandas as pd
+import numpy as np
+import argparse
+import os
+
+"""
+Helper functions for generating synthetic resort data at any scale, written as the same three input files
+the application reads (runs, prices, elevation). The files carry the same defects as the real ones: exact
+duplicate rows, blank values and blank lines, unnamed trailing columns in the runs file, resorts that
+are missing from the runs or prices file, and rows whose Resort ID is left blank. Resorts are generated in blocks, so even 10 million of them never
+have to be held in memory at once.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+
+# words the synthetic resort names are built from
+NAME_PREFIXES = np.array(['Red', 'Big', 'Snow', 'Eagle', 'Bear', 'Silver', 'Blue', 'Pine', 'Grand', 'Crystal',
+                          'White', 'Storm', 'Sun', 'Timber', 'Wolf', 'Copper', 'Powder', 'Granite', 'Aspen', 'Cedar'])
+NAME_SUFFIXES = np.array(['Mountain', 'Peak', 'Basin', 'Valley', 'Ridge', 'Bowl', 'Summit', 'Pass', 'Lake', 'Hills'])
+
+# the countries the validation step accepts, and how often each occurs in the real data
+COUNTRIES = np.array(['United States', 'Canada'])
+COUNTRY_WEIGHTS = [0.75, 0.25]
+
+# the header of each input file, the runs file also ends with two unnamed columns like the real one
+FILE_COLUMNS = {
+    'runs': ['Resort ID', 'Resort', 'Country', 'Run Count', '', ''],
+    'prices': ['Resort ID', 'Resort', 'Country', 'Price (USD)'],
+    'elevation': ['Resort ID', 'Resort', 'Country', 'Peak Elevation (m)']
+}
+
+# how many resorts are generated and written at a time
+BLOCK_SIZE = 1_000_000
+
+
+"""
+Generates one block of resorts, with the true value of every feature
+@param start: the Resort ID of the first resort in the block
+@param count: how many resorts to generate
+@param rng: the random number generator
+@return frame of data holding the resorts of the block
+"""
+def generate_resorts(start: int, count: int, rng: np.random.Generator) -> pd.DataFrame:
+
+    resort_ids = np.arange(start, start + count, dtype=np.int64)
+
+    prefixes = NAME_PREFIXES[rng.integers(0, len(NAME_PREFIXES), count)]
+    suffixes = NAME_SUFFIXES[rng.integers(0, len(NAME_SUFFIXES), count)]
+    names = pd.Series(prefixes, dtype=object) + ' ' + pd.Series(suffixes, dtype=object) + ' ' + pd.Series(resort_ids).astype(str)
+
+    return pd.DataFrame({
+        'Resort ID': resort_ids,
+        'Resort': names,
+        'Country': COUNTRIES[rng.choice(len(COUNTRIES), count, p=COUNTRY_WEIGHTS)],
+        'Run Count': rng.integers(10, 300, count),
+        'Price (USD)': rng.integers(40, 250, count),
+        'Peak Elevation (m)': rng.integers(500, 4000, count)
+    })
+
+
+"""
+Turns a block of resorts into the rows of a single input file, adding the defects of the real files
+@param resorts: the block of resorts
+@param name: which input file the rows are for (runs, prices, elevation)
+@param missing: mask of the resorts left out of this file
+@param rng: the random number generator
+@param duplicate_rate: share of rows written twice
+@param blank_rate: share of feature values left blank, and of blank lines added
+@param blank_id_rate: share of rows whose Resort ID is left blank
+@return frame of data holding the rows of the file, in the order they are written
+"""
+def file_rows(resorts: pd.DataFrame, name: str, missing: np.ndarray, rng: np.random.Generator,
+              duplicate_rate: float, blank_rate: float, blank_id_rate: float = 0.0) -> pd.DataFrame:
+
+    feature = FILE_COLUMNS[name][3]
+    rows = resorts.loc[~missing, ['Resort ID', 'Resort', 'Country', feature]].astype({'Resort ID': object, feature: object})
+
+    blanks = rng.random(len(rows)) < blank_rate
+    rows.loc[blanks, feature] = None
+
+    # rows keeping their name and country but not their ID, so the merge has to join on missing keys
+    blank_ids = rng.random(len(rows)) < blank_id_rate
+    rows.loc[blank_ids, 'Resort ID'] = None
+
+    # exact copies of rows, written right after the original like the duplicates of the real files
+    duplicates = rows[rng.random(len(rows)) < duplicate_rate]
+    blank_lines = pd.DataFrame(None, index=np.arange(int(len(rows) * blank_rate)), columns=rows.columns)
+
+    positions = np.concatenate([np.arange(len(rows)), np.flatnonzero(rows.index.isin(duplicates.index)) + 0.5,
+                                rng.uniform(0, len(rows), len(blank_lines))])
+    rows = pd.concat([rows, duplicates, blank_lines], ignore_index=True)
+    rows = rows.iloc[np.argsort(positions, kind='stable')]
+
+    for _ in FILE_COLUMNS[name][4:]:
+        rows[f'Unnamed {rows.shape[1]}'] = None
+
+    return rows
+
+
+"""
+Writes the three input files for a number of resorts
+@param directory: the directory receiving the files
+@param resorts: how many resorts to generate
+@param seed: seed of the random number generator, the same seed always writes the same files
+@param duplicate_rate: share of rows written twice
+@param blank_rate: share of feature values left blank, and of blank lines added
+@param missing_rate: share of resorts left out of the runs or prices file
+@param blank_id_rate: share of rows whose Resort ID is left blank
+@return dictionary holding the path of each file (runs, prices, elevation)
+"""
+def write_dataset(directory: str, resorts: int, seed: int = 0, duplicate_rate: float = 0.01, blank_rate: float = 0.01,
+                  missing_rate: float = 0.01, blank_id_rate: float = 0.001) -> dict:
+
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    paths = {name: os.path.join(directory, f'resorts_{name}.csv') for name in FILE_COLUMNS}
+
+    for name, path in paths.items():
+        with open(path, 'w', newline='') as f:
+            f.write(','.join(FILE_COLUMNS[name]) + '\r\n')
+
+    for start in range(1, resorts + 1, BLOCK_SIZE):
+
+        block = generate_resorts(start, min(BLOCK_SIZE, resorts + 1 - start), rng)
+
+        # a missing resort is left out of one of the three files, the merged data takes its name from the others
+        missing_from = np.where(rng.random(len(block)) < missing_rate, rng.integers(0, len(FILE_COLUMNS), len(block)), -1)
+
+        for i, name in enumerate(FILE_COLUMNS):
+            rows = file_rows(block, name, missing_from == i, rng, duplicate_rate, blank_rate, blank_id_rate)
+            rows.to_csv(paths[name], mode='a', header=False, index=False, lineterminator='\r\n')
+
+    print(f"Wrote {resorts} Synthetic Resorts to {directory}")
+
+    return paths
+
+
+"""
+Handles the arguments of the generator
+@return the parsed arguments
+"""
+def add_args():
+
+    parsing_helper = argparse.ArgumentParser(description="Synthetic Resort Data Generator")
+
+    parsing_helper.add_argument('--resorts', type=int, required=True, help="How Many Resorts to Generate.")
+    parsing_helper.add_argument('--output_dir', type=str, required=True, help="Directory Receiving the Three Input Files.")
+    parsing_helper.add_argument('--seed', type=int, default=0, help="Seed of the Random Number Generator.")
+    parsing_helper.add_argument('--duplicate_rate', type=float, default=0.01, help="Share of Rows Written Twice.")
+    parsing_helper.add_argument('--blank_rate', type=float, default=0.01, help="Share of Blank Values, and of Blank Lines Added.")
+    parsing_helper.add_argument('--missing_rate', type=float, default=0.01, help="Share of Resorts Left Out of the Runs or Prices File.")
+    parsing_helper.add_argument('--blank_id_rate', type=float, default=0.001, help="Share of Rows Whose Resort ID is Left Blank.")
+
+    return parsing_helper.parse_args()
+
+
+if __name__ == "__main__":
+    args = add_args()
+    write_dataset(args.output_dir, args.resorts, args.seed, args.duplicate_rate, args.blank_rate, args.missing_rate, args.blank_id_rate)
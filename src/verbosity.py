@@ -0,0 +1,61 @@
+"""
+Helper functions controlling how much the application prints. Progress messages and diagnostics (tables of
+top resorts, missing values, names of resorts missing data) are reported through here instead of printed
+directly. A diagnostic may be given as a function building the message, which is only called when the
+message is actually printed, so no work goes into diagnostics that are suppressed. Errors are always printed.
+@author Aaron Howe
+@version Python 3.10.12
+"""
+
+# verbosity levels, every level prints everything the levels below it print
+QUIET = 0
+PROGRESS = 1
+DIAGNOSTIC = 2
+
+LEVELS = {'quiet': QUIET, 'progress': PROGRESS, 'diagnostic': DIAGNOSTIC}
+
+# the current verbosity, everything is printed unless told otherwise
+level = DIAGNOSTIC
+
+
+"""
+Changes how much the application prints
+@param new_level: the verbosity level, by name ('quiet', 'progress', 'diagnostic') or number
+@raise ValueError: The verbosity level does not exist
+"""
+def set_verbosity(new_level) -> None:
+
+    global level
+
+    if isinstance(new_level, str):
+
+        if new_level.lower() not in LEVELS:
+            raise ValueError(f"Verbosity '{new_level}' is not one of {', '.join(LEVELS)}...")
+
+        new_level = LEVELS[new_level.lower()]
+
+    if new_level not in LEVELS.values():
+        raise ValueError(f"Verbosity {new_level} is not between {QUIET} and {DIAGNOSTIC}...")
+
+    level = new_level
+
+
+"""
+Checks whether messages of a level are printed, for diagnostics that take more than one message to report
+@param message_level: the level of the messages
+@return True if the messages are printed
+"""
+def enabled(message_level: int) -> bool:
+
+    return level >= message_level
+
+
+"""
+Prints a message if its level is enabled
+@param message: the message, or a function building it, only called when the message is printed
+@param message_level: the level of the message, a progress message by default
+"""
+def report(message, message_level: int = PROGRESS) -> None:
+
+    if level >= message_level:
+        print(message() if callable(message) else message)
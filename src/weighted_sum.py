@@ -1,3 +1,10 @@
+from selection import sorted_top_k, ties_settled
+from resort_store import ResortStore
+from sharding import ShardedRanker, shard_top_k
+from result_cache import ResultCache
+from skyline import SkylineIndex
+from features import FEATURES
+from verbosity import report, DIAGNOSTIC
 import pandas as pd
 import numpy as np
 
@@ -16,11 +23,17 @@ class WeightedSumModel:
 
     """
     Constructor
-    @param data: ranked ski resort data acquired from process_data.py
+    @param data: ranked ski resort data acquired from process_data.py, or a ResortStore shared with other classes
+    @param workers: if given, the resorts are split into shards scored by this many workers (see sharding.py)
+    @param executor: the kind of workers scoring the shards ('process' or 'thread')
+    @param cache: If given, the results of rankings are memoized in this cache (see result_cache.py), which
+                  may be shared with other classes ranking the same resorts
+    @param skyline: If true, rankings of the top k resorts only score the first Pareto layers of the resorts
+                    (see skyline.py), instead of every resort
     """
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data, workers: int = None, executor: str = 'process', cache: ResultCache = None, skyline: bool = False):
 
-        self.preferences = {'Run Count': True, 'Price (USD)': True, 'Peak Elevation (m)': True}
+        self.preferences = {feature.column: True for feature in FEATURES}
         
         # data_columns = ['Resort ID', 'Resort', 'Country', 'Run Count', 'Price (USD)', 'Peak Elevation (m)']
         # missing_cols = set(data_columns) - set(data.columns)
@@ -29,28 +42,37 @@ class WeightedSumModel:
 
         #     raise ValueError(f"Missing input data: {', '.join(missing_cols)}")
         
-        self.data = data.copy()
+        # the resorts are shared by reference, only the normalized features and the scores are owned by the model
+        self.store = data if isinstance(data, ResortStore) else ResortStore(data)
         # self.original_data = data.copy()
-        self.weights = {'Run Count': 0.33, 'Price (USD)': 0.33, 'Peak Elevation (m)': 0.33}
-        self.normalized = pd.DataFrame()
-        self.w_scores = pd.DataFrame()
+        self.weights = {feature.column: 0.33 for feature in FEATURES}
+        self.normalized = None
+        self.scores = None
+        self.order = None
+        self.ranked_scores = None
         self.final_ranking = pd.DataFrame()
+        # upper bound on the number of scores held in memory at once by batch_ranking
+        self.batch_block_elements = 2 ** 24
+
+        self.workers = workers
+        self.executor = executor
+        self.ranker = None
+        self.cache = cache
+        self.skyline = skyline
+        self.index = None
     
-
     """
     Function to define the weights for each selected feature based on user preference
     @param weights: a dictionary to hold (feature, value) pairs, where value is the weight of each feature
     """
     def feature_weights(self) -> None:
 
-        features = ['Run Count', 'Price (USD)', 'Peak Elevation (m)']
+        features = [feature.column for feature in FEATURES]
         user_preference = {}
 
         # Prompting User
         print("Please specify your preferences...\n")
-        print("A 'Yes' to Run Count will find resorts with the highest number of runs.")
-        print("A 'Yes' to Prices will find resorts with the cheapest prices.")
-        print("A 'Yes' to Elevation will find resorts with the highest peak elevation (in meters)\n")
+        print("\n".join(feature.prompt for feature in FEATURES) + "\n")
 
         for feature in features:
 
@@ -76,75 +98,184 @@ class WeightedSumModel:
         for feature, weight in self.weights.items():
             print(f"{feature}: {weight:.2f}")
 
-        print("\nPositive Values = Higher Run Count and Elevation, and Lower Prices...")
+        higher = [feature.label for feature in FEATURES if feature.higher_is_better]
+        lower = [feature.label for feature in FEATURES if not feature.higher_is_better]
+
+        print(f"\nPositive Values = Higher {' and '.join(higher)}, and Lower {' and '.join(lower)}...")
     
 
     """
-    Function for computing normalized scores at 0 to 1 to prevent bias
+    Function for computing normalized scores at 0 to 1 to prevent bias, held as a matrix with one row per
+    resort and one column per feature. The matrix is kept by the store, so it is only computed once per
+    store, and shared by every process attached to a saved store.
     """
     def normalize_data(self) -> None:
 
-        if self.data.empty:
+        if len(self.store) == 0:
             raise ValueError("Data Not Found...")
         
-        self.normalized = self.data[['Resort ID', 'Resort', 'Country']].copy()
+        self.close()
+        self.normalized = self.store.array('normalized', self.normalized_features)
+
+        report(f"Normalized Features: {', '.join(self.store.features)}")
 
-        for feature in ['Run Count', 'Price (USD)', 'Peak Elevation (m)']:
 
-            if feature not in self.data.columns:
-                raise ValueError(f"Couldn't Find '{feature}' in the Data-Set(s)")
-            
-            min = self.data[feature].min()
-            max = self.data[feature].max()
+    """
+    Computes the normalized scores of every feature at once, over the matrix of features. Features where
+    lower values are preferred (such as prices) are flipped, so a score of 1 is always the best value.
+    The scores are computed in double precision, and held at the precision of the feature matrix.
+    @return matrix of normalized scores, one column per feature
+    """
+    def normalized_features(self) -> np.ndarray:
 
-            # setting the normalized score to 1 if the values of the features are equal
-            if min == max:
-                self.normalized[f'{feature} (Normalized)'] = 1
+        dtype = self.store.feature_matrix().dtype
+        features = self.store.feature_matrix().astype(float, copy=False)
+        higher_is_better = np.array([feature.higher_is_better for feature in FEATURES])
 
-            else:
+        min = features.min(axis=0)
+        max = features.max(axis=0)
+        spread = max - min
 
-                if feature == 'Price (USD)':
-                    self.normalized[f'{feature} (Normalized)'] = (max - self.data[feature]) / (max - min)
+        normalized = np.where(higher_is_better, features - min, max - features) / np.where(spread == 0, 1, spread)
 
-                else:
-                    self.normalized[f'{feature} (Normalized)'] = (self.data[feature] - min) / (max - min)
+        # setting the normalized score to 1 if the values of the features are equal
+        normalized[:, spread == 0] = 1
 
-        print("Normalized Features: Run Count, Price (USD), Peak Elevation (m)")
+        return normalized.astype(dtype, copy=False)
     
 
-    def set_preferences(self, run_pref: bool, price_pref: bool, elevation_pref: bool):
+    """
+    Collects the normalized features into a single matrix, one row per resort and one column per feature
+    @return matrix of normalized scores, one column per feature
+    """
+    def feature_matrix(self) -> np.ndarray:
+
+        if self.normalized is None:
+            self.normalize_data()
+
+        return self.normalized
+
+
+    """
+    The ranker splitting the normalized features into shards, started once per normalization
+    @return the sharded ranker
+    """
+    def sharded_ranker(self) -> ShardedRanker:
+
+        if self.ranker is None:
+            self.ranker = ShardedRanker(self.feature_matrix(), self.workers, executor=self.executor,
+                                        block_elements=self.batch_block_elements, source=self.store.array_path('normalized'))
+
+        return self.ranker
+
+
+    """
+    The Pareto layers of the normalized features, worked out as rankings need them, and again from scratch
+    once the resorts change
+    @return the skyline index
+    """
+    def skyline_index(self) -> SkylineIndex:
+
+        if self.index is None or self.index.version != self.store.version:
+            self.index = SkylineIndex(self.feature_matrix(), self.store.version)
 
-        self.preferences['Run Count'] = run_pref
-        self.preferences['Price (USD)'] = price_pref
-        self.preferences['Peak Elevation (m)'] = elevation_pref
+        return self.index
+
+
+    """
+    Shuts down the workers of the sharded ranker, if it was started
+    """
+    def close(self) -> None:
+
+        if self.ranker is not None:
+            self.ranker.close()
+            self.ranker = None
+
+
+    """
+    Looks up the result of a query in the cache, working it out on a miss, or every time without a cache
+    @param query: hashable parameters of the query
+    @param compute: function working out the result
+    @return the result, shared with the cache and never modified
+    """
+    def cached(self, query: tuple, compute):
+
+        if self.cache is None:
+            return compute()
+
+        return self.cache.get(self.store.version, query, compute)
+
+
+    """
+    Sets the yes/no preference of every feature, in the order the features are registered (see features.py)
+    @param preferences: one preference per feature, such as run_pref, price_pref and elevation_pref
+    @raise ValueError: There is not exactly one preference per feature
+    """
+    def set_preferences(self, *preferences: bool):
+
+        if len(preferences) != len(FEATURES):
+            raise ValueError(f"Expected {len(FEATURES)} Preferences, One per Feature, but Received {len(preferences)}...")
+
+        self.preferences = {feature.column: preference for feature, preference in zip(FEATURES, preferences)}
 
 
     """
     Algorithm for the weighted sum model, computing the weighted sum for each resort to construct
-    a generalized ranking based on user preference
+    a generalized ranking based on user preference. With workers, each shard of resorts is scored
+    and ranked by its own worker, and the shards' top k are merged into exactly the same ranking.
+    With a cache, a ranking already worked out for the same preferences, weights and top k is reused,
+    and with the skyline index, only the resorts that can reach the top k are scored. In both cases the
+    scores of the resorts outside the ranking are not kept. Resorts tied on their score are always listed
+    the way sort_values lists them (see sort_order in selection.py), so a top k is the head of the full ranking.
+    @param top_k: If given, only the top k resorts are selected and sorted, instead of sorting every resort
     """
-    def weighted_sum_model(self) -> None:
+    def weighted_sum_model(self, top_k: int = None) -> None:
 
-        if self.normalized.empty:
+        if self.normalized is None:
             raise ValueError("Features Not Normalized...")
         
         if not self.weights:
             raise ValueError("No Feature Weights Found...")
         
-        self.w_scores = self.data[['Resort ID', 'Resort', 'Country', 'Run Count', 'Price (USD)', 'Peak Elevation (m)']].copy()
-        overall_weight = 0
+        if top_k is not None and (not isinstance(top_k, int) or top_k < 1):
+            raise ValueError("Resorts 'top_k' is found to not hold a positive value...")
+        
+        # the weights are held in double precision, so scores are summed in double precision even over compact features
+        weights = np.array([self.weights[feature] if preference else -self.weights[feature] for feature, preference in self.preferences.items()])
+
+        def rank() -> tuple:
+
+            n = top_k or len(self.store)
+            order = None
+
+            # the skyline index and the shards rank one resort past the top k, telling whether ties are left to break
+            if self.skyline and top_k is not None:
+                order, ranked_scores = self.skyline_index().top_k(weights, n + 1)
 
-        # weighted_sum computation
-        for feature, preference in self.preferences.items():
-            weight = self.weights[feature] if preference else -self.weights[feature]
-            normalized_feature = f'{feature} (Normalized)'
-            
-            self.w_scores[f'{feature} (Weight)'] = self.normalized[normalized_feature] * weight
-            overall_weight += self.w_scores[f'{feature} (Weight)']
+            elif self.workers:
+                order, ranked_scores = self.sharded_ranker().top_k([weights], n + 1)[0]
 
-        self.w_scores['Total Weighted Score'] = overall_weight
-        self.w_scores = self.w_scores.sort_values('Total Weighted Score', ascending=False).reset_index(drop=True)
-        print(f"Top Resort: {self.w_scores.iloc[0]['Resort']}")
+            if order is not None and ties_settled(ranked_scores[:n], ranked_scores[n] if len(ranked_scores) > n else None):
+                return order[:n], ranked_scores[:n]
+
+            overall_weight = 0
+
+            # weighted_sum computation
+            for i, weight in enumerate(weights):
+                overall_weight = overall_weight + self.normalized[:, i] * weight
+
+            self.scores = overall_weight
+
+            # only the top k are sorted, unless tied scores leave their order to the full sort
+            order = sorted_top_k(self.scores, n)
+
+            return order, self.scores[order]
+
+        self.scores = None
+        query = ('weighted_sum', tuple(self.preferences.items()), tuple(self.weights.items()), top_k)
+        self.order, self.ranked_scores = self.cached(query, rank)
+
+        report(lambda: f"Top Resort: {self.store.column('Resort')[self.order[0]]}")
 
     """
     Constructs a ranking based on the scores comptued from the weighted sum model
@@ -152,17 +283,15 @@ class WeightedSumModel:
     """
     def ranking(self) -> pd.DataFrame:
 
-        if self.w_scores.empty:
+        if self.order is None or len(self.order) == 0:
 
             raise ValueError("Could Not Find the Overall Total Weighted Scores...")
         
-        self.final_ranking = self.w_scores.copy()
-        self.final_ranking['Rank'] = self.final_ranking.index + 1
-
-        data_columns = ['Rank', 'Resort ID', 'Resort', 'Country', 'Run Count', 'Price (USD)', 'Peak Elevation (m)', 'Total Weighted Score']
-
-        self.final_ranking = self.final_ranking[data_columns]
-        print(f"Top Ranked Resort: {self.final_ranking.iloc[0]['Resort']}")
+        # only the ranked rows are gathered from the store
+        self.final_ranking = self.store.rows(self.order).reset_index(drop=True)
+        self.final_ranking.insert(0, 'Rank', np.arange(1, len(self.order) + 1))
+        self.final_ranking['Total Weighted Score'] = self.ranked_scores
+        report(lambda: f"Top Ranked Resort: {self.final_ranking.iloc[0]['Resort']}")
 
         return self.final_ranking
     
@@ -186,7 +315,92 @@ class WeightedSumModel:
 
         top_n = self.final_ranking.head(n)
 
-        for _, resort in top_n.iterrows():
-            print(f"{int(resort['Rank'])} Ranking: {resort['Resort']}")
+        report(lambda: "\n".join(f"{rank} Ranking: {resort}" for rank, resort in zip(top_n['Rank'], top_n['Resort'])), DIAGNOSTIC)
 
         return top_n
+    
+
+    """
+    Scores many preference profiles against the same resorts in one call. The weighted sums of a block
+    of profiles are computed at once over the normalized features (see weighted_scores in sharding.py),
+    instead of building a frame of weighted columns for each profile, and hold exactly the scores
+    weighted_sum_model gives. With a cache, only the profiles not already ranked
+    (and each of them only once) are scored. With the skyline index, each profile is scored on its own,
+    over the first Pareto layers of the resorts only.
+    @param weights: matrix with one row per profile, holding the weight of every feature (see features.py)
+    @param preferences: optional matrix of the same shape, where a False preference flips the sign of its weight
+    @param n: the top n ski resorts to return per profile
+    @return list holding the top n ranked resorts of each profile, in the order the profiles were given
+    """
+    def batch_ranking(self, weights, preferences=None, n: int = 10) -> list:
+
+        weights = np.atleast_2d(np.asarray(weights, dtype=float))
+
+        columns = self.store.features
+
+        if weights.shape[1] != len(columns):
+            raise ValueError(f"Each Profile Needs a Weight for {', '.join(columns[:-1])} and {columns[-1]}...")
+        
+        if not isinstance(n, int) or n < 1:
+            raise ValueError("Resorts 'n' is found to not hold a positive value...")
+
+        if preferences is not None:
+            preferences = np.atleast_2d(np.asarray(preferences, dtype=bool))
+
+            if preferences.shape != weights.shape:
+                raise ValueError("Preferences and Weights Must Hold One Row per Profile...")
+
+            weights = np.where(preferences, weights, -weights)
+
+        features = self.feature_matrix()
+        n = min(n, len(features))
+
+        if self.cache is None:
+            ranked = self.score_profiles(weights, n)
+
+        else:
+            queries = [('batch_ranking', tuple(profile), n) for profile in weights.tolist()]
+            ranked = [self.cache.lookup(self.store.version, query) for query in queries]
+
+            # profiles asked for more than once in the batch are scored once
+            missing = list(dict.fromkeys(query for query, result in zip(queries, ranked) if result is None))
+
+            if missing:
+                results = dict(zip(missing, self.score_profiles(np.array([query[1] for query in missing]), n)))
+
+                for query in missing:
+                    self.cache.put(self.store.version, query, results[query])
+
+                ranked = [results[query] if result is None else result for query, result in zip(queries, ranked)]
+
+        rankings = []
+
+        for top_n, scores in ranked:
+            ranking = self.store.rows(top_n).reset_index(drop=True)
+            ranking.insert(0, 'Rank', range(1, len(ranking) + 1))
+            ranking['Total Weighted Score'] = scores
+            rankings.append(ranking)
+
+        report(f"Scored {len(weights)} Preference Profiles...")
+
+        return rankings
+
+
+    """
+    Scores the profiles of a batch and selects the top n resorts of each
+    @param weights: matrix with one row of signed feature weights per profile
+    @param n: the top n ski resorts to select per profile
+    @return list holding the positions of the top n resorts and their scores, best first, for each profile
+    """
+    def score_profiles(self, weights: np.ndarray, n: int) -> list:
+
+        if self.skyline:
+            index = self.skyline_index()
+
+            return [index.top_k(profile, n) for profile in weights]
+
+        # scoring the profiles in blocks, so the score matrix stays bounded for very large resort lists
+        if self.workers:
+            return self.sharded_ranker().top_k(weights, n)
+
+        return shard_top_k(self.feature_matrix(), weights, n, 0, self.batch_block_elements)
@@ -0,0 +1,147 @@
+from columnar import write_columns
+import pandas as pd
+import numpy as np
+
+"""
+Helper functions writing the final ranking of resorts to disk. Every writer formats whole columns at a time
+instead of one resort at a time, and writes a large ranking in chunks of rows so the formatted output is
+never held in memory all at once. The text writer produces the human-readable report, the others write
+the final ranking as CSV, JSON lines, or binary columns (see columnar.py).
+@author Aaron Howe
+@version Python 3.10.12
+"""
+
+# how many resorts are formatted and written at a time
+CHUNK_ROWS = 100000
+
+
+"""
+Formats a column of numbers as text, truncated to whole numbers the same way int() truncates them
+@param values: the column of numbers
+@return the formatted column
+"""
+def whole_numbers(values: pd.Series) -> pd.Series:
+
+    return values.astype(np.int64).astype(str)
+
+
+"""
+Formats a column of prices as text, with two decimals the same way '{:.2f}' formats them
+@param values: the column of prices
+@return the formatted column
+"""
+def prices(values: pd.Series) -> pd.Series:
+
+    return pd.Series(np.char.mod('%.2f', values.to_numpy(dtype=float)), index=values.index, dtype=object)
+
+
+"""
+Formats a chunk of the final ranking as the entries of the text report's final list
+@param chunk: a chunk of rows of the final ranking
+@return the formatted entries
+"""
+def final_list_text(chunk: pd.DataFrame) -> str:
+
+    entries = (whole_numbers(chunk['Rank']) + " Rank: " + chunk['Resort'].astype(str) + "\n"
+               + " Run Count: " + whole_numbers(chunk['Run Count']) + "\n"
+               + " Price (USD): $" + prices(chunk['Price (USD)']) + "\n"
+               + " Peak Elevation (m): " + whole_numbers(chunk['Peak Elevation (m)']) + "\n\n")
+
+    return ''.join(entries)
+
+
+"""
+Formats the top 10 resorts of a single feature's ranking, as listed at the end of the text report
+@param criterion: the feature the resorts are ranked by (runs, price, elevation)
+@param ranking: the ranking of the feature
+@return the formatted list
+"""
+def feature_list_text(criterion: str, ranking: pd.DataFrame) -> str:
+
+    top_10 = ranking.head(10)
+    entries = pd.Series([f"{i}. " for i in range(1, len(top_10) + 1)], index=top_10.index, dtype=object) + top_10['Resort'].astype(str) + " - "
+
+    if criterion == 'runs':
+        entries = entries + whole_numbers(top_10['Run Count']) + " runs\n"
+    elif criterion == 'price':
+        entries = entries + "$" + prices(top_10['Price (USD)']) + "\n"
+    elif criterion == 'elevation':
+        entries = entries + whole_numbers(top_10['Peak Elevation (m)']) + " meters\n"
+
+    return f"\nTop 10 Resorts By {criterion.capitalize()}:\n" + ''.join(entries)
+
+
+"""
+Writes the human-readable report: the final list of resorts, followed by the top 10 resorts of each feature
+@param rankings: dictionary holding the ranking of each feature
+@param final_ranking: the final ranking of resorts
+@param output_file: path to the text file
+@param chunk_rows: how many resorts of the final list are formatted and written at a time
+"""
+def write_text(rankings: dict, final_ranking: pd.DataFrame, output_file: str, chunk_rows: int = CHUNK_ROWS) -> None:
+
+    with open(output_file, 'w') as f:
+
+        f.write("SummitSelect: List of Recommended Ski Resorts\n")
+        f.write("=" * 40 + "\n\n")
+
+        f.write("Final List:\n")
+        f.write("-" * 40 + "\n")
+
+        for start in range(0, len(final_ranking), chunk_rows):
+            f.write(final_list_text(final_ranking.iloc[start:start + chunk_rows]))
+
+        f.write("\nHow Each Feature Ranks Based on Your Preferences:\n")
+        f.write("-" * 40 + "\n")
+
+        for criterion, ranking in rankings.items():
+            f.write(feature_list_text(criterion, ranking))
+
+
+"""
+Writes the final ranking as a CSV file
+@param rankings: dictionary holding the ranking of each feature, not written to the CSV
+@param final_ranking: the final ranking of resorts
+@param output_file: path to the CSV file
+@param chunk_rows: how many resorts are formatted and written at a time
+"""
+def write_csv(rankings: dict, final_ranking: pd.DataFrame, output_file: str, chunk_rows: int = CHUNK_ROWS) -> None:
+
+    final_ranking.to_csv(output_file, index=False, chunksize=chunk_rows)
+
+
+"""
+Writes the final ranking as JSON lines, one resort per line
+@param rankings: dictionary holding the ranking of each feature, not written to the file
+@param final_ranking: the final ranking of resorts
+@param output_file: path to the JSONL file
+@param chunk_rows: how many resorts are formatted and written at a time
+"""
+def write_jsonl(rankings: dict, final_ranking: pd.DataFrame, output_file: str, chunk_rows: int = CHUNK_ROWS) -> None:
+
+    with open(output_file, 'w') as f:
+
+        for start in range(0, len(final_ranking), chunk_rows):
+            lines = final_ranking.iloc[start:start + chunk_rows].to_json(orient='records', lines=True, double_precision=15)
+            f.write(lines if lines.endswith("\n") else lines + "\n")
+
+
+"""
+Writes the final ranking as binary columns, which can be read back with columnar.read_columns
+@param rankings: dictionary holding the ranking of each feature, not written to the directory
+@param final_ranking: the final ranking of resorts
+@param output_file: path to the directory receiving the columns, an existing directory is only replaced if it holds columns
+@param chunk_rows: unused, every column is written as a whole
+"""
+def write_columnar(rankings: dict, final_ranking: pd.DataFrame, output_file: str, chunk_rows: int = CHUNK_ROWS) -> None:
+
+    write_columns(final_ranking, output_file)
+
+
+# the writer of each output format
+WRITERS = {
+    'text': write_text,
+    'csv': write_csv,
+    'jsonl': write_jsonl,
+    'columnar': write_columnar
+}
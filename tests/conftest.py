@@ -0,0 +1,49 @@
+import pandas as pd
+import numpy as np
+import pytest
+import sys
+import os
+
+# the application imports its modules by name, from the src directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from verbosity import set_verbosity, DIAGNOSTIC
+
+
+"""
+Keeps the tests quiet, restoring the default verbosity afterwards
+"""
+@pytest.fixture(autouse=True)
+def quiet():
+
+    set_verbosity('quiet')
+    yield
+    set_verbosity(DIAGNOSTIC)
+
+
+"""
+Builds a frame of pre-processed resorts
+@param size: how many resorts
+@param seed: seed of the random values
+@param levels: If given, every feature only takes this many distinct values, so many resorts are tied
+@return the frame of resorts, holding the columns of a ResortStore
+"""
+def resort_frame(size: int, seed: int = 0, levels: int = None) -> pd.DataFrame:
+
+    rng = np.random.default_rng(seed)
+
+    def values(low: float, high: float) -> np.ndarray:
+
+        if levels:
+            return np.linspace(low, high, levels)[rng.integers(0, levels, size)]
+
+        return rng.uniform(low, high, size)
+
+    return pd.DataFrame({
+        'Resort ID': np.arange(1, size + 1),
+        'Resort': [f'Resort {i}' for i in range(1, size + 1)],
+        'Country': pd.Categorical(rng.choice(['United States', 'Canada'], size), categories=['Canada', 'United States']),
+        'Run Count': rng.integers(0, levels or 200, size),
+        'Price (USD)': values(0.0, 1.0),
+        'Peak Elevation (m)': values(-2.0, 2.0)
+    })
@@ -0,0 +1,55 @@
+from synthetic_data import write_dataset
+from main import SummitSelect_Main
+from features import FEATURES
+import pandas as pd
+import pytest
+import os
+
+
+"""
+Processes a synthetic dataset, caching the processed data
+@param paths: the paths of the input files
+@param cache_dir: the directory caching the processed data
+@param scaler_backend: the scalers normalizing the features
+@return the processed data, and how many entries the cache holds afterwards
+"""
+def processed(paths: dict, cache_dir: str, scaler_backend: str = 'numpy') -> tuple:
+
+    app = SummitSelect_Main(paths['runs'], paths['prices'], paths['elevation'], cache_dir=cache_dir, scaler_backend=scaler_backend)
+    data = app.process_data()
+
+    return data, len([entry for entry in os.listdir(cache_dir) if os.path.isdir(os.path.join(cache_dir, entry))])
+
+
+def test_cache_is_reused_while_nothing_changes(tmp_path, monkeypatch):
+
+    # pre-processing writes the processed data relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    paths = write_dataset(str(tmp_path / 'data'), 200, seed=5)
+    cache_dir = str(tmp_path / 'cache')
+
+    cold, entries = processed(paths, cache_dir)
+    warm, reused = processed(paths, cache_dir)
+
+    assert entries == reused == 1
+    pd.testing.assert_frame_equal(warm, cold)
+
+
+def test_cache_key_follows_the_features_and_scalers(tmp_path, monkeypatch):
+
+    pytest.importorskip('sklearn')
+    monkeypatch.chdir(tmp_path)
+    paths = write_dataset(str(tmp_path / 'data'), 200, seed=5)
+    cache_dir = str(tmp_path / 'cache')
+
+    default, _ = processed(paths, cache_dir)
+    _, entries = processed(paths, cache_dir, 'sklearn')
+
+    assert entries == 2
+
+    # scaling the prices differently gives different processed data, which must not come from the cache
+    monkeypatch.setattr(FEATURES[1], 'scaling', 'z-score')
+    rescaled, entries = processed(paths, cache_dir)
+
+    assert entries == 3
+    assert not rescaled['Price (USD)'].equals(default['Price (USD)'])
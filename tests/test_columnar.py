@@ -0,0 +1,63 @@
+from conftest import resort_frame
+from columnar import write_columns, read_columns
+from resort_store import ResortStore
+import pandas as pd
+import numpy as np
+import pytest
+import os
+
+
+def test_columns_round_trip(tmp_path):
+
+    data = resort_frame(200, seed=1)
+    data.loc[5, 'Resort'] = np.nan
+
+    write_columns(data, str(tmp_path / 'columns'))
+    found = read_columns(str(tmp_path / 'columns'))
+
+    pd.testing.assert_frame_equal(found, data)
+
+
+def test_store_round_trip(tmp_path):
+
+    store = ResortStore(resort_frame(300, seed=2))
+    store.save(str(tmp_path / 'store'))
+    attached = ResortStore.attach(str(tmp_path / 'store'))
+
+    index = np.array([299, 0, 17, 17, 150])
+
+    pd.testing.assert_frame_equal(attached.rows(index), store.rows(index))
+    assert np.array_equal(attached.feature_matrix(), store.feature_matrix())
+
+
+def test_saved_columns_are_replaced(tmp_path):
+
+    directory = str(tmp_path / 'columns')
+    write_columns(resort_frame(10, seed=3), directory)
+    write_columns(resort_frame(4, seed=4), directory)
+
+    assert len(read_columns(directory)) == 4
+
+
+def test_other_directories_are_left_alone(tmp_path):
+
+    directory = tmp_path / 'results'
+    directory.mkdir()
+    (directory / 'notes.txt').write_text('keep me')
+
+    with pytest.raises(ValueError):
+        write_columns(resort_frame(10), str(directory))
+
+    assert (directory / 'notes.txt').read_text() == 'keep me'
+
+
+def test_files_are_left_alone(tmp_path):
+
+    path = tmp_path / 'results.txt'
+    path.write_text('keep me')
+
+    with pytest.raises(ValueError):
+        write_columns(resort_frame(10), str(path))
+
+    assert path.read_text() == 'keep me'
+    assert not any(name.startswith('results.txt.tmp') for name in os.listdir(tmp_path))
@@ -0,0 +1,39 @@
+from conftest import resort_frame
+from resort_store import ResortStore, compact_column
+from ranking_data import RankingSkiResorts
+from selection import top_k_indices
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('values, dtype', [([0, 200], np.int16), ([-5, 100], np.int8), ([0, 40000], np.int32), ([3, 2 ** 40], np.int64)])
+def test_integers_are_compacted_to_signed_types(values, dtype):
+
+    assert compact_column(np.array(values, dtype=np.int64)).dtype == dtype
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.int8, np.uint16])
+def test_descending_selection_of_small_integers(dtype):
+
+    values = np.random.default_rng(3).integers(0, np.iinfo(np.int8).max, 300).astype(dtype)
+    values[:5] = [0, 1, 127, 127, 0]
+
+    for k in [1, 10, 299, 300]:
+        assert np.array_equal(top_k_indices(values, k), top_k_indices(values.astype(np.int64), k))
+
+
+@pytest.mark.parametrize('levels', [3, None])
+def test_compact_ranking_matches_full_precision(levels):
+
+    # run counts up to 250 compact to a small integer type, where negating them for a descending sort used to wrap around
+    data = resort_frame(400, seed=6, levels=levels)
+    data['Run Count'] = np.random.default_rng(6).integers(0, 250, len(data))
+
+    full = RankingSkiResorts(ResortStore(data))
+    compact = RankingSkiResorts(ResortStore(data, compact=True))
+
+    for ascending in [False, True]:
+        for top_k in [None, 10]:
+            expected = full.sorting_by_feature('runs', ascending, top_k=top_k)['Resort ID'].to_numpy()
+
+            assert np.array_equal(compact.sorting_by_feature('runs', ascending, top_k=top_k)['Resort ID'].to_numpy(), expected)
@@ -0,0 +1,174 @@
+from synthetic_data import write_dataset
+from main import SummitSelect_Main
+from process_data import PreProcessing
+from incremental import IncrementalUpdater
+import pandas as pd
+import pytest
+
+
+"""
+Writes a synthetic dataset, and a delta inserting, updating and deleting a few of its resorts
+@param directory: the directory receiving the files
+@return the paths of the input files, and the paths of the delta's files
+"""
+def dataset_and_delta(directory) -> tuple:
+
+    paths = write_dataset(str(directory / 'data'), 500, seed=7, blank_id_rate=0.0)
+    delta = {name: str(directory / f'{name}.csv') for name in ['inserts', 'updates', 'deletes']}
+
+    pd.DataFrame({'Resort ID': [1001, 1002], 'Resort': ['New Peak', 'New Basin'], 'Country': ['Canada', 'United States'],
+                  'Run Count': [150, 40], 'Price (USD)': [99.0, 250.0], 'Peak Elevation (m)': [3100.0, 1200.0]}).to_csv(delta['inserts'], index=False)
+    pd.DataFrame({'Resort ID': [2, 3], 'Price (USD)': [45.0, 180.0]}).to_csv(delta['updates'], index=False)
+    pd.DataFrame({'Resort ID': [5, 8]}).to_csv(delta['deletes'], index=False)
+
+    return paths, delta
+
+
+"""
+Processes a dataset with a delta applied
+@param paths: the paths of the input files
+@param delta: the paths of the delta's files
+@param cache_dir: the directory caching the processed data
+@return the processed data
+"""
+def processed(paths: dict, delta: dict, cache_dir: str) -> pd.DataFrame:
+
+    app = SummitSelect_Main(paths['runs'], paths['prices'], paths['elevation'], cache_dir=cache_dir, delta=delta)
+
+    return app.process_data()
+
+
+def test_delta_is_applied(tmp_path, monkeypatch):
+
+    # pre-processing writes the processed data relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    paths, delta = dataset_and_delta(tmp_path)
+    data = processed(paths, delta, None)
+    ids = set(data['Resort ID'])
+
+    assert {1001, 1002} <= ids
+    assert not {5, 8} & ids
+
+
+def test_delta_applies_to_cached_data(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    paths, delta = dataset_and_delta(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+
+    cold = processed(paths, delta, cache_dir)
+    warm = processed(paths, delta, cache_dir)
+
+    pd.testing.assert_frame_equal(warm, cold)
+    pd.testing.assert_frame_equal(processed(paths, delta, None), cold)
+
+
+"""
+Pre-processes a synthetic dataset with no blank values, so every value missing from the merged data is imputed with a median
+@param directory: the directory receiving the files
+@return the paths of the input files, and the pre-processed PreProcessing object
+"""
+def pre_processed(directory) -> tuple:
+
+    paths = write_dataset(str(directory / 'data'), 300, seed=3, duplicate_rate=0.0, blank_rate=0.0, missing_rate=0.05, blank_id_rate=0.0)
+    preprocessor = PreProcessing(paths['runs'], paths['prices'], paths['elevation'])
+    preprocessor.pre_process_data()
+
+    return paths, preprocessor
+
+
+def test_rescaled_delta_matches_full_recompute(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    paths, preprocessor = pre_processed(tmp_path)
+    updater = IncrementalUpdater(preprocessor)
+
+    prices = pd.read_csv(paths['prices'])
+    inserts = pd.DataFrame({'Resort ID': [901, 902], 'Resort': ['New Peak', 'New Basin'], 'Country': ['Canada', 'Canada'],
+                            'Run Count': [900, 3], 'Price (USD)': [500.0, 20.0], 'Peak Elevation (m)': [4500.0, 300.0]})
+    updates = pd.DataFrame({'Resort ID': prices['Resort ID'][:2], 'Price (USD)': [1.0, 700.0]})
+    deletes = list(prices['Resort ID'][2:4])
+
+    summary = updater.apply(inserts, updates, deletes)
+
+    assert summary['rescale_required'] and summary['rescaled']
+
+    # the same delta, applied to the input files instead
+    changed = {}
+
+    for source, column in [('runs', 'Run Count'), ('prices', 'Price (USD)'), ('elevation', 'Peak Elevation (m)')]:
+
+        data = pd.read_csv(paths[source])
+        data = data[~data['Resort ID'].isin(deletes)]
+
+        if column in updates.columns:
+            for resort_id, value in zip(updates['Resort ID'], updates[column]):
+                data.loc[data['Resort ID'] == resort_id, column] = value
+
+        changed[source] = str(tmp_path / f'{source}.csv')
+        pd.concat([data, inserts[['Resort ID', 'Resort', 'Country', column]]]).to_csv(changed[source], index=False)
+
+    recomputed = PreProcessing(changed['runs'], changed['prices'], changed['elevation']).pre_process_data()
+
+    incremental = updater.processed_data().sort_values('Resort ID').reset_index(drop=True)
+    recomputed = recomputed.sort_values('Resort ID').reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(incremental, recomputed, check_categorical=False)
+
+
+def test_small_delta_reports_drift_without_rescaling(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    paths, preprocessor = pre_processed(tmp_path)
+    updater = IncrementalUpdater(preprocessor, tolerance=0.01)
+    before = updater.processed_data()
+
+    # a price moved between the cheapest and dearest resorts leaves the min-max scaling where it was
+    resort_id = int(before['Resort ID'][before['Price (USD)'].between(0.4, 0.6).to_numpy()].iloc[0])
+    price = float(preprocessor.debugged_data.set_index('Resort ID').loc[resort_id, 'Price (USD)'])
+    summary = updater.apply(updates=pd.DataFrame({'Resort ID': [resort_id], 'Price (USD)': [price + 1.0]}))
+
+    assert set(summary['drift']) == {'Run Count', 'Price (USD)', 'Peak Elevation (m)'}
+    assert all(0.0 <= drift <= 0.01 for drift in summary['drift'].values())
+    assert not summary['rescale_required'] and not summary['rescaled']
+    assert summary['renormalized'] < len(before)
+
+    after = updater.processed_data()
+    changed = (after['Price (USD)'] != before['Price (USD)']).to_numpy()
+
+    assert after['Resort ID'][changed].tolist() == [resort_id]
+    pd.testing.assert_frame_equal(after.drop(columns='Price (USD)'), before.drop(columns='Price (USD)'))
+
+
+def test_update_to_new_country(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    paths, preprocessor = pre_processed(tmp_path)
+    updater = IncrementalUpdater(preprocessor)
+    resort_id = int(preprocessor.debugged_data['Resort ID'][0])
+
+    updater.apply(updates=pd.DataFrame({'Resort ID': [resort_id], 'Country': ['France']}))
+    data = updater.processed_data().set_index('Resort ID')
+
+    assert data.loc[resort_id, 'Country'] == 'France'
+    assert (data.drop(index=resort_id)['Country'] != 'France').all()
+
+
+def test_rejected_delta_leaves_data_unchanged(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    paths, preprocessor = pre_processed(tmp_path)
+    updater = IncrementalUpdater(preprocessor)
+    before = updater.processed_data()
+    ids = list(before['Resort ID'][:2])
+
+    # the deletion and the first update are valid, the second update is not
+    with pytest.raises(ValueError):
+        updater.apply(updates=pd.DataFrame({'Resort ID': [ids[1], 99999], 'Price (USD)': [1.0, 2.0]}), deletes=[ids[0]])
+
+    with pytest.raises(ValueError):
+        updater.apply(updates=pd.DataFrame({'Resort ID': [ids[1]], 'Price (USD)': [1.0]}),
+                      inserts=pd.DataFrame({'Resort ID': [ids[0]], 'Price (USD)': [3.0]}))
+
+    pd.testing.assert_frame_equal(updater.processed_data(), before)
+    assert updater.apply()['drift'] == {feature: 0.0 for feature in updater.scaling}
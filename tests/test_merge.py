@@ -0,0 +1,34 @@
+from synthetic_data import write_dataset
+from process_data import PreProcessing
+
+
+"""
+Reads, organizes and merges the three files of a synthetic dataset
+@param directory: the directory receiving the files
+@param blank_id_rate: share of rows whose Resort ID is left blank
+@return the pre-processor, and the merged frame of data
+"""
+def merged(directory: str, blank_id_rate: float) -> tuple:
+
+    paths = write_dataset(directory, 2000, seed=5, blank_id_rate=blank_id_rate)
+    preprocessor = PreProcessing(paths['runs'], paths['prices'], paths['elevation'])
+    preprocessor.read_data()
+
+    for name, attribute in [('runs', 'run_count_dataframe'), ('prices', 'price_dataframe'), ('elevation', 'elevation_dataframe')]:
+        setattr(preprocessor, attribute, preprocessor.organize_data(getattr(preprocessor, attribute), name))
+
+    return preprocessor, preprocessor.merge_data()
+
+
+def test_rows_without_an_id_are_dropped(tmp_path):
+
+    preprocessor, data = merged(str(tmp_path / 'resorts'), 0.02)
+
+    assert data['Resort ID'].dtype == 'int64'
+    assert data['Resort ID'].is_unique
+    assert len(preprocessor.missing_features) == len(data)
+
+    # synthetic names end with the resort's ID, so every resort kept its own name
+    assert (data['Resort'].str.rsplit(' ', n=1).str[-1] == data['Resort ID'].astype(str)).all()
+
+    assert not preprocessor.debug_data(data).isnull().any().any()
@@ -0,0 +1,63 @@
+from conftest import resort_frame
+from main import read_profiles, parse_profile
+from weighted_sum import WeightedSumModel
+from features import FEATURES, Feature, register_feature
+import pytest
+
+
+def test_profiles_fall_back_to_the_defaults(tmp_path):
+
+    path = tmp_path / 'profiles.jsonl'
+    path.write_text('{"id": "a", "price": "no", "run_weight": 0.5}\n\n{"n": 3}\n')
+
+    profiles = read_profiles(str(path))
+
+    assert profiles[0] == {'id': 'a', 'preferences': [True, False, True], 'weights': [0.5, 0.33, 0.33], 'n': 10}
+    assert profiles[1] == {'id': 2, 'preferences': [True, True, True], 'weights': [0.33, 0.33, 0.33], 'n': 3}
+
+
+@pytest.mark.parametrize('value', ['nan', 'inf', '-inf', 'NaN'])
+def test_non_finite_weights_are_rejected(value):
+
+    with pytest.raises(ValueError, match='finite'):
+        parse_profile({'price_weight': value}, 1)
+
+
+@pytest.mark.parametrize('contents, line', [('{"id": "a"}\n\n{"id": "b", "elevation_weight": NaN}\n', 3),
+                                            ('id,run_weight\nx,1\ny,inf\n', 3)])
+def test_errors_name_the_line_of_the_profile(tmp_path, contents, line):
+
+    path = tmp_path / 'profiles'
+    path.write_text(contents)
+
+    with pytest.raises(ValueError, match=f'Profile 2 \\(Line {line}\\)'):
+        read_profiles(str(path))
+
+
+def test_preferences_follow_the_registered_features():
+
+    model = WeightedSumModel(resort_frame(20))
+    model.set_preferences(True, False, True)
+
+    assert model.preferences == {feature.column: preference for feature, preference in zip(FEATURES, [True, False, True])}
+
+    with pytest.raises(ValueError):
+        model.set_preferences(True, False)
+
+
+def test_profiles_read_every_registered_feature():
+
+    snowfall = Feature('Snowfall (cm)', 'snowfall', 'snowfall', 'Snowfall', 'Snowfall', 'Snowfall Ranking', 'snowfall',
+                       "A 'Yes' to Snowfall will find resorts with the most snowfall.", higher_is_better=True)
+    register_feature(snowfall)
+
+    try:
+        profile = parse_profile({'price': 'no', 'snowfall': 'no', 'snowfall_weight': 0.2, 'run_weight': 0.5}, 1)
+        defaults = parse_profile({}, 2)
+
+    finally:
+        FEATURES.remove(snowfall)
+
+    assert profile['preferences'] == [True, False, True, False]
+    assert profile['weights'] == [0.5, 0.33, 0.33, 0.2]
+    assert defaults['preferences'] == [True] * 4 and defaults['weights'] == [0.33] * 4
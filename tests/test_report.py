@@ -0,0 +1,56 @@
+import subprocess
+import pytest
+import sys
+import os
+
+# the repository's own input files, and the reports the application wrote for them before any optimization
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INPUT_FILES = [os.path.join(ROOT, 'data-sets', f'resorts_{name}.csv') for name in ['runs', 'prices', 'elevation']]
+GOLDEN_DIR = os.path.join(ROOT, 'tests', 'golden')
+
+
+"""
+Runs the application the default way, answering its three Yes/No questions
+@param directory: the working directory, receiving the processed data and the report
+@param answers: the answers to the questions
+@param options: any further command-line options
+@return the bytes of the report
+"""
+def default_report(directory, answers: list, *options) -> bytes:
+
+    command = [sys.executable, os.path.join(ROOT, 'src', 'main.py'), '--run_count_data', INPUT_FILES[0], '--price_data', INPUT_FILES[1],
+               '--elevation_data', INPUT_FILES[2], '--output', 'report.txt', *options]
+    subprocess.run(command, input="\n".join(answers) + "\n", cwd=directory, capture_output=True, text=True, check=True)
+
+    with open(os.path.join(directory, 'report.txt'), 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('answers', [['yes', 'yes', 'yes'], ['no', 'yes', 'no'], ['no', 'yes', 'yes'], ['yes', 'no', 'no']])
+def test_default_report_matches_golden_copy(tmp_path, answers):
+
+    with open(os.path.join(GOLDEN_DIR, f"Ski_Resort_Results_{'_'.join(answers)}.txt"), 'rb') as f:
+        golden = f.read()
+
+    assert default_report(tmp_path, answers, '--no_cache') == golden
+
+
+def test_chunked_report_matches_golden_copy(tmp_path, monkeypatch):
+
+    from main import SummitSelect_Main
+
+    with open(os.path.join(GOLDEN_DIR, 'Ski_Resort_Results_yes_yes_yes.txt'), 'rb') as f:
+        golden = f.read()
+
+    # pre-processing writes the processed data relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    app = SummitSelect_Main(*INPUT_FILES)
+    processed_data = app.process_data()
+    rankings = app.create_rankings(processed_data)
+    final_ranking = app.create_final_ranking(True, True, True)
+
+    # chunks far smaller than the list, so every chunk boundary is written
+    app.dump_output(rankings, final_ranking, 'report.txt', 'text', chunk_rows=7)
+
+    with open('report.txt', 'rb') as f:
+        assert f.read() == golden
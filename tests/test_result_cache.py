@@ -0,0 +1,71 @@
+from conftest import resort_frame
+from result_cache import ResultCache
+from resort_store import ResortStore
+from weighted_sum import WeightedSumModel
+import numpy as np
+
+
+def test_least_recently_used_is_evicted():
+
+    cache = ResultCache(max_entries=2)
+    cache.put(1, ('a',), np.zeros(1))
+    cache.put(1, ('b',), np.zeros(1))
+
+    assert cache.lookup(1, ('a',)) is not None
+    cache.put(1, ('c',), np.zeros(1))
+
+    assert cache.lookup(1, ('b',)) is None
+    assert cache.lookup(1, ('a',)) is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_cache_stays_within_its_bytes():
+
+    cache = ResultCache(max_entries=10, max_bytes=100)
+    cache.put(1, ('a',), np.zeros(8))
+    cache.put(1, ('b',), np.zeros(8))
+
+    assert len(cache) == 1 and cache.bytes == 64
+
+    # a result larger than the whole cache is not kept, and evicts nothing
+    cache.put(1, ('c',), np.zeros(20))
+
+    assert cache.lookup(1, ('b',)) is not None
+    assert cache.lookup(1, ('c',)) is None
+
+
+def test_versions_are_kept_apart():
+
+    cache = ResultCache(max_entries=4)
+    cache.put(1, ('a',), np.zeros(1))
+    cache.put(2, ('a',), np.ones(1))
+
+    assert cache.lookup(1, ('a',))[0] == 0
+    assert cache.lookup(2, ('a',))[0] == 1
+    assert cache.stats()['versions'] == 2
+
+    cache.invalidate(1)
+
+    assert cache.lookup(1, ('a',)) is None
+    assert cache.lookup(2, ('a',)) is not None
+    assert cache.stats()['invalidations'] == 1
+
+    cache.invalidate()
+
+    assert len(cache) == 0 and cache.bytes == 0
+
+
+def test_stores_sharing_a_cache_do_not_thrash():
+
+    cache = ResultCache()
+    models = [WeightedSumModel(ResortStore(resort_frame(300, seed=seed)), cache=cache) for seed in [1, 2]]
+
+    for _ in range(3):
+        for model in models:
+            model.normalize_data()
+            model.weighted_sum_model(top_k=10)
+
+    # only the first ranking of each store is worked out, every later one is found in the cache
+    assert cache.stats()['misses'] == 2
+    assert cache.stats()['hits'] == 4
+    assert not np.array_equal(models[0].order, models[1].order)
@@ -0,0 +1,71 @@
+from conftest import resort_frame
+from process_data import PreProcessing, min_max_scale, z_score
+import pandas as pd
+import numpy as np
+import subprocess
+import pytest
+import sys
+import os
+
+# the application, run the way users start it
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'main.py')
+
+
+"""
+Builds a matrix of features with a constant column, so the scalers must leave it unscaled rather than divide by zero
+"""
+def feature_matrix() -> np.ndarray:
+
+    rng = np.random.default_rng(14)
+
+    return np.column_stack([rng.normal(2500.0, 900.0, 300), rng.integers(0, 400, 300), np.full(300, 7.0)])
+
+
+def test_numpy_scalers_follow_their_formulas():
+
+    values = feature_matrix()
+
+    low, high = values.min(axis=0), values.max(axis=0)
+    expected = (values - low) / np.where(high > low, high - low, 1.0)
+    np.testing.assert_allclose(min_max_scale(values), expected, atol=1e-12)
+
+    std = values.std(axis=0)
+    expected = (values - values.mean(axis=0)) / np.where(std > 0, std, 1.0)
+    np.testing.assert_allclose(z_score(values), expected, atol=1e-12)
+
+    # every column is scaled on its own, just as a single feature would be
+    np.testing.assert_array_equal(z_score(values)[:, 0], z_score(values[:, 0]))
+
+
+def test_numpy_scalers_match_sklearn():
+
+    preprocessing = pytest.importorskip('sklearn.preprocessing')
+    values = feature_matrix()
+
+    np.testing.assert_allclose(min_max_scale(values), preprocessing.MinMaxScaler().fit_transform(values), rtol=0, atol=1e-15)
+    np.testing.assert_allclose(z_score(values), preprocessing.StandardScaler().fit_transform(values), rtol=0, atol=1e-15)
+
+
+def test_scaler_backends_normalize_alike():
+
+    pytest.importorskip('sklearn')
+    data = resort_frame(250, seed=15)
+
+    normalized = {backend: PreProcessing(None, None, None, scaler_backend=backend).normalize_data(data.copy()) for backend in ['numpy', 'sklearn']}
+
+    pd.testing.assert_frame_equal(normalized['numpy'], normalized['sklearn'], check_exact=False, rtol=0, atol=1e-15)
+
+
+def test_help_does_not_import_sklearn():
+
+    # main.py is run as a script, so it finds its modules next to it
+    script = "\n".join([f"import runpy, sys, os; sys.argv = [{MAIN!r}, '--help']; sys.path.insert(0, os.path.dirname({MAIN!r}))",
+                        "try:",
+                        f"    runpy.run_path({MAIN!r}, run_name='__main__')",
+                        "except SystemExit:",
+                        "    pass",
+                        "print(sorted(name for name in sys.modules if name.split('.')[0] in ['sklearn', 'scipy']))"])
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+
+    assert 'usage:' in result.stdout
+    assert result.stdout.strip().endswith('[]')
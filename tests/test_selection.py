@@ -0,0 +1,86 @@
+from conftest import resort_frame
+from selection import top_k_indices, sort_order, sorted_top_k
+from ranking_data import RankingSkiResorts
+from resort_store import ResortStore
+from weighted_sum import WeightedSumModel
+import pandas as pd
+import numpy as np
+import pytest
+
+
+"""
+Builds arrays of values with many ties, and with missing values for floats
+"""
+def tied_values(dtype, seed: int) -> np.ndarray:
+
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 6, 500).astype(dtype)
+
+    if np.issubdtype(np.dtype(dtype), np.floating):
+        values[rng.choice(500, 40, replace=False)] = np.nan
+
+    return values
+
+
+@pytest.mark.parametrize('dtype', [np.int64, np.float64, np.float32])
+@pytest.mark.parametrize('ascending', [True, False])
+@pytest.mark.parametrize('k', [0, 1, 7, 100, 470, 500, 600])
+def test_top_k_matches_stable_sort(dtype, ascending, k):
+
+    values = tied_values(dtype, k)
+    expected = np.argsort(values if ascending else -values, kind='stable')[:k]
+
+    assert np.array_equal(top_k_indices(values, k, ascending), expected)
+
+
+@pytest.mark.parametrize('dtype', [np.int64, np.float64, np.float32])
+@pytest.mark.parametrize('ascending', [True, False])
+def test_sort_order_matches_sort_values(dtype, ascending):
+
+    values = tied_values(dtype, 1)
+    expected = pd.Series(values).sort_values(ascending=ascending).index.to_numpy()
+
+    assert np.array_equal(sort_order(values, ascending), expected)
+
+
+@pytest.mark.parametrize('dtype', [np.int64, np.float64])
+@pytest.mark.parametrize('ascending', [True, False])
+@pytest.mark.parametrize('k', [0, 1, 7, 100, 470, 500])
+def test_sorted_top_k_is_head_of_sort_order(dtype, ascending, k):
+
+    for values in [tied_values(dtype, k), np.random.default_rng(k).permutation(500).astype(dtype)]:
+        assert np.array_equal(sorted_top_k(values, k, ascending), sort_order(values, ascending)[:k])
+
+
+@pytest.mark.parametrize('levels', [3, None])
+def test_feature_rankings_match_sort_values(levels):
+
+    data = resort_frame(400, seed=4, levels=levels)
+    rank = RankingSkiResorts(data)
+
+    for name, column, ascending in [('runs', 'Run Count', False), ('price', 'Price (USD)', True), ('elevation', 'Peak Elevation (m)', False)]:
+
+        expected = data.sort_values(by=column, ascending=ascending)['Resort ID'].to_numpy()
+
+        assert np.array_equal(rank.sorting_by_feature(name, ascending)['Resort ID'].to_numpy(), expected)
+        assert np.array_equal(rank.sorting_by_feature(name, ascending, top_k=10)['Resort ID'].to_numpy(), expected[:10])
+
+
+@pytest.mark.parametrize('levels', [3, None])
+def test_weighted_sum_top_k_is_head_of_full_ranking(levels):
+
+    model = WeightedSumModel(ResortStore(resort_frame(400, seed=2, levels=levels)))
+    model.normalize_data()
+    model.set_preferences(True, False, True)
+
+    model.weighted_sum_model()
+    full = model.ranking()
+
+    # resorts tied on their score are listed the way sort_values lists them
+    scores = pd.DataFrame({'Total Weighted Score': model.ranked_scores[np.argsort(model.order)]})
+    assert np.array_equal(model.order, scores.sort_values('Total Weighted Score', ascending=False).index.to_numpy())
+
+    model.weighted_sum_model(top_k=25)
+    top = model.ranking()
+
+    assert top.equals(full.head(25))
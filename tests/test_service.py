@@ -0,0 +1,110 @@
+from conftest import resort_frame
+from main import SummitSelect_Main, parse_profile
+from service import RankingService
+from resort_store import ResortStore
+from ranking_data import RankingSkiResorts
+from weighted_sum import WeightedSumModel
+import asyncio
+import json
+
+
+"""
+Builds an application over synthetic resorts, already processed, so the service skips reading input files
+"""
+def application(size: int = 300) -> SummitSelect_Main:
+
+    app = SummitSelect_Main('runs.csv', 'prices.csv', 'elevation.csv')
+    app.store = ResortStore(resort_frame(size, seed=9, levels=4))
+    app.rank = RankingSkiResorts(app.store)
+    app.weighted_model = WeightedSumModel(app.store)
+    app.weighted_model.normalize_data()
+
+    return app
+
+
+"""
+A service failing every batch holding a profile with the id 'bad', as a profile breaking the scoring would
+"""
+class FailingService(RankingService):
+
+    def rank_profiles(self, profiles: list) -> list:
+
+        if any(profile['id'] == 'bad' for profile in profiles):
+            raise ValueError("Profile Could Not be Scored...")
+
+        return super().rank_profiles(profiles)
+
+
+"""
+Starts a service, sends it requests over HTTP, one connection each and all at once, and stops it
+@return the status and the decoded JSON body of every response
+"""
+def exchange(service: RankingService, requests: list) -> list:
+
+    async def send(method: str, path: str, payload) -> tuple:
+
+        reader, writer = await asyncio.open_connection('127.0.0.1', service.port)
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body)
+        await writer.drain()
+
+        response = await reader.read()
+        writer.close()
+
+        head, body = response.split(b"\r\n\r\n", 1)
+
+        return int(head.split()[1]), json.loads(body)
+
+    async def run() -> list:
+
+        server = asyncio.create_task(service.serve())
+
+        while service.server is None:
+            await asyncio.sleep(0.01)
+
+        try:
+            return await asyncio.gather(*[send(*request) for request in requests])
+
+        finally:
+            service.stop()
+            await asyncio.gather(server, return_exceptions=True)
+
+    return asyncio.run(run())
+
+
+def test_coalesced_rankings_match_batch_ranking():
+
+    app = application()
+    records = [{'id': i, 'run_weight': (i % 7) / 7, 'price': 'no' if i % 3 else 'yes', 'n': 5} for i in range(40)]
+
+    responses = exchange(RankingService(app, port=0, batch_window=0.05), [('POST', '/rank', record) for record in records])
+
+    profiles = [parse_profile(record, 0) for record in records]
+    expected = app.weighted_model.batch_ranking([profile['weights'] for profile in profiles], [profile['preferences'] for profile in profiles], 5)
+
+    for (status, payload), record, ranking in zip(responses, records, expected):
+        assert status == 200
+        assert payload['id'] == record['id']
+        assert payload['ranking'] == json.loads(json.dumps(ranking.to_dict(orient='records')))
+
+
+def test_a_failing_profile_only_fails_its_own_request():
+
+    service = FailingService(application(), port=0, batch_window=0.05)
+    records = [{'id': 'bad'}] + [{'id': i} for i in range(10)]
+
+    responses = exchange(service, [('POST', '/rank', record) for record in records])
+
+    assert responses[0][0] == 400
+    assert [status for status, _ in responses[1:]] == [200] * 10
+    assert service.batches >= 1
+
+
+def test_non_finite_weights_are_rejected():
+
+    responses = exchange(RankingService(application(), port=0), [('POST', '/rank', b'{"price_weight": NaN}'),
+                                                                  ('POST', '/rank', {'run_weight': 'inf'}),
+                                                                  ('POST', '/rank', {'run_weight': 0.5})])
+
+    assert [status for status, _ in responses] == [400, 400, 200]
+    assert 'finite' in responses[0][1]['error']
@@ -0,0 +1,49 @@
+from conftest import resort_frame
+from weighted_sum import WeightedSumModel
+from session import RankingSession
+from features import FEATURES
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('levels, preferences', [(None, (True, True, True)), (None, (True, False, True)), (3, (False, True, True))])
+def test_session_matches_recomputing(levels, preferences):
+
+    data = resort_frame(5000, seed=9, levels=levels)
+    session_model, model = WeightedSumModel(data), WeightedSumModel(data)
+
+    for weighted_model in [session_model, model]:
+        weighted_model.set_preferences(*preferences)
+        weighted_model.normalize_data()
+
+    session = RankingSession(session_model, k=10, buffer=200)
+    rng = np.random.default_rng(4)
+    weights = np.full(len(FEATURES), 0.33)
+
+    for step in range(60):
+
+        # mostly small slider ticks, with a jump every so often
+        weights = np.clip(weights + rng.normal(0, 0.5 if step % 10 == 9 else 0.01, len(weights)), 0, 1)
+        ranking = session.update({feature.column: weight for feature, weight in zip(FEATURES, weights)})
+
+        model.weights = {feature.column: weight for feature, weight in zip(FEATURES, weights)}
+        model.weighted_sum_model(top_k=10)
+
+        assert np.array_equal(session.order, model.order)
+        assert np.array_equal(ranking['Total Weighted Score'].to_numpy(), model.ranked_scores)
+        assert np.array_equal(ranking['Resort ID'].to_numpy(), model.ranking()['Resort ID'].to_numpy())
+
+    # most ticks were answered from the buffer, unless tied scores had to be sorted over every resort
+    if levels is None:
+        assert 1 < session.rebuilds < session.updates // 2
+
+
+def test_session_takes_criteria_and_keeps_other_weights():
+
+    model = WeightedSumModel(resort_frame(300, seed=1))
+    session = RankingSession(model, k=5)
+
+    session.update({'runs': 0.8})
+    session.update({'price': 0.1})
+
+    assert session.weights.tolist() == [0.8, 0.1, 0.33]
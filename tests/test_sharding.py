@@ -0,0 +1,64 @@
+from conftest import resort_frame
+from resort_store import ResortStore
+from weighted_sum import WeightedSumModel
+from sharding import ShardedRanker, shard_top_k
+import numpy as np
+import itertools
+import pytest
+
+
+@pytest.mark.parametrize('shards, levels', [(2, None), (7, None), (7, 3), (64, 2)])
+def test_merged_shards_match_a_single_shard(shards, levels):
+
+    features = WeightedSumModel(resort_frame(3000, seed=shards, levels=levels)).feature_matrix()
+    weights = np.random.default_rng(2).uniform(-1, 1, (40, 3))
+
+    expected = shard_top_k(features, weights, 50, 0, 2 ** 24)
+    ranker = ShardedRanker(features, workers=2, shards=shards, executor='thread')
+
+    try:
+        found = ranker.top_k(weights, 50)
+    finally:
+        ranker.close()
+
+    for (expected_top, expected_scores), (top, scores) in zip(expected, found):
+        assert np.array_equal(expected_top, top)
+        assert np.array_equal(expected_scores, scores)
+
+
+def test_worker_processes_match_a_single_shard():
+
+    features = WeightedSumModel(resort_frame(1000, seed=4, levels=4)).feature_matrix()
+    weights = np.random.default_rng(3).uniform(-1, 1, (5, 3))
+
+    expected = shard_top_k(features, weights, 20, 0, 2 ** 24)
+    ranker = ShardedRanker(features, workers=2, shards=3, executor='process')
+
+    try:
+        found = ranker.top_k(weights, 20)
+    finally:
+        ranker.close()
+
+    for (expected_top, expected_scores), (top, scores) in zip(expected, found):
+        assert np.array_equal(expected_top, top)
+        assert np.array_equal(expected_scores, scores)
+
+
+@pytest.mark.parametrize('levels', [2, None])
+def test_sharded_weighted_sum_matches_a_single_process(levels):
+
+    store = ResortStore(resort_frame(2000, seed=5, levels=levels))
+    single, sharded = WeightedSumModel(store), WeightedSumModel(store, workers=4, executor='thread')
+
+    try:
+        for preferences in itertools.product([True, False], repeat=3):
+
+            for weighted_model in [single, sharded]:
+                weighted_model.set_preferences(*preferences)
+                weighted_model.normalize_data()
+                weighted_model.weighted_sum_model(top_k=30)
+
+            assert np.array_equal(single.order, sharded.order)
+            assert np.array_equal(single.ranked_scores, sharded.ranked_scores)
+    finally:
+        sharded.close()
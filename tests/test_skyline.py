@@ -0,0 +1,76 @@
+from conftest import resort_frame
+from resort_store import ResortStore
+from weighted_sum import WeightedSumModel
+from skyline import SkylineIndex, pareto_layers
+import numpy as np
+import itertools
+import pytest
+
+
+"""
+Builds a model over resorts, normalizing their features
+"""
+def model(store: ResortStore, **options) -> WeightedSumModel:
+
+    weighted_model = WeightedSumModel(store, **options)
+    weighted_model.normalize_data()
+
+    return weighted_model
+
+
+@pytest.mark.parametrize('size, levels', [(50, 3), (50, None), (2000, 4), (2000, None)])
+def test_batch_profiles_match_scoring_every_resort(size, levels):
+
+    store = ResortStore(resort_frame(size, seed=size, levels=levels))
+    weights = np.random.default_rng(1).uniform(-1, 1, (200, 3))
+
+    expected = model(store).score_profiles(weights, 10)
+    found = model(store, skyline=True).score_profiles(weights, 10)
+
+    for (expected_top, expected_scores), (top, scores) in zip(expected, found):
+        assert np.array_equal(expected_top, top)
+        assert np.array_equal(expected_scores, scores)
+
+
+@pytest.mark.parametrize('levels', [2, 5, None])
+def test_weighted_sum_model_matches_scoring_every_resort(levels):
+
+    store = ResortStore(resort_frame(500, seed=3, levels=levels))
+    full, skyline = model(store), model(store, skyline=True)
+
+    for preferences in itertools.product([True, False], repeat=3):
+
+        for weighted_model in [full, skyline]:
+            weighted_model.set_preferences(*preferences)
+            weighted_model.weighted_sum_model(top_k=25)
+
+        assert np.array_equal(full.order, skyline.order)
+        assert np.array_equal(full.ranked_scores, skyline.ranked_scores)
+
+
+def test_batch_ranking_frames_match():
+
+    store = ResortStore(resort_frame(300, seed=4, levels=3))
+    weights = np.random.default_rng(5).uniform(0, 1, (20, 3))
+    preferences = np.random.default_rng(6).integers(0, 2, (20, 3)).astype(bool)
+
+    for expected, found in zip(model(store).batch_ranking(weights, preferences, 15),
+                               model(store, skyline=True).batch_ranking(weights, preferences, 15)):
+        assert expected.equals(found)
+
+
+def test_layers_are_dominated_by_the_layer_before():
+
+    points = np.random.default_rng(7).integers(0, 4, (400, 3)).astype(float)
+    layers = pareto_layers(points, 4)
+
+    for layer in range(2, 5):
+        for point in points[layers == layer]:
+            earlier = points[layers == layer - 1]
+            assert ((earlier >= point).all(axis=1) & (earlier > point).any(axis=1)).any()
+
+
+def test_missing_values_are_rejected():
+
+    with pytest.raises(ValueError):
+        SkylineIndex(np.array([[0.5, np.nan], [0.1, 0.2]]))
@@ -0,0 +1,66 @@
+from conftest import resort_frame
+from ranking_data import RankingSkiResorts
+from features import FEATURES
+import ranking_data
+import numpy as np
+import pytest
+
+
+def test_sort_index_is_built_once_per_feature(monkeypatch):
+
+    data = resort_frame(300, seed=8, levels=5)
+    rank = RankingSkiResorts(data)
+
+    assert set(rank.sort_index) == {(feature.column, ascending) for feature in FEATURES for ascending in [True, False]}
+
+    for (column, ascending), order in rank.sort_index.items():
+        assert np.array_equal(order, data.sort_values(by=column, ascending=ascending).index.to_numpy())
+
+    # every ranking afterwards is served from the stored order, without sorting again
+    def sort_order(values, ascending=True):
+
+        raise AssertionError("The resorts were sorted again...")
+
+    monkeypatch.setattr(ranking_data, 'sort_order', sort_order)
+
+    for feature in FEATURES:
+        for top_k in [None, 1, 25]:
+            ranking = rank.sorting_by_feature(feature.key, not feature.higher_is_better, top_k=top_k)
+
+            assert len(ranking) == (top_k or len(data))
+            assert ranking[feature.ranking_column].tolist() == list(range(1, len(ranking) + 1))
+
+
+def test_top_k_index_is_a_read_only_view():
+
+    rank = RankingSkiResorts(resort_frame(100, seed=9))
+    order = rank.top_k_index('Price (USD)', True, top_k=10)
+
+    assert np.shares_memory(order, rank.sort_index[('Price (USD)', True)])
+
+    with pytest.raises(ValueError):
+        order[0] = 0
+
+    with pytest.raises(ValueError):
+        rank.top_k_index('Price (USD)', True, top_k=0)
+
+
+def test_feature_ranks_follow_the_sort_index():
+
+    rank = RankingSkiResorts(resort_frame(200, seed=10, levels=4))
+    ranks = rank.feature_ranks('Run Count', False)
+    order = rank.sort_index[('Run Count', False)]
+
+    assert np.array_equal(ranks[order], np.arange(1, 201))
+
+
+def test_replacing_the_data_rebuilds_the_sort_index():
+
+    rank = RankingSkiResorts(resort_frame(50, seed=11))
+    rank.feature_ranks('Price (USD)', True)
+
+    data = resort_frame(80, seed=12)
+    rank.store = data
+
+    assert rank.rank_index == {}
+    assert np.array_equal(rank.top_k_index('Price (USD)', True), data.sort_values(by='Price (USD)').index.to_numpy())
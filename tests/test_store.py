@@ -0,0 +1,59 @@
+from conftest import resort_frame
+from synthetic_data import write_dataset
+from resort_store import ResortStore
+from ranking_data import RankingSkiResorts
+from weighted_sum import WeightedSumModel
+from main import SummitSelect_Main
+import pandas as pd
+import numpy as np
+import pytest
+
+
+def test_store_shares_the_columns_of_the_data():
+
+    data = resort_frame(100, seed=17)
+    store = ResortStore(data)
+
+    for col in ['Resort ID', 'Run Count', 'Price (USD)', 'Peak Elevation (m)']:
+        assert np.shares_memory(store.column(col), data[col].to_numpy())
+
+        with pytest.raises(ValueError):
+            store.column(col)[0] = 0
+
+    assert np.shares_memory(store.column('Country').codes, data['Country'].cat.codes.to_numpy())
+
+
+def test_rankers_share_one_store_without_changing_it():
+
+    data = resort_frame(200, seed=18)
+    original = data.copy()
+    store = ResortStore(data)
+
+    rank = RankingSkiResorts(store)
+    model = WeightedSumModel(store)
+
+    assert rank.store is store and model.store is store
+
+    for name in ['runs', 'price', 'elevation']:
+        rank.sorting_by_feature(name, False)
+
+    model.normalize_data()
+    model.set_preferences(True, False, True)
+    model.weighted_sum_model()
+
+    # the feature matrix is worked out once, and kept by the store for every class sharing it
+    assert model.store.feature_matrix() is store.feature_matrix()
+    pd.testing.assert_frame_equal(data, original)
+
+
+def test_application_shares_its_store(tmp_path, monkeypatch):
+
+    # pre-processing writes the processed data relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    paths = write_dataset(str(tmp_path / 'data'), 100, seed=19, blank_id_rate=0.0)
+
+    app = SummitSelect_Main(paths['runs'], paths['prices'], paths['elevation'])
+    data = app.process_data()
+
+    assert app.rank.store is app.store and app.weighted_model.store is app.store
+    assert np.shares_memory(app.store.column('Price (USD)'), data['Price (USD)'].to_numpy())
@@ -0,0 +1,41 @@
+from synthetic_data import write_dataset
+from process_data import PreProcessing
+import pandas as pd
+import pytest
+
+
+"""
+Pre-processes a synthetic dataset, holding duplicated rows, blank values and blank lines
+@param paths: the paths of the input files
+@param options: the streaming options of PreProcessing (chunk_size, memory_limit)
+@return the pre-processor, and the pre-processed data
+"""
+def pre_processed(paths: dict, **options) -> tuple:
+
+    preprocessor = PreProcessing(paths['runs'], paths['prices'], paths['elevation'], **options)
+
+    return preprocessor, preprocessor.pre_process_data()
+
+
+@pytest.mark.parametrize('options', [{'chunk_size': 2}, {'chunk_size': 37}, {'chunk_size': 10 ** 6}, {'memory_limit': 20_000}])
+def test_streamed_load_matches_whole_file_load(tmp_path, monkeypatch, options):
+
+    # pre-processing writes the processed data relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    paths = write_dataset(str(tmp_path / 'data'), 600, seed=13, duplicate_rate=0.05, blank_rate=0.03, blank_id_rate=0.0)
+
+    whole, expected = pre_processed(paths)
+    streamed, data = pre_processed(paths, **options)
+
+    for source in whole.dataframes:
+        pd.testing.assert_frame_equal(streamed.dataframes[source].reset_index(drop=True), whole.dataframes[source].reset_index(drop=True))
+
+    pd.testing.assert_frame_equal(data, expected)
+
+
+def test_memory_limit_bounds_the_chunks(tmp_path):
+
+    paths = write_dataset(str(tmp_path / 'data'), 600, seed=13)
+    preprocessor = PreProcessing(paths['runs'], paths['prices'], paths['elevation'], memory_limit=20_000)
+
+    assert 1 <= preprocessor.rows_per_chunk(paths['prices'], 'prices') < 600
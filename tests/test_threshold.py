@@ -0,0 +1,52 @@
+from conftest import resort_frame
+from ranking_data import RankingSkiResorts
+from selection import top_k_indices
+from features import get_feature
+import numpy as np
+import pytest
+
+
+"""
+Scores every resort on its rank in each list, the way the exact final list scores the resorts it reads
+@param rank: the ranker holding the resorts
+@param weights: dictionary holding the weight of each criterion (runs, price, elevation)
+@return the score of every resort, and its rank in each list
+"""
+def rank_scores(rank: RankingSkiResorts, weights: dict) -> tuple:
+
+    size = len(rank.store)
+    ranks = [rank.feature_ranks(get_feature(criterion).column, not get_feature(criterion).higher_is_better) for criterion in weights]
+    total = 0
+
+    for weight, feature_ranks in zip(weights.values(), ranks):
+        total = total + weight * (size - feature_ranks + 1) / size
+
+    return total, ranks
+
+
+@pytest.mark.parametrize('levels, weights, n', [(None, (0.33, 0.33, 0.34), 10), (None, (0.7, 0.1, 0.2), 25),
+                                                (3, (0.5, 0.25, 0.25), 10), (2, (1.0, 0.0, 0.0), 40)])
+def test_threshold_list_matches_sorting_every_resort(levels, weights, n):
+
+    rank = RankingSkiResorts(resort_frame(600, seed=n, levels=levels))
+    weights = dict(zip(['runs', 'price', 'elevation'], weights))
+
+    scores, ranks = rank_scores(rank, weights)
+    best = top_k_indices(scores, n)
+
+    found = rank.final_list(*weights.values(), n=n, exact=True)
+
+    assert np.array_equal(found['Resort ID'].to_numpy(), rank.store.column('Resort ID')[best])
+    assert np.array_equal(found['Scores'].to_numpy(), scores[best])
+
+    # the depth is the first one at which a resort-by-resort read settles the top n
+    size = len(scores)
+    first_read = np.min(ranks, axis=0)
+
+    for depth in range(1, rank.scan_depth + 1):
+
+        read = np.sort(scores[first_read <= depth])[::-1]
+        bound = sum(weight * (size - depth) / size for weight in weights.values())
+        settled = depth >= size or (len(read) >= n and read[n - 1] > bound)
+
+        assert settled == (depth == rank.scan_depth)
@@ -0,0 +1,55 @@
+from conftest import resort_frame
+from verbosity import report, set_verbosity, enabled, PROGRESS, DIAGNOSTIC
+from ranking_data import RankingSkiResorts
+import pandas as pd
+import pytest
+
+
+@pytest.mark.parametrize('verbosity, printed', [('quiet', []), ('progress', ['Progress']), ('diagnostic', ['Progress', 'Diagnostic Table'])])
+def test_diagnostics_are_only_built_when_printed(capsys, verbosity, printed):
+
+    set_verbosity(verbosity)
+    calls = []
+
+    # stands in for rendering a table, counting how many times it was rendered
+    def message() -> str:
+
+        calls.append(1)
+        return "Diagnostic Table"
+
+    report("Progress")
+    report(message, DIAGNOSTIC)
+
+    assert capsys.readouterr().out.splitlines() == printed
+    assert len(calls) == (1 if 'Diagnostic Table' in printed else 0)
+
+
+def test_quiet_rankings_render_nothing(capsys, monkeypatch):
+
+    rank = RankingSkiResorts(resort_frame(50, seed=16))
+
+    def to_string(*args, **kwargs):
+
+        raise AssertionError("A table was rendered while quiet...")
+
+    monkeypatch.setattr(pd.DataFrame, 'to_string', to_string)
+
+    for name in ['runs', 'price', 'elevation']:
+        rank.sorting_by_feature(name, False)
+
+    assert capsys.readouterr().out == ''
+
+
+def test_verbosity_levels():
+
+    set_verbosity('progress')
+
+    assert enabled(PROGRESS) and not enabled(DIAGNOSTIC)
+
+    set_verbosity(DIAGNOSTIC)
+
+    assert enabled(DIAGNOSTIC)
+
+    for level in ['loud', 3, -1]:
+        with pytest.raises(ValueError):
+            set_verbosity(level)
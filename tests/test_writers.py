@@ -0,0 +1,53 @@
+from conftest import resort_frame
+from writers import WRITERS, CHUNK_ROWS
+from columnar import read_columns
+from ranking_data import RankingSkiResorts
+from weighted_sum import WeightedSumModel
+import pandas as pd
+import pytest
+
+
+"""
+Ranks a frame of resorts by every feature, and by the weighted sum of all of them
+@return the ranking of each feature, and the final ranking
+"""
+def ranked() -> tuple:
+
+    rank = RankingSkiResorts(resort_frame(250, seed=20))
+    rankings = {'runs': rank.sorting_by_run_count(), 'price': rank.sorting_by_price(), 'elevation': rank.sorting_by_elevation()}
+
+    model = WeightedSumModel(rank.store)
+    model.normalize_data()
+    model.set_preferences(True, True, True)
+    model.weighted_sum_model()
+
+    return rankings, model.ranking()
+
+
+@pytest.mark.parametrize('output_format', ['text', 'csv', 'jsonl'])
+@pytest.mark.parametrize('chunk_rows', [1, 7, 249, 250])
+def test_chunked_writers_match_unchunked_output(tmp_path, output_format, chunk_rows):
+
+    rankings, final_ranking = ranked()
+    outputs = {}
+
+    for rows in [chunk_rows, CHUNK_ROWS]:
+        path = str(tmp_path / f'{rows}.out')
+        WRITERS[output_format](rankings, final_ranking, path, rows)
+
+        with open(path, 'rb') as f:
+            outputs[rows] = f.read()
+
+    assert outputs[chunk_rows] == outputs[CHUNK_ROWS]
+
+
+def test_written_final_lists_read_back(tmp_path):
+
+    rankings, final_ranking = ranked()
+
+    for output_format in ['csv', 'jsonl', 'columnar']:
+        WRITERS[output_format](rankings, final_ranking, str(tmp_path / output_format), 7)
+
+    pd.testing.assert_frame_equal(pd.read_csv(str(tmp_path / 'csv')), final_ranking, check_dtype=False, check_categorical=False)
+    pd.testing.assert_frame_equal(pd.read_json(str(tmp_path / 'jsonl'), lines=True), final_ranking, check_dtype=False, check_categorical=False)
+    pd.testing.assert_frame_equal(read_columns(str(tmp_path / 'columnar')), final_ranking)